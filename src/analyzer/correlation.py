@@ -1,35 +1,547 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
 from decimal import Decimal
-from typing import Any, Iterable, TypeAlias, cast
+from functools import cached_property
+from pathlib import Path
+from typing import Any, ClassVar, Iterable, Literal, TypeAlias, cast
 
 import networkx as nx
+import numpy as np
 import pandas as pd
+from scipy import sparse
+
+from utils import config
+
+from .policy_loader import PolicyGraphLoader
+
+logger = logging.getLogger(__name__)
 
 NodeType: TypeAlias = str
 NodeData: TypeAlias = dict[str, Any]
 NodeWithData: TypeAlias = tuple[NodeType, NodeData]
+# How a crime covered by several policies of a cluster counts towards the cluster's severity
+DedupRule: TypeAlias = Literal["union", "sum", "share"]
+
+
+@dataclass(frozen=True)
+class PolicyIncidence:
+    """
+    The policy → crime links of a graph as a sparse policies × crimes matrix of ones, with
+    the `severity` and `budget` attributes of the nodes as vectors in the same order (NaN
+    where a node has none) and the action codes of each policy.
+    """
+
+    policies: pd.Index
+    crimes: pd.Index
+    matrix: sparse.csr_array
+    severities: np.ndarray
+    budgets: np.ndarray
+    codes: tuple[tuple[str, ...], ...]
+
+    @classmethod
+    def from_graph(cls, graph: nx.DiGraph[str]) -> PolicyIncidence:
+        nodes = list(cast(Iterable[NodeWithData], graph.nodes(data=True)))
+        policies = [(node, data) for node, data in nodes if data.get("type") == "policy"]
+        crimes = [(node, data) for node, data in nodes if data.get("type") == "crime"]
+
+        policy_positions = {node: position for position, (node, _) in enumerate(policies)}
+        crime_positions = {node: position for position, (node, _) in enumerate(crimes)}
+        rows, columns = [], []
+        for source, target in graph.edges:
+            if source in policy_positions and target in crime_positions:
+                rows.append(policy_positions[source])
+                columns.append(crime_positions[target])
+        matrix = sparse.csr_array(
+            (np.ones(len(rows)), (np.array(rows, dtype="int64"), np.array(columns, dtype="int64"))),
+            shape=(len(policies), len(crimes)),
+        )
+
+        return cls(
+            policies=pd.Index([node for node, _ in policies]),
+            crimes=pd.Index([node for node, _ in crimes]),
+            matrix=matrix,
+            severities=np.array([float(data.get("severity", np.nan)) for _, data in crimes]),
+            budgets=np.array([float(data.get("budget", np.nan)) for _, data in policies]),
+            codes=tuple(tuple(data.get("codes") or ([data["code"]] if "code" in data else [])) for _, data in policies),
+        )
+
+    def severity_vector(self, scores: Mapping[str, float] | None = None) -> np.ndarray:
+        """Severity of each crime: from `scores` if listed there, else the node's own, else 0."""
+        severities = self.severities.copy()
+        if scores:
+            given = pd.Series(scores, dtype="float64").reindex(self.crimes).to_numpy()
+            severities = np.where(np.isnan(given), severities, given)
+
+        missing = np.isnan(severities)
+        if missing.any():
+            logger.warning(
+                f"{missing.sum()} crime(s) sem severidade, considerados com severidade 0: {list(self.crimes[missing])}"
+            )
+        return np.where(missing, 0.0, severities)
+
+    @cached_property
+    def code_matrix(self) -> tuple[pd.Index, sparse.csr_array]:
+        """The action codes, and a sparse policies × codes matrix with a 1 where the policy has the code."""
+        code_index = pd.Index(sorted({code for codes in self.codes for code in codes}))
+        rows = [position for position, codes in enumerate(self.codes) for _ in codes]
+        columns = code_index.get_indexer(pd.Index([code for codes in self.codes for code in codes]))
+        matrix = sparse.csr_array(
+            (np.ones(len(rows)), (np.array(rows, dtype="int64"), np.asarray(columns, dtype="int64"))),
+            shape=(len(self.policies), len(code_index)),
+        )
+        return code_index, matrix
+
+    def budget_vector(self, budgets: Mapping[str, float] | None = None) -> np.ndarray:
+        """
+        Budget of each policy: `budgets` keyed by the policy itself or, failing that, the sum
+        over its action codes; else the node's own budget. Policies without one get NaN.
+        """
+        if not budgets:
+            return self.budgets.copy()
+        given = pd.Series(budgets, dtype="float64")
+        code_index, code_matrix = self.code_matrix
+        code_budgets = given.reindex(code_index).to_numpy()
+        known_codes = ~np.isnan(code_budgets)
+        by_code = code_matrix @ np.where(known_codes, code_budgets, 0.0)
+        has_code = (code_matrix @ known_codes.astype("float64")) > 0
+        by_policy = given.reindex(self.policies).to_numpy()
+        return np.where(~np.isnan(by_policy), by_policy, np.where(has_code, by_code, self.budgets))
+
+
+@dataclass(frozen=True)
+class PolicyHierarchy:
+    """
+    The cluster tree above the policies (programs, sub-clusters), laid out for one-pass rollups.
+
+    `clusters` lists the clusters holding at least one policy, parents before children,
+    under a synthetic root that also holds the policies declared outside any cluster.
+    `membership` is a sparse clusters × policies matrix with a 1 wherever the cluster is
+    the policy's own cluster or one of its ancestors, so any per-policy vector rolls up
+    to every level at once with a single product.
+    """
+
+    ROOT: ClassVar[str] = "(todas)"
+
+    clusters: pd.Index
+    labels: tuple[str, ...]
+    parents: tuple[str | None, ...]
+    depths: np.ndarray
+    policy_clusters: tuple[str, ...]
+    membership: sparse.csr_array
+
+    @classmethod
+    def from_graph(cls, graph: nx.DiGraph[str], policies: pd.Index) -> PolicyHierarchy:
+        tree: dict[str, dict[str, Any]] = graph.graph.get("clusters", {})
+
+        def parent_of(cluster: str) -> str:
+            parent = tree[cluster].get("parent") if cluster in tree else None
+            return parent if parent is not None else cls.ROOT
+
+        ancestors: dict[str, list[str]] = {cls.ROOT: [cls.ROOT]}
+
+        def chain(cluster: str) -> list[str]:
+            if cluster not in ancestors:
+                ancestors[cluster] = [cluster, *chain(parent_of(cluster))]
+            return ancestors[cluster]
+
+        policy_clusters = tuple(graph.nodes[policy].get("cluster") or cls.ROOT for policy in policies)
+        used = {cluster for own in policy_clusters for cluster in chain(own)}
+        # Declaration order keeps parents before children; the root goes first
+        clusters = [cls.ROOT, *(cluster for cluster in tree if cluster in used)]
+        positions = {cluster: position for position, cluster in enumerate(clusters)}
+
+        rows, columns = [], []
+        for column, own in enumerate(policy_clusters):
+            for cluster in chain(own):
+                rows.append(positions[cluster])
+                columns.append(column)
+        membership = sparse.csr_array(
+            (np.ones(len(rows)), (np.array(rows, dtype="int64"), np.array(columns, dtype="int64"))),
+            shape=(len(clusters), len(policies)),
+        )
+        return cls(
+            clusters=pd.Index(clusters),
+            labels=tuple(tree.get(cluster, {}).get("label", cluster) for cluster in clusters),
+            parents=(None, *(parent_of(cluster) for cluster in clusters[1:])),
+            depths=np.array([len(chain(cluster)) - 1 for cluster in clusters]),
+            policy_clusters=policy_clusters,
+            membership=membership,
+        )
 
 
 class StressScorer:
-    def __init__(self, severity_scores: pd.DataFrame, policy_budgets: dict[str, float]) -> None:
+    """
+    Stress of each policy: the summed severity of the crimes it covers, divided by its budget.
+
+    Severities come from `severity_scores` (SeverityAnalyzer's 'crime_type'/'csi' frame) and
+    budgets from `policy_budgets` (keyed by policy or action code); nodes missing from them
+    fall back to their own `severity`/`budget` attributes. Policies without a positive budget
+    get a NaN stress.
+    """
+
+    def __init__(
+        self, severity_scores: pd.DataFrame | None = None, policy_budgets: Mapping[str, float] | None = None
+    ) -> None:
         self.severity_scores = severity_scores
+        self.policy_budgets = policy_budgets
+
+    def _severity_mapping(self) -> dict[str, float]:
+        if self.severity_scores is None or self.severity_scores.empty:
+            return {}
+        return dict(zip(self.severity_scores["crime_type"], self.severity_scores["csi"].astype("float64")))
+
+    @staticmethod
+    def _divide(totals: np.ndarray, budgets: np.ndarray) -> np.ndarray:
+        valid = np.isfinite(budgets) & (budgets > 0)
+        stresses: np.ndarray = np.divide(
+            totals, budgets, out=np.full(np.broadcast(totals, budgets).shape, np.nan), where=valid
+        )
+        return stresses
+
+    def calculate_policy_stresses(self, graph: PolicyGraph) -> dict[NodeType, float]:
+        incidence = graph.incidence
+        totals = incidence.matrix @ incidence.severity_vector(self._severity_mapping())
+        budgets = incidence.budget_vector(self.policy_budgets)
+
+        without_budget = ~(np.isfinite(budgets) & (budgets > 0))
+        if without_budget.any():
+            logger.warning(
+                f"{without_budget.sum()} política(s) sem orçamento positivo: {list(incidence.policies[without_budget])}"
+            )
+        return dict(zip(incidence.policies, self._divide(totals, budgets).tolist()))
+
+    def track(self, graph: PolicyGraph) -> StressTracker:
+        """The current stresses, kept up to date by the returned tracker as severities and budgets change."""
+        incidence = graph.incidence
+        codes = {code for policy_codes in incidence.codes for code in policy_codes}
+        budgets = {key: float(value) for key, value in (self.policy_budgets or {}).items()}
+        return StressTracker(
+            incidence,
+            incidence.severity_vector(self._severity_mapping()),
+            incidence.budget_vector(self.policy_budgets),
+            {key: value for key, value in budgets.items() if key in incidence.policies},
+            {key: value for key, value in budgets.items() if key in codes},
+        )
+
+    def rollup(self, graph: PolicyGraph, dedup: DedupRule = "union") -> pd.DataFrame:
+        """
+        Covered severity, budget and stress of every policy and of every cluster above it.
+
+        Budgets add up the tree (policies without one count as 0). A crime covered by several
+        policies of a cluster counts towards its severity according to `dedup`:
+
+        - "union": once per cluster, however many of its policies cover it;
+        - "sum": once per covering policy, so a cluster's severity is the sum of its policies';
+        - "share": split evenly among all the policies covering it anywhere, so the
+          severities of the policies add up to each cluster's and no crime is counted twice.
+
+        Returns:
+            pd.DataFrame: One row per cluster (root first, parents before children) followed by
+            one row per policy, with the node's kind, parent, depth, label, number of policies,
+            covered severity, budget and stress.
+        """
+        incidence, hierarchy = graph.incidence, graph.hierarchy
+        severities = incidence.severity_vector(self._severity_mapping())
+        budgets = incidence.budget_vector(self.policy_budgets)
 
-    def _accumulate_severity(self, crimes: Iterable[NodeWithData]) -> float:
-        severities = (crime["severity"] for crime in crimes)
-        return sum(severities)
+        links = incidence.matrix
+        if dedup == "share":
+            covering = np.asarray(links.sum(axis=0)).ravel()
+            links = links @ sparse.diags_array(
+                np.divide(1.0, covering, out=np.zeros(len(covering)), where=covering > 0)
+            )
+        elif dedup not in ("union", "sum"):
+            raise ValueError(f"Regra de deduplicação desconhecida: {dedup!r}")
 
-    def calculate_policy_stresses(self, graph: "PolicyGraph") -> dict[NodeType, float]:
-        # TODO
-        stress_scores: dict[str, float] = {}
-        for policy_id, data in graph.get_all_policies():
-            crimes = graph.get_crimes_for_policy(policy_id)
-            total_severity = self._accumulate_severity(crimes)
-            stress_scores[policy_id] = total_severity / data["budget"]
-        return stress_scores
+        policy_severity = links @ severities
+        cluster_links = hierarchy.membership @ links
+        if dedup == "union":
+            cluster_links = (cluster_links > 0).astype("float64")
+        cluster_severity = cluster_links @ severities
+        cluster_budget = hierarchy.membership @ np.nan_to_num(budgets)
+
+        clusters = pd.DataFrame(
+            {
+                "node": hierarchy.clusters,
+                "kind": "cluster",
+                "parent": hierarchy.parents,
+                "depth": hierarchy.depths,
+                "label": hierarchy.labels,
+                "policies": np.asarray(hierarchy.membership.sum(axis=1)).ravel().astype("int64"),
+                "covered_severity": cluster_severity,
+                "budget": cluster_budget,
+                "stress": self._divide(cluster_severity, cluster_budget),
+            }
+        )
+        depths = dict(zip(hierarchy.clusters, hierarchy.depths))
+        policies = pd.DataFrame(
+            {
+                "node": incidence.policies,
+                "kind": "policy",
+                "parent": hierarchy.policy_clusters,
+                "depth": [depths[cluster] + 1 for cluster in hierarchy.policy_clusters],
+                "label": incidence.policies,
+                "policies": 1,
+                "covered_severity": policy_severity,
+                "budget": budgets,
+                "stress": self._divide(policy_severity, budgets),
+            }
+        )
+        return pd.concat([clusters, policies], ignore_index=True)
+
+    def panel(
+        self,
+        graph: PolicyGraph,
+        severities: pd.DataFrame,
+        budgets: Mapping[int, Mapping[str, float]],
+        year_column: str = "ano",
+        trend_tolerance: float = 0.05,
+    ) -> StressPanel:
+        """
+        Stresses of every policy in every year with both severities and budgets, in one product.
+
+        Args:
+            severities: Long frame with `year_column`, 'crime_type' and 'csi', such as the output
+                of GroupedSeverityAnalyzer(by=["ano"]). Crimes missing in a year score 0 there.
+            budgets: Per year, budgets keyed by policy or action code (see budget_vector).
+            trend_tolerance: Yearly slope, relative to the policy's mean stress, beyond which
+                its trend is flagged as "alta" or "queda" rather than "estável".
+        """
+        incidence = graph.incidence
+        wide = severities.pivot(index="crime_type", columns=year_column, values="csi")
+        years = sorted(int(year) for year in set(wide.columns) & set(budgets))
+        unmatched = sorted(set(wide.columns) ^ set(budgets))
+        if unmatched:
+            logger.warning(f"Anos sem severidade ou sem orçamento, fora do painel: {unmatched}")
+        if not years:
+            raise ValueError("Nenhum ano com severidade e orçamento ao mesmo tempo.")
+
+        severity_matrix = wide[years].reindex(incidence.crimes).fillna(0.0).to_numpy("float64")
+        budget_matrix = np.column_stack([incidence.budget_vector(budgets[year]) for year in years])
+        totals = incidence.matrix @ severity_matrix
+        return StressPanel.from_arrays(incidence.policies, years, totals, budget_matrix, trend_tolerance)
+
+    def evaluate_scenarios(
+        self, graph: PolicyGraph, severities: pd.DataFrame, budgets: pd.DataFrame | None = None
+    ) -> pd.DataFrame:
+        """
+        Stresses under many scenarios at once, as one sparse matrix product.
+
+        Args:
+            severities: Crimes × scenarios, indexed by crime; crimes not listed score 0.
+            budgets: Policies × scenarios (same columns), indexed by policy. If omitted,
+                every scenario uses the scorer's budgets.
+
+        Returns:
+            pd.DataFrame: Policies × scenarios stresses.
+        """
+        incidence = graph.incidence
+        totals = incidence.matrix @ severities.reindex(incidence.crimes).fillna(0.0).to_numpy("float64")
+        if budgets is None:
+            budget_matrix = incidence.budget_vector(self.policy_budgets)[:, np.newaxis]
+        else:
+            budget_matrix = budgets.reindex(index=incidence.policies, columns=severities.columns).to_numpy("float64")
+        return pd.DataFrame(self._divide(totals, budget_matrix), index=incidence.policies, columns=severities.columns)
+
+
+@dataclass(frozen=True)
+class StressPanel:
+    """
+    Policy × year matrices of covered severity, budget and stress, with the change in stress
+    from each panel year to the next (`deltas`, labelled by the later year) and the trend of
+    each policy (`trend`: least-squares slope per year, slope relative to the mean stress and
+    a flag).
+    """
+
+    covered_severity: pd.DataFrame
+    budget: pd.DataFrame
+    stress: pd.DataFrame
+    deltas: pd.DataFrame
+    trend: pd.DataFrame
+
+    @classmethod
+    def from_arrays(
+        cls, policies: pd.Index, years: list[int], totals: np.ndarray, budgets: np.ndarray, tolerance: float
+    ) -> StressPanel:
+        stress = StressScorer._divide(totals, budgets)
+        columns = pd.Index(years, name="ano")
+
+        # Least-squares slope of each row over its valid years, all rows at once
+        valid = np.isfinite(stress)
+        counts = valid.sum(axis=1)
+        x = np.broadcast_to(np.asarray(years, dtype="float64"), stress.shape)
+        y = np.where(valid, stress, 0.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x_mean = (x * valid).sum(axis=1) / counts
+            y_mean = y.sum(axis=1) / counts
+            dx = np.where(valid, x - x_mean[:, np.newaxis], 0.0)
+            slope = (dx * (y - y_mean[:, np.newaxis])).sum(axis=1) / (dx**2).sum(axis=1)
+            scale = (np.abs(y).sum(axis=1)) / counts
+            relative = np.where(scale > 0, slope / scale, 0.0)
+
+        defined = counts >= 2
+        flags = np.select(
+            [~defined, relative > tolerance, relative < -tolerance], ["indefinida", "alta", "queda"], "estável"
+        )
+        trend = pd.DataFrame(
+            {
+                "slope": np.where(defined, slope, np.nan),
+                "relative_slope": np.where(defined, relative, np.nan),
+                "trend": flags,
+            },
+            index=policies,
+        )
+        stress_frame = pd.DataFrame(stress, index=policies, columns=columns)
+        return cls(
+            covered_severity=pd.DataFrame(totals, index=policies, columns=columns),
+            budget=pd.DataFrame(budgets, index=policies, columns=columns),
+            stress=stress_frame,
+            deltas=stress_frame.diff(axis=1).iloc[:, 1:],
+            trend=trend,
+        )
+
+
+@dataclass(frozen=True)
+class StressChange:
+    policy: NodeType
+    previous: float
+    current: float
+
+
+class StressTracker:
+    """
+    Policy stresses kept up to date under severity and budget updates.
+
+    A crime's severity only feeds the policies linked to it, and a budget only its own
+    policy, so an update recomputes just those rows. Subscribers are notified of the
+    stresses that changed after each update.
+    """
+
+    def __init__(
+        self,
+        incidence: PolicyIncidence,
+        severities: np.ndarray,
+        budgets: np.ndarray,
+        policy_budgets: dict[str, float],
+        code_budgets: dict[str, float],
+    ) -> None:
+        self._incidence = incidence
+        # Column access: the policies linked to each crime
+        self._by_crime = incidence.matrix.tocsc()
+        self._crime_positions = {crime: position for position, crime in enumerate(incidence.crimes)}
+        self._policy_positions = {policy: position for position, policy in enumerate(incidence.policies)}
+        self._code_positions: dict[str, list[int]] = {}
+        for position, codes in enumerate(incidence.codes):
+            for code in codes:
+                self._code_positions.setdefault(code, []).append(position)
+
+        self._severities = severities.copy()
+        self._budgets = budgets.copy()
+        # Policy-keyed budgets take precedence over the codes', as in PolicyIncidence.budget_vector
+        self._policy_budgets = {self._policy_positions[policy]: budget for policy, budget in policy_budgets.items()}
+        self._code_budgets = dict(code_budgets)
+        self._totals = incidence.matrix @ self._severities
+        self._stresses = StressScorer._divide(self._totals, self._budgets)
+        self._subscribers: list[Callable[[list[StressChange]], None]] = []
+
+    @property
+    def stresses(self) -> dict[NodeType, float]:
+        return dict(zip(self._incidence.policies, self._stresses.tolist()))
+
+    def subscribe(self, callback: Callable[[list[StressChange]], None]) -> Callable[[], None]:
+        """Calls `callback` with the changed stresses after every update. Returns the unsubscribe function."""
+        self._subscribers.append(callback)
+        return lambda: self._subscribers.remove(callback)
+
+    def update_severity(self, crime: NodeType, severity: float) -> list[StressChange]:
+        return self.update(severities={crime: severity})
+
+    def update_budget(self, policy_or_code: str, budget: float) -> list[StressChange]:
+        return self.update(budgets={policy_or_code: budget})
+
+    def update(
+        self, severities: Mapping[NodeType, float] | None = None, budgets: Mapping[str, float] | None = None
+    ) -> list[StressChange]:
+        """
+        Applies a batch of updates and recomputes the affected policies once.
+
+        Budgets are keyed by policy or by action code, with the same precedence as
+        PolicyIncidence.budget_vector: a policy-keyed budget is kept until replaced by
+        another, and a code update only re-derives the budget (as the sum over the
+        policy's known codes) of policies that have none.
+
+        Returns:
+            list[StressChange]: The policies whose stress changed, in policy order.
+        """
+        affected: set[int] = set()
+        for crime, severity in (severities or {}).items():
+            if crime not in self._crime_positions:
+                raise KeyError(f"Crime '{crime}' não está no grafo de políticas.")
+            column = self._crime_positions[crime]
+            self._severities[column] = float(severity)
+            start, end = self._by_crime.indptr[column], self._by_crime.indptr[column + 1]
+            affected.update(self._by_crime.indices[start:end].tolist())
+
+        for key, budget in (budgets or {}).items():
+            if key in self._policy_positions:
+                position = self._policy_positions[key]
+                self._policy_budgets[position] = float(budget)
+                self._budgets[position] = float(budget)
+                affected.add(position)
+            elif key in self._code_positions:
+                self._code_budgets[key] = float(budget)
+                for position in self._code_positions[key]:
+                    if position in self._policy_budgets:
+                        continue
+                    codes = self._incidence.codes[position]
+                    self._budgets[position] = sum(self._code_budgets[c] for c in codes if c in self._code_budgets)
+                    affected.add(position)
+            else:
+                raise KeyError(f"'{key}' não é uma política nem um código de ação do grafo.")
+
+        rows = np.array(sorted(affected), dtype="int64")
+        previous = self._stresses[rows]
+        # Affected rows are recomputed from scratch rather than patched, so no rounding error builds up
+        self._totals[rows] = self._incidence.matrix[rows] @ self._severities
+        self._stresses[rows] = StressScorer._divide(self._totals[rows], self._budgets[rows])
+
+        current = self._stresses[rows]
+        changed = ~((previous == current) | (np.isnan(previous) & np.isnan(current)))
+        changes = [
+            StressChange(self._incidence.policies[row], old, new)
+            for row, old, new in zip(rows[changed].tolist(), previous[changed].tolist(), current[changed].tolist())
+        ]
+        if changes:
+            for callback in list(self._subscribers):
+                callback(changes)
+        return changes
 
 
 class PolicyGraph:
+    """
+    Read-only view over an authored policy graph. Scoring goes through `incidence`, its
+    compiled matrix form, which is built on first use: the graph must not change afterwards.
+    """
+
     def __init__(self, graph: nx.DiGraph[str]) -> None:
         self._graph = graph
+        self._incidence: PolicyIncidence | None = None
+        self._hierarchy: PolicyHierarchy | None = None
+
+    @property
+    def incidence(self) -> PolicyIncidence:
+        if self._incidence is None:
+            self._incidence = PolicyIncidence.from_graph(self._graph)
+        return self._incidence
+
+    @property
+    def hierarchy(self) -> PolicyHierarchy:
+        if self._hierarchy is None:
+            self._hierarchy = PolicyHierarchy.from_graph(self._graph, self.incidence.policies)
+        return self._hierarchy
 
     def get_all_policies(self) -> Iterable[NodeWithData]:
         nodes_with_data = cast(Iterable[NodeWithData], self._graph.nodes(data=True))
@@ -39,9 +551,9 @@ class PolicyGraph:
         # This method hides the networkx complexity from the rest of the app
         neighbors = self._graph.neighbors(policy_id)
         return [
-            (neighbor, self._graph.nodes[neighbor]["severity"])
+            (neighbor, self._graph.nodes[neighbor])
             for neighbor in neighbors
-            if self._graph.nodes[neighbor]["type"] == "crime"
+            if self._graph.nodes[neighbor].get("type") == "crime"
         ]
 
 
@@ -49,6 +561,15 @@ class PolicyGraphBuilder:
     def __init__(self) -> None:
         self._graph: nx.DiGraph[str] = nx.DiGraph()
 
+    @classmethod
+    def from_dot(
+        cls, path: Path = config.POLICY_GRAPH_FILEPATH, cache_dir: Path | None = config.POLICY_GRAPH_CACHE_DIR
+    ) -> "PolicyGraphBuilder":
+        """A builder starting from the policies, crimes and links declared in a DOT file."""
+        builder = cls()
+        builder._graph = PolicyGraphLoader(path, cache_dir).load()
+        return builder
+
     def add_policy(self, policy_id: str, budget: Decimal) -> "PolicyGraphBuilder":
         self._graph.add_node(policy_id, type="policy", budget=budget)
         return self
@@ -0,0 +1,249 @@
+"""
+A parser for the subset of the Graphviz DOT language used by the policy graph files.
+
+Supported: graph/digraph (optionally strict), node statements with attribute lists,
+edge chains (`a -> b -> c [attrs]`), `graph`/`node`/`edge` default attributes,
+`key=value` graph attributes, and nested (cluster) subgraphs. Ports are accepted and
+ignored. Subgraphs as edge endpoints and HTML labels are not supported.
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+
+logger = logging.getLogger(__name__)
+
+Attributes = dict[str, str]
+
+# Each match also consumes the whitespace and comments before the token
+_TOKEN = re.compile(
+    r"""
+    (?:\s+|//[^\n]*|/\*.*?\*/|^\#[^\n]*)*
+    (?:
+        (?P<string>"[^"\\]*(?:\\.[^"\\]*)*")
+        |(?P<edgeop>->|--)
+        |(?P<id>[^\W\d]\w*|-?(?:\.\d+|\d+(?:\.\d*)?))
+        |(?P<punct>[{}\[\];=,:])
+        |(?P<eof>\Z)
+        |(?P<error>.)
+    )
+    """,
+    re.VERBOSE | re.DOTALL | re.MULTILINE,
+)
+_KEYWORDS = {"strict", "graph", "digraph", "subgraph", "node", "edge"}
+
+
+class DotParseError(ValueError):
+    """Raised when the text is not valid in the supported DOT subset."""
+
+
+@dataclass
+class DotCluster:
+    name: str
+    parent: str | None
+    attrs: Attributes = field(default_factory=dict)
+
+
+@dataclass
+class DotGraph:
+    """
+    The parsed graph. Nodes keep their merged attributes in declaration order, and the
+    innermost cluster each node was first declared in. Nodes declared more than once
+    also keep the attributes of every declaration, in `redeclared`.
+    """
+
+    name: str
+    directed: bool
+    attrs: Attributes = field(default_factory=dict)
+    nodes: dict[str, Attributes] = field(default_factory=dict)
+    node_clusters: dict[str, str | None] = field(default_factory=dict)
+    clusters: dict[str, DotCluster] = field(default_factory=dict)
+    edges: list[tuple[str, str, Attributes]] = field(default_factory=list)
+    redeclared: dict[str, list[Attributes]] = field(default_factory=dict)
+
+
+def _line(text: str, offset: int) -> int:
+    return text.count("\n", 0, offset) + 1
+
+
+def _tokenize(text: str) -> list[tuple[str, str, int]]:
+    """The (kind, value, offset) of each token, ending with an "eof" token."""
+    tokens: list[tuple[str, str, int]] = []
+    for match in _TOKEN.finditer(text):
+        kind = match.lastgroup
+        assert kind is not None
+        value = match.group(kind)
+        if kind == "string":
+            tokens.append(("id", value[1:-1].replace('\\"', '"').replace("\\\n", ""), match.start(kind)))
+        elif kind == "id" and value.lower() in _KEYWORDS:
+            tokens.append(("keyword", value.lower(), match.start(kind)))
+        elif kind == "error":
+            raise DotParseError(f"Caractere inesperado {value!r} na linha {_line(text, match.start(kind))}.")
+        else:
+            tokens.append((kind, value, match.start(kind)))
+            if kind == "eof":
+                break
+    return tokens
+
+
+@dataclass
+class _Scope:
+    node_defaults: Attributes
+    edge_defaults: Attributes
+    cluster: str | None
+
+
+class _Parser:
+    def __init__(self, text: str) -> None:
+        self._text = text
+        self._tokens = _tokenize(text)
+        self._last = len(self._tokens) - 1
+        self._position = 0
+        self._graph = DotGraph("", directed=True)
+        self._edgeop = "->"
+        self._declared_at: dict[str, list[int]] = {}
+
+    def _peek(self, offset: int = 0) -> tuple[str, str, int]:
+        # The final "eof" token is returned for any position past the end
+        return self._tokens[min(self._position + offset, self._last)]
+
+    def _next(self) -> tuple[str, str, int]:
+        token = self._peek()
+        self._position += 1
+        return token
+
+    def _error(self, message: str, offset: int) -> DotParseError:
+        return DotParseError(f"{message} (linha {_line(self._text, offset)}).")
+
+    def _expect(self, kind: str, value: str | None = None) -> str:
+        token_kind, token_value, offset = self._next()
+        if token_kind != kind or (value is not None and token_value != value):
+            found = token_value if token_kind != "eof" else "fim do arquivo"
+            raise self._error(f"Esperado {value or kind!r}, encontrado {found!r}", offset)
+        return token_value
+
+    def _accept(self, value: str) -> bool:
+        kind, token_value, _ = self._peek()
+        if token_value == value and kind != "id":
+            self._position += 1
+            return True
+        return False
+
+    def parse(self) -> DotGraph:
+        self._accept("strict")
+        kind, value, offset = self._next()
+        if kind != "keyword" or value not in ("graph", "digraph"):
+            raise self._error("Esperado 'graph' ou 'digraph'", offset)
+        name = self._expect("id") if self._peek()[0] == "id" else ""
+        self._graph.name, self._graph.directed = name, value == "digraph"
+        self._edgeop = "->" if self._graph.directed else "--"
+
+        self._expect("punct", "{")
+        self._statements(_Scope({}, {}, None), self._graph.attrs)
+        self._expect("punct", "}")
+        self._expect("eof")
+
+        for node, offsets in self._declared_at.items():
+            if len(offsets) > 1:
+                lines = [_line(self._text, offset) for offset in offsets]
+                logger.warning(f"Nó '{node}' declarado mais de uma vez (linhas {lines}); os atributos foram mesclados.")
+        return self._graph
+
+    def _statements(self, scope: _Scope, graph_attrs: Attributes) -> None:
+        while not self._accept("}"):
+            if self._peek()[0] == "eof":
+                raise self._error("Fim do arquivo antes do fechamento de '}'", self._peek()[2])
+            self._statement(scope, graph_attrs)
+            self._accept(";")
+        # The caller expects the closing brace
+        self._position -= 1
+
+    def _statement(self, scope: _Scope, graph_attrs: Attributes) -> None:
+        kind, value, offset = self._peek()
+        if kind == "id":
+            if self._peek(1)[1] == "=" and self._peek(1)[0] == "punct":
+                self._position += 2
+                graph_attrs[value] = self._expect("id")
+            else:
+                self._node_or_edge(scope)
+        elif kind == "keyword" and value in ("graph", "node", "edge"):
+            self._next()
+            attrs = self._attr_lists()
+            {"graph": graph_attrs, "node": scope.node_defaults, "edge": scope.edge_defaults}[value].update(attrs)
+        elif value in ("subgraph", "{") and kind != "id":
+            self._subgraph(scope)
+        else:
+            raise self._error(f"Declaração inesperada {value!r}", offset)
+
+    def _subgraph(self, scope: _Scope) -> None:
+        name = ""
+        if self._accept("subgraph") and self._peek()[0] == "id":
+            name = self._next()[1]
+
+        cluster = scope.cluster
+        attrs: Attributes = {}
+        if name.startswith("cluster"):
+            if name in self._graph.clusters:
+                raise self._error(f"Cluster '{name}' declarado mais de uma vez", self._peek()[2])
+            self._graph.clusters[name] = DotCluster(name, scope.cluster, attrs)
+            cluster = name
+
+        self._expect("punct", "{")
+        self._statements(_Scope(dict(scope.node_defaults), dict(scope.edge_defaults), cluster), attrs)
+        self._expect("punct", "}")
+        if self._peek()[0] == "edgeop":
+            raise self._error("Subgrafos como extremidade de aresta não são suportados", self._peek()[2])
+
+    def _node_id(self) -> str:
+        kind, node, _ = self._tokens[self._position]
+        if kind != "id":
+            self._expect("id")
+        self._position += 1
+        # Ports (node:port[:compass]) do not change the node
+        while self._accept(":"):
+            self._expect("id")
+        return node
+
+    def _node_or_edge(self, scope: _Scope) -> None:
+        tokens = self._tokens
+        offset = tokens[self._position][2]
+        chain = [self._node_id()]
+        while tokens[self._position][0] == "edgeop":
+            _, op, op_offset = self._next()
+            if op != self._edgeop:
+                raise self._error(f"Operador '{op}' inválido neste tipo de grafo", op_offset)
+            if self._peek()[1] in ("{", "subgraph") and self._peek()[0] != "id":
+                raise self._error("Subgrafos como extremidade de aresta não são suportados", op_offset)
+            chain.append(self._node_id())
+        attrs = self._attr_lists() if tokens[self._position][1] == "[" else {}
+
+        nodes = self._graph.nodes
+        for node in chain:
+            if node not in nodes:
+                nodes[node] = dict(scope.node_defaults)
+                self._graph.node_clusters[node] = scope.cluster
+        if len(chain) == 1:
+            nodes[chain[0]].update(attrs)
+            self._declared_at.setdefault(chain[0], []).append(offset)
+            self._graph.redeclared.setdefault(chain[0], []).append(attrs)
+            return
+        edge_attrs = {**scope.edge_defaults, **attrs}
+        self._graph.edges.extend((source, target, dict(edge_attrs)) for source, target in zip(chain, chain[1:]))
+
+    def _attr_lists(self) -> Attributes:
+        attrs: Attributes = {}
+        while self._accept("["):
+            while not self._accept("]"):
+                key = self._expect("id")
+                self._expect("punct", "=")
+                attrs[key] = self._expect("id")
+                if not self._accept(","):
+                    self._accept(";")
+        return attrs
+
+
+def parse_dot(text: str) -> DotGraph:
+    """Parses a DOT document (see the module docstring for the supported subset)."""
+    graph = _Parser(text).parse()
+    graph.redeclared = {node: decls for node, decls in graph.redeclared.items() if len(decls) > 1}
+    return graph
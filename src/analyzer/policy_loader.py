@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+from pathlib import Path
+from typing import Any, cast
+
+import networkx as nx
+
+from utils import config
+
+from .dot import DotGraph, parse_dot
+
+logger = logging.getLogger(__name__)
+
+
+class PolicyGraphLoader:
+    """
+    Builds the policy graph from a DOT file such as `policies_crimes.gv`.
+
+    Action nodes (`type=action`) become policies, keeping their `code`; nodes declared
+    more than once keep every code in `codes`. Each node records the innermost cluster
+    it was declared in, and the cluster tree is stored in the graph's `clusters` attribute.
+
+    With a `cache_dir`, the built graph is pickled there under the hash of the file, so
+    later runs on the same file skip parsing altogether.
+    """
+
+    SNAPSHOT_VERSION = 1
+    TYPE_MAPPING = {"action": "policy"}
+
+    def __init__(
+        self, path: Path = config.POLICY_GRAPH_FILEPATH, cache_dir: Path | None = config.POLICY_GRAPH_CACHE_DIR
+    ) -> None:
+        self.path = path
+        self.cache_dir = cache_dir
+
+    def load(self) -> nx.DiGraph[str]:
+        content = self.path.read_bytes()
+        digest = hashlib.sha256(content).hexdigest()
+
+        graph = self._read_snapshot(digest)
+        if graph is not None:
+            return graph
+
+        graph = self.to_graph(parse_dot(content.decode("utf-8")))
+        graph.graph["source_sha256"] = digest
+        logger.info(
+            f"Grafo de políticas lido de '{self.path.name}': {graph.number_of_nodes()} nós, "
+            f"{graph.number_of_edges()} arestas."
+        )
+        self._write_snapshot(digest, graph)
+        return graph
+
+    @classmethod
+    def to_graph(cls, dot: DotGraph) -> nx.DiGraph[str]:
+        if not dot.directed:
+            raise ValueError("O grafo de políticas deve ser dirigido (digraph), das ações para os crimes.")
+
+        graph: nx.DiGraph[str] = nx.DiGraph(name=dot.name)
+        graph.graph["clusters"] = {
+            name: {"label": cluster.attrs.get("label", name), "parent": cluster.parent}
+            for name, cluster in dot.clusters.items()
+        }
+        for node, attrs in dot.nodes.items():
+            data: dict[str, Any] = {**attrs, "cluster": dot.node_clusters[node]}
+            if "type" in data:
+                data["type"] = cls.TYPE_MAPPING.get(data["type"], data["type"])
+            if node in dot.redeclared:
+                data["codes"] = [decl["code"] for decl in dot.redeclared[node] if "code" in decl]
+            graph.add_node(node, **data)
+        graph.add_edges_from(dot.edges)
+        return graph
+
+    def _snapshot_path(self, digest: str) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{self.path.stem}-{digest[:32]}.pickle"
+
+    def _read_snapshot(self, digest: str) -> nx.DiGraph[str] | None:
+        path = self._snapshot_path(digest)
+        if path is None or not path.exists():
+            return None
+        try:
+            version, graph = cast("tuple[int, nx.DiGraph[str]]", pickle.loads(path.read_bytes()))
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError) as e:
+            logger.warning(f"Snapshot do grafo de políticas ilegível, descartando: {path.name} ({e})")
+            path.unlink(missing_ok=True)
+            return None
+        if version != self.SNAPSHOT_VERSION:
+            return None
+        logger.info(f"Grafo de políticas carregado do snapshot '{path.name}'.")
+        return graph
+
+    def _write_snapshot(self, digest: str, graph: nx.DiGraph[str]) -> None:
+        path = self._snapshot_path(digest)
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_bytes(pickle.dumps((self.SNAPSHOT_VERSION, graph), protocol=pickle.HIGHEST_PROTOCOL))
+        tmp_path.replace(path)
+        # Snapshots of earlier versions of the same file are stale
+        for stale in path.parent.glob(f"{self.path.stem}-{'?' * 32}.pickle"):
+            if stale != path:
+                stale.unlink(missing_ok=True)
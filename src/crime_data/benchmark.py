@@ -0,0 +1,231 @@
+"""
+Measurements for the performance-sensitive parts of the pipeline.
+
+Run as a module, e.g.:
+    python -m crime_data.benchmark serializers --rows 2000000
+    python -m crime_data.benchmark runner --rows 2000000
+"""
+
+import argparse
+import json
+import logging
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from utils import config, log
+from utils.metrics import memory_mb
+
+from .cube import AggregateCube
+from .models import CrimeData
+from .schema import apply_schema
+from .scorer import (
+    AnalysisRunner,
+    DrugSeizureByStateAnalyzer,
+    FirearmSeizureByStateAnalyzer,
+    GenderOfVictimsAnalyzer,
+    LethalCrimesByStateAnalyzer,
+    ScanAnalyzer,
+    VehicleCrimeByStateAnalyzer,
+)
+from .serializer import CrimeDataSerializer
+
+logger = logging.getLogger(__name__)
+
+EVENTS = [
+    "Homicídio doloso",
+    "Feminicídio",
+    "Roubo seguido de morte (latrocínio)",
+    "Lesão corporal seguida de morte",
+    "Tentativa de homicídio",
+    "Estupro",
+    "Apreensão de Cocaína",
+    "Apreensão de Maconha",
+    "Arma de Fogo Apreendida",
+    "Roubo de veículo",
+    "Furto de veículo",
+    "Roubo de carga",
+    "Tráfico de drogas",
+    *config.NON_CRIME_EVENTS,
+]
+UFS = ["AC", "AL", "AM", "AP", "BA", "CE", "DF", "ES", "GO", "MA", "MG", "MS", "MT", "PA"]
+UFS += ["PB", "PE", "PI", "PR", "RJ", "RN", "RO", "RR", "RS", "SC", "SE", "SP", "TO"]
+
+
+def synthetic_crime_data(rows: int, seed: int = 0) -> CrimeData:
+    """Builds a VDE-shaped CrimeData with random values, for benchmarks only."""
+    rng = np.random.default_rng(seed)
+    # Each UF has its own municipalities, as in the real data
+    uf_codes = rng.integers(0, len(UFS), rows)
+    municipio_codes = uf_codes * 200 + rng.integers(0, 200, rows)
+    df = pd.DataFrame(
+        {
+            "uf": pd.Categorical.from_codes(uf_codes, categories=pd.Index(UFS)),
+            "municipio": pd.Categorical.from_codes(
+                municipio_codes, categories=pd.Index([f"Município {i}" for i in range(len(UFS) * 200)])
+            ),
+            "evento": rng.choice(EVENTS, rows),
+            "arma": rng.choice(["Arma de fogo", "Arma branca", "Outros"], rows),
+            "feminino": rng.integers(0, 3, rows),
+            "masculino": rng.integers(0, 5, rows),
+            "nao_informado": rng.integers(0, 2, rows),
+            "total_vitima": rng.integers(0, 8, rows),
+            "total": rng.integers(0, 20, rows),
+            "total_peso": np.round(rng.random(rows) * 100, 3),
+            "ano": rng.choice([2021, 2022, 2023, 2024, 2025], rows),
+        }
+    )
+    return CrimeData(apply_schema(df))
+
+
+def _measure_load(path: Path) -> dict[str, Any]:
+    """Loads a serialized file in the current (fresh) process and reports time and memory."""
+    baseline = memory_mb()
+
+    start = time.perf_counter()
+    crime_data = CrimeDataSerializer.deserialize(path)
+    load_seconds = time.perf_counter() - start
+    after_load = memory_mb()
+
+    start = time.perf_counter()
+    crime_data.data.groupby("evento", observed=True)[config.NUMERIC_COLS].sum()
+    first_query_seconds = time.perf_counter() - start
+
+    return {
+        "load_seconds": load_seconds,
+        "first_query_seconds": first_query_seconds,
+        "load_rss_delta_mb": after_load["rss"] - baseline["rss"],
+        "load_peak_delta_mb": after_load["peak"] - baseline["rss"],
+        "peak_rss_mb": memory_mb()["peak"],
+    }
+
+
+def compare_serializers(crime_data: CrimeData, workdir: Path, repeats: int = 3) -> pd.DataFrame:
+    """
+    Compares cold starts of the parquet and Arrow IPC backends.
+
+    Each load runs in a fresh interpreter, as a real `analyze-crime-data` run would,
+    and the median over `repeats` runs is reported.
+    """
+    targets = {"parquet": workdir / "crimedata.parquet", "arrow": workdir / "crimedata.arrow"}
+    rows = []
+    for fmt, path in targets.items():
+        CrimeDataSerializer.serialize(crime_data, path)
+        size = sum(f.stat().st_size for f in path.rglob("*")) if path.is_dir() else path.stat().st_size
+
+        samples = []
+        for _ in range(repeats):
+            output = subprocess.run(
+                [sys.executable, "-m", "crime_data.benchmark", "_load", str(path)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            samples.append(json.loads(output.strip().splitlines()[-1]))
+
+        summary = pd.DataFrame(samples).median()
+        rows.append({"format": fmt, "size_mb": size / 1024**2, **summary.to_dict()})
+
+    return pd.DataFrame(rows).set_index("format")
+
+
+class _ScanCountingCrimeData(CrimeData):
+    """Counts the passes over the raw rows: row selections and builds of the aggregate cube."""
+
+    def __init__(self, data: pd.DataFrame) -> None:
+        super().__init__(data)
+        self.scans = 0
+
+    def select(self, *args: Any, **kwargs: Any) -> pd.DataFrame:
+        self.scans += 1
+        return super().select(*args, **kwargs)
+
+    @property
+    def cube(self) -> AggregateCube:
+        if self._cube is None:
+            self.scans += 1
+        return super().cube
+
+
+def compare_runner_modes(crime_data: CrimeData, repeats: int = 3) -> pd.DataFrame:
+    """
+    Runs the by-state analyzers one by one and with a shared scan, and reports the number
+    of passes over the raw rows and the median wall time of each mode. Every repeat starts
+    from a fresh CrimeData, so lazily built structures (row indexes, cube) are included.
+    """
+    analyzers: list[Callable[[], ScanAnalyzer]] = [
+        LethalCrimesByStateAnalyzer,
+        DrugSeizureByStateAnalyzer,
+        FirearmSeizureByStateAnalyzer,
+        VehicleCrimeByStateAnalyzer,
+        GenderOfVictimsAnalyzer,
+    ]
+    rows = []
+    outputs = {}
+    for mode, shared_scan in (("sequential", False), ("shared", True)):
+        samples = []
+        for _ in range(repeats):
+            runner = AnalysisRunner(shared_scan=shared_scan)
+            for analyzer in analyzers:
+                runner.register(analyzer())
+            counting = _ScanCountingCrimeData(crime_data.data)
+
+            start = time.perf_counter()
+            runner.run(counting)
+            samples.append({"seconds": time.perf_counter() - start, "scans": counting.scans})
+        outputs[mode] = runner.results
+        rows.append({"mode": mode, "analyzers": len(analyzers), **pd.DataFrame(samples).median().to_dict()})
+
+    for expected, result in zip(outputs["sequential"], outputs["shared"]):
+        pd.testing.assert_frame_equal(result.data, expected.data)
+    return pd.DataFrame(rows).set_index("mode")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks do pipeline de dados de criminalidade.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serializers = subparsers.add_parser("serializers", help="Compara parquet e Arrow IPC em cold start.")
+    serializers.add_argument("--rows", type=int, default=1_000_000)
+    serializers.add_argument("--repeats", type=int, default=3)
+
+    runner = subparsers.add_parser(
+        "runner", help="Compara análises executadas em sequência e com varredura compartilhada."
+    )
+    runner.add_argument("--rows", type=int, default=1_000_000)
+    runner.add_argument("--repeats", type=int, default=3)
+
+    # Internal: executed in a child process by compare_serializers
+    load = subparsers.add_parser("_load")
+    load.add_argument("path", type=Path)
+
+    args = parser.parse_args()
+
+    if args.command == "_load":
+        logging.disable(logging.INFO)
+        sys.stdout.write(json.dumps(_measure_load(args.path)) + "\n")
+        return
+
+    log.setup_logging()
+    if args.command == "serializers":
+        crime_data = synthetic_crime_data(args.rows)
+        logger.info(f"Dados sintéticos: {crime_data}")
+        with tempfile.TemporaryDirectory() as workdir:
+            result = compare_serializers(crime_data, Path(workdir), args.repeats)
+        logger.info("Cold start por formato (medianas):\n" + result.to_string(float_format="{:.3f}".format))
+    elif args.command == "runner":
+        crime_data = synthetic_crime_data(args.rows)
+        logger.info(f"Dados sintéticos: {crime_data}")
+        result = compare_runner_modes(crime_data, args.repeats)
+        logger.info("Execução das análises por UF (medianas):\n" + result.to_string(float_format="{:.3f}".format))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@ import logging
 
 import pandas as pd
 
-from .models import AprehensionCategory, BaseCategory, CrimeEvent, VictimCategory, WeightCategory
+from .models import CATEGORIES, BaseCategory, CrimeEvent, CrimeEventTable, RunningStats
 
 logger = logging.getLogger(__name__)
 
@@ -13,35 +13,67 @@ class CrimeEventsBuilder:
     def __init__(self, df: pd.DataFrame) -> None:
         self._df = df
 
-    def build(self) -> list[CrimeEvent]:
-        events: list[CrimeEvent] = []
-        for row in self._df.itertuples(index=False):
-            try:
-                event = CrimeEvent(
-                    name=getattr(row, "crime_type"),
-                    victims=getattr(row, "victims", 0),
-                    weight=getattr(row, "weight", 0.0),
-                    aprehensions=getattr(row, "aprehensions", 0),
-                )
-                events.append(event)
-
-            except (AttributeError, TypeError, ValueError) as e:
-                logger.critical(f"Skipping malformed Dataframe row: {row}. Error: {e}")
+    def build_table(self) -> CrimeEventTable:
+        """The events as a columnar table; malformed rows are skipped and logged in bulk."""
+        return CrimeEventTable.from_frame(self._df)
 
-        return events
+    def build(self) -> list[CrimeEvent]:
+        return self.build_table().to_events()
 
 
 class CrimeCategoryBuilder:
     """Receives a list of CrimeEvent objects and returns a dict of each crime category aggregate."""
 
-    def __init__(self, events: list[CrimeEvent]) -> None:
+    def __init__(self, events: list[CrimeEvent] | CrimeEventTable) -> None:
         self._events = events
 
     def build(self) -> dict[str, BaseCategory]:
         logger.info("--- Building aggregate Category objects from list of CrimeEvents. ---")
 
-        return {
-            "victims": VictimCategory([e.victims for e in self._events]),
-            "weight": WeightCategory([e.weight for e in self._events]),
-            "aprehensions": AprehensionCategory([e.aprehensions for e in self._events]),
-        }
+        if isinstance(self._events, CrimeEventTable):
+            return self._events.categories()
+        return {metric: category([getattr(e, metric) for e in self._events]) for metric, category in CATEGORIES.items()}
+
+
+class StreamingCategoryBuilder:
+    """
+    Accumulates the statistics of each crime category from batches of CrimeEvent objects
+    (or frames shaped like CrimeEventsBuilder's input), without keeping the values.
+
+    Builders fed with different chunks or on different workers can be merged; the
+    categories built from the result match those of CrimeCategoryBuilder over all events.
+    """
+
+    def __init__(self) -> None:
+        self._stats = {metric: RunningStats() for metric in CATEGORIES}
+
+    @property
+    def stats(self) -> dict[str, RunningStats]:
+        return dict(self._stats)
+
+    def update(self, batch: list[CrimeEvent] | pd.DataFrame) -> "StreamingCategoryBuilder":
+        """
+        Folds a batch of events into the statistics. Returns self.
+
+        Frames are read like CrimeEventTable.from_frame: each metric comes from its own
+        column or its source column, and rows with invalid values are skipped and logged.
+        A metric with neither column raises a KeyError.
+        """
+        if isinstance(batch, pd.DataFrame):
+            values, valid = CrimeEventTable.read_fields(batch, strict=True)
+            CrimeEventTable.log_rejected(batch, valid)
+            for metric, stats in self._stats.items():
+                stats.update(values[metric][valid])
+            return self
+        for metric, stats in self._stats.items():
+            stats.update([getattr(event, metric) for event in batch])
+        return self
+
+    def merge(self, other: "StreamingCategoryBuilder") -> "StreamingCategoryBuilder":
+        """A builder holding the statistics of both; neither operand is modified."""
+        merged = StreamingCategoryBuilder()
+        merged._stats = {metric: stats.merge(other._stats[metric]) for metric, stats in self._stats.items()}
+        return merged
+
+    def build(self) -> dict[str, BaseCategory]:
+        return {metric: category.from_stats(self._stats[metric]) for metric, category in CATEGORIES.items()}
@@ -0,0 +1,240 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils import config
+
+from .loader import CrimeDataLoader
+from .models import CrimeData
+from .schema import concat_frames
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CacheEntry:
+    """Manifest record for one source workbook and its cached parquet part."""
+
+    sha256: str
+    size: int
+    mtime_ns: int
+    part: str
+
+
+class SourceFileCache:
+    """
+    Incremental cache of parsed source workbooks.
+
+    Each workbook is stored as its own parquet part, and a JSON manifest keeps the
+    content hash, size and mtime of the source it came from. Syncing re-ingests only
+    new or changed workbooks and evicts parts whose source was deleted.
+    """
+
+    MANIFEST_NAME = "manifest.json"
+    MANIFEST_VERSION = 1
+
+    def __init__(self, cache_dir: Path, loader: CrimeDataLoader) -> None:
+        self._cache_dir = cache_dir
+        self._loader = loader
+        self._entries: dict[str, CacheEntry] = {}
+        self._signature = f"streaming={loader.streaming}"
+        self._read_manifest()
+
+    @property
+    def manifest_path(self) -> Path:
+        return self._cache_dir / self.MANIFEST_NAME
+
+    @property
+    def entries(self) -> dict[str, CacheEntry]:
+        return dict(self._entries)
+
+    def _read_manifest(self) -> None:
+        if not self.manifest_path.exists():
+            return
+        try:
+            manifest = json.loads(self.manifest_path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Manifesto do cache ilegível, ignorando: {e}")
+            return
+
+        if manifest.get("version") != self.MANIFEST_VERSION or manifest.get("signature") != self._signature:
+            logger.info("Manifesto do cache incompatível com a configuração atual. O cache será reconstruído.")
+            return
+        self._entries = {name: CacheEntry(**entry) for name, entry in manifest.get("entries", {}).items()}
+
+    def _write_manifest(self) -> None:
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        manifest = {
+            "version": self.MANIFEST_VERSION,
+            "signature": self._signature,
+            "entries": {name: asdict(entry) for name, entry in sorted(self._entries.items())},
+        }
+        tmp_path = self.manifest_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+        tmp_path.replace(self.manifest_path)
+
+    @staticmethod
+    def _hash_file(filepath: Path) -> str:
+        with filepath.open("rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+    def _is_fresh(self, filepath: Path, entry: CacheEntry | None) -> bool:
+        """Checks whether a cached part still matches its source file."""
+        if entry is None or not (self._cache_dir / entry.part).exists():
+            return False
+
+        stat = filepath.stat()
+        if stat.st_size == entry.size and stat.st_mtime_ns == entry.mtime_ns:
+            return True
+
+        # Size or mtime changed: only the content hash decides (e.g. a file that was just touched)
+        if stat.st_size == entry.size and self._hash_file(filepath) == entry.sha256:
+            entry.mtime_ns = stat.st_mtime_ns
+            return True
+        return False
+
+    def _evict(self, name: str) -> None:
+        entry = self._entries.pop(name)
+        (self._cache_dir / entry.part).unlink(missing_ok=True)
+
+    def sync(self) -> bool:
+        """
+        Brings the cache in line with the source directory.
+
+        Returns:
+            bool: True if any part was added, replaced or evicted.
+        """
+        sources = {f.name: f for f in self._loader.source_files()}
+        changed = False
+
+        for name in [n for n in self._entries if n not in sources]:
+            logger.info(f"Arquivo de origem removido, descartando do cache: {name}")
+            self._evict(name)
+            changed = True
+
+        stale = [f for name, f in sources.items() if not self._is_fresh(f, self._entries.get(name))]
+        if stale:
+            logger.info(f"{len(stale)} arquivo(s) novo(s) ou alterado(s): {[f.name for f in stale]}")
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+
+            for filepath, df in zip(stale, self._loader.load_files(stale)):
+                if filepath.name in self._entries:
+                    self._evict(filepath.name)
+
+                sha256 = self._hash_file(filepath)
+                stat = filepath.stat()
+                part = f"{filepath.stem}-{sha256[:16]}.parquet"
+                df.to_parquet(self._cache_dir / part, index=False)
+                self._entries[filepath.name] = CacheEntry(sha256, stat.st_size, stat.st_mtime_ns, part)
+            changed = True
+        else:
+            logger.info("Cache de arquivos de origem atualizado. Nada a reprocessar.")
+
+        self._write_manifest()
+        return changed
+
+    def _read_part(self, name: str, columns: list[str] | None) -> pd.DataFrame:
+        path = self._cache_dir / self._entries[name].part
+        if columns is not None:
+            available = set(pq.read_schema(path).names)
+            columns = [col for col in columns if col in available]
+        return pd.read_parquet(path, columns=columns)
+
+    def load(self, columns: list[str] | None = None) -> CrimeData:
+        """
+        Assembles the combined CrimeData from the cached parts, in source-file order.
+        If `columns` is given, only those columns are read from each part.
+        """
+        if not self._entries:
+            logger.error("Aviso: Cache vazio. Nenhum dado de origem disponível.")
+            return CrimeData(pd.DataFrame())
+
+        parts = [self._read_part(name, columns) for name in sorted(self._entries)]
+        return CrimeData(concat_frames(parts))
+
+    def clear(self) -> None:
+        """Removes every cached part along with the manifest."""
+        if self._cache_dir.exists():
+            shutil.rmtree(self._cache_dir)
+        self._entries = {}
+
+
+class ResultCache:
+    """
+    Content-addressed store of analysis results.
+
+    Each result frame is a parquet file named after the hash of everything it was
+    computed from (see `key`), with its remaining fields in the schema metadata.
+    Reading an entry refreshes its mtime, and writing evicts the least recently
+    used entries beyond `max_files` or `max_bytes`.
+    """
+
+    METADATA_KEY = b"crime_data.result"
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        max_files: int = config.RESULT_CACHE_MAX_FILES,
+        max_bytes: int = config.RESULT_CACHE_MAX_MB * 1024**2,
+    ) -> None:
+        self._cache_dir = cache_dir
+        self.max_files = max_files
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def key(**parts: Any) -> str:
+        """Hash of the given parts (JSON-serializable, compared by value)."""
+        payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self._cache_dir / f"{key}.parquet"
+
+    def get(self, key: str) -> tuple[pd.DataFrame, dict[str, Any]] | None:
+        """Returns the stored frame and metadata, or None if there is no (readable) entry."""
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            table = pq.read_table(path)
+            metadata = json.loads((table.schema.metadata or {})[self.METADATA_KEY])
+        except (OSError, KeyError, ValueError, pa.ArrowException) as e:
+            logger.warning(f"Entrada ilegível no cache de resultados, descartando: {path.name} ({e})")
+            path.unlink(missing_ok=True)
+            return None
+
+        os.utime(path)
+        return table.to_pandas(), metadata
+
+    def put(self, key: str, data: pd.DataFrame, metadata: dict[str, Any]) -> None:
+        table = pa.Table.from_pandas(data)
+        schema_metadata = {**(table.schema.metadata or {}), self.METADATA_KEY: json.dumps(metadata).encode()}
+
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        pq.write_table(table.replace_schema_metadata(schema_metadata), tmp_path)
+        tmp_path.replace(path)
+        self._evict()
+
+    def _evict(self) -> None:
+        entries = sorted(self._cache_dir.glob("*.parquet"), key=lambda p: p.stat().st_mtime_ns, reverse=True)
+        total = 0
+        for position, path in enumerate(entries):
+            total += path.stat().st_size
+            # The most recent entry is always kept, even if it alone exceeds the size bound
+            if position > 0 and (position >= self.max_files or total > self.max_bytes):
+                path.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        if self._cache_dir.exists():
+            shutil.rmtree(self._cache_dir)
@@ -0,0 +1,118 @@
+import json
+import logging
+import os
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils import config
+
+logger = logging.getLogger(__name__)
+
+
+class AggregateCube:
+    """
+    Sums of the numeric columns over every observed evento × uf × ano × municipio cell.
+
+    Built once from the raw rows, it answers any sum over a subset of those dimensions
+    by rolling up the (much smaller) cube instead of scanning the raw data again.
+    """
+
+    METADATA_KEY = b"crime_data.cube"
+
+    def __init__(self, data: pd.DataFrame, dimensions: list[str], measures: list[str], fingerprint: str = "") -> None:
+        self._data = data
+        self.dimensions = dimensions
+        self.measures = measures
+        self.fingerprint = fingerprint
+
+    @property
+    def data(self) -> pd.DataFrame:
+        return self._data
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, fingerprint: str = "") -> "AggregateCube":
+        """Aggregates a raw frame over the configured dimensions that are present in it."""
+        dimensions = [dim for dim in config.CUBE_DIMENSIONS if dim in df.columns]
+        measures = [col for col in config.NUMERIC_COLS if col in df.columns]
+        if not dimensions:
+            raise KeyError(f"Nenhuma das dimensões do cubo está presente: {config.CUBE_DIMENSIONS}")
+
+        logger.info(f"Construindo cubo de agregados sobre {dimensions}...")
+        # dropna=False keeps rows whose municipio (or another dimension) is missing in the totals
+        cube = df.groupby(dimensions, observed=True, dropna=False, sort=False)[measures].sum().reset_index()
+        # Weights are stored as float32 in the raw frame; the cell totals are rolled up again, so keep them in float64
+        cube = cube.astype({col: "float64" for col in measures if cube[col].dtype == "float32"})
+        logger.info(f"Cubo construído: {len(cube):,} células para {len(df):,} linhas.")
+        return cls(cube, dimensions, measures, fingerprint)
+
+    @classmethod
+    def load_or_build(cls, df: pd.DataFrame, fingerprint: str, path: Path | None) -> "AggregateCube":
+        """Reads the cube stored at `path` if it was built from the same data, otherwise builds and stores it."""
+        if path is not None and path.exists():
+            cube = cls.load(path)
+            if cube is not None and cube.fingerprint == fingerprint:
+                logger.info(f"Cubo de agregados carregado de '{path}'.")
+                return cube
+
+        cube = cls.from_frame(df, fingerprint)
+        if path is not None:
+            cube.save(path)
+        return cube
+
+    def save(self, path: Path) -> None:
+        table = pa.Table.from_pandas(self._data, preserve_index=False)
+        header = {"fingerprint": self.fingerprint, "dimensions": self.dimensions, "measures": self.measures}
+        metadata = {**(table.schema.metadata or {}), self.METADATA_KEY: json.dumps(header).encode()}
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Workers may build the same cube at once; readers only ever see a complete file
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        pq.write_table(table.replace_schema_metadata(metadata), tmp_path)
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "AggregateCube | None":
+        """Reads a stored cube, or returns None if the file is unreadable or holds no cube."""
+        try:
+            table = pq.read_table(path)
+        except (OSError, pa.ArrowInvalid) as e:
+            logger.warning(f"Cubo de agregados ilegível em '{path}', será reconstruído ({e}).")
+            return None
+        raw_header = (table.schema.metadata or {}).get(cls.METADATA_KEY)
+        if raw_header is None:
+            logger.warning(f"Arquivo '{path}' não contém um cubo de agregados.")
+            return None
+        header = json.loads(raw_header)
+        return cls(table.to_pandas(), header["dimensions"], header["measures"], header["fingerprint"])
+
+    def rollup(
+        self,
+        dimensions: Sequence[str] = (),
+        events: Iterable[str] | None = None,
+        ufs: Iterable[str] | None = None,
+        years: Iterable[int] | None = None,
+        measures: Sequence[str] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Sums the measures over the given dimensions, optionally restricted to some events, UFs and years.
+
+        With no dimensions, returns a single row with the grand totals. As in a groupby over the
+        raw rows, cells whose grouping dimensions are missing are left out.
+        """
+        missing = [dim for dim in dimensions if dim not in self.dimensions]
+        measures = list(measures) if measures is not None else self.measures
+        missing += [col for col in measures if col not in self.measures]
+        if missing:
+            raise KeyError(f"Colunas ausentes no cubo: {missing}")
+
+        cells = self._data
+        for column, values in (("evento", events), ("uf", ufs), ("ano", years)):
+            if values is not None:
+                cells = cells[cells[column].isin(list(values))]
+
+        if not dimensions:
+            return cells[measures].sum().to_frame().T
+        return cells.groupby(list(dimensions), observed=True)[measures].sum().reset_index()
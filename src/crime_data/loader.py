@@ -1,21 +1,40 @@
 import logging
+import time
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
-from typing import List
+from typing import Any, List
 
 import pandas as pd
 import regex as re
+from openpyxl import load_workbook
+
+from utils import config
 
 from .models import CrimeData
+from .schema import apply_schema, concat_frames, parse_numeric
 
 logger = logging.getLogger(__name__)
 
 
 class CrimeDataLoader:
-    def __init__(self, source_dir: Path):
+    def __init__(
+        self,
+        source_dir: Path,
+        max_workers: int = 1,
+        streaming: bool = False,
+        batch_size: int = config.LOADER_BATCH_SIZE,
+    ):
         self._source_dir = source_dir
+        self._max_workers = max(1, max_workers)
+        self._streaming = streaming
+        self._batch_size = batch_size
         self._dataframes: List[pd.DataFrame] = []
+        self.timings: dict[str, float] = {}
 
-    def _process_file(self, filepath: Path) -> pd.DataFrame:
+    @staticmethod
+    def _process_file(filepath: Path) -> pd.DataFrame:
         """
         Abstrai o processamento de um único arquivo Excel.
         """
@@ -23,7 +42,7 @@ class CrimeDataLoader:
 
         df = pd.read_excel(filepath, sheet_name=0)
         try:
-            year = self._get_year_from_file(filepath)
+            year = CrimeDataLoader._get_year_from_file(filepath)
             df["ano"] = year
         except ValueError:
             logger.error(
@@ -32,24 +51,156 @@ class CrimeDataLoader:
             )
         return df
 
-    def _get_year_from_file(self, filepath: Path) -> int:
+    @staticmethod
+    def _parse_numeric_batch(df: pd.DataFrame) -> pd.DataFrame:
+        """Converte as colunas numéricas de um lote, tratando a vírgula decimal."""
+        for col in config.NUMERIC_COLS:
+            if col in df.columns:
+                df[col] = parse_numeric(df[col])
+        return df
+
+    @staticmethod
+    def iter_file_batches(
+        filepath: Path, batch_size: int = config.LOADER_BATCH_SIZE, columns: list[str] = config.SOURCE_COLS
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Lê a primeira planilha de um arquivo em lotes de `batch_size` linhas, em modo somente leitura.
+
+        Apenas as colunas em `columns` são mantidas, e as colunas numéricas já saem convertidas.
+        A planilha bruta nunca é carregada inteira em memória.
+        """
+        try:
+            year: int | None = CrimeDataLoader._get_year_from_file(filepath)
+        except ValueError:
+            year = None
+            logger.error(
+                f"Aviso: Não foi possível extrair o ano do nome do arquivo {filepath.name}. "
+                f"A coluna 'ano' não será adicionada para este arquivo."
+            )
+
+        workbook = load_workbook(filepath, read_only=True, data_only=True)
+        try:
+            rows = workbook.worksheets[0].iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+
+            positions = {name: idx for idx, name in enumerate(header) if name in columns}
+            missing = [col for col in columns if col not in positions]
+            if missing:
+                logger.warning(f"Colunas ausentes em {filepath.name}: {missing}")
+            selected = [col for col in columns if col in positions]
+            indices = [positions[col] for col in selected]
+
+            batch: list[tuple[Any, ...]] = []
+            for row in rows:
+                batch.append(tuple(row[i] if i < len(row) else None for i in indices))
+                if len(batch) >= batch_size:
+                    yield CrimeDataLoader._build_batch(batch, selected, year)
+                    batch = []
+            if batch:
+                yield CrimeDataLoader._build_batch(batch, selected, year)
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _build_batch(rows: list[tuple[Any, ...]], columns: list[str], year: int | None) -> pd.DataFrame:
+        df = pd.DataFrame.from_records(rows, columns=columns)
+        df = CrimeDataLoader._parse_numeric_batch(df)
+        if year is not None:
+            df["ano"] = year
+        return df
+
+    @staticmethod
+    def _process_file_streaming(filepath: Path, batch_size: int = config.LOADER_BATCH_SIZE) -> pd.DataFrame:
+        """Monta o DataFrame de um arquivo a partir dos lotes, já com as colunas projetadas."""
+        logger.info(f"Processando arquivo em lotes: {filepath.name}...")
+        batches = list(CrimeDataLoader.iter_file_batches(filepath, batch_size))
+        if not batches:
+            return pd.DataFrame()
+        return pd.concat(batches, ignore_index=True)
+
+    @staticmethod
+    def _timed_process_file(
+        filepath: Path, streaming: bool = False, batch_size: int = config.LOADER_BATCH_SIZE
+    ) -> tuple[pd.DataFrame, float]:
+        """
+        Processa um arquivo e devolve também o tempo de parsing, em segundos.
+        Definido como staticmethod para poder ser enviado a processos filhos.
+        """
+        start = time.perf_counter()
+        if streaming:
+            df = CrimeDataLoader._process_file_streaming(filepath, batch_size)
+        else:
+            df = CrimeDataLoader._process_file(filepath)
+        return df, time.perf_counter() - start
+
+    @staticmethod
+    def _get_year_from_file(filepath: Path) -> int:
         filename = filepath.stem
         pat = r"\d{4}"
         if match := re.search(pat, filename):
             return int(match.group(0))
         raise ValueError
 
+    def source_files(self) -> list[Path]:
+        """Arquivos .xlsx do diretório de origem, em ordem estável."""
+        # Ordenado para que a concatenação seja estável entre execuções
+        return sorted(self._source_dir.glob("*.xlsx"))
+
+    def iter_batches(self) -> Iterator[pd.DataFrame]:
+        """
+        Percorre todos os arquivos do diretório de origem, em ordem, gerando lotes projetados.
+        Permite que etapas seguintes consumam os dados sem materializar as planilhas.
+        """
+        for filepath in self.source_files():
+            yield from self.iter_file_batches(filepath, self._batch_size)
+
+    def _load_sequential(self, xlsx_files: list[Path]) -> list[tuple[pd.DataFrame, float]]:
+        return [self._timed_process_file(f, self._streaming, self._batch_size) for f in xlsx_files]
+
+    def _load_parallel(self, xlsx_files: list[Path]) -> list[tuple[pd.DataFrame, float]]:
+        workers = min(self._max_workers, len(xlsx_files))
+        logger.info(f"Carregando {len(xlsx_files)} arquivos em paralelo com {workers} processos...")
+        task = partial(self._timed_process_file, streaming=self._streaming, batch_size=self._batch_size)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # executor.map preserva a ordem de entrada, independente da ordem de conclusão
+            return list(executor.map(task, xlsx_files))
+
+    @property
+    def streaming(self) -> bool:
+        return self._streaming
+
+    def load_files(self, xlsx_files: list[Path]) -> list[pd.DataFrame]:
+        """
+        Processa os arquivos informados, em paralelo quando configurado,
+        devolvendo um DataFrame por arquivo na mesma ordem da entrada.
+        """
+        if not xlsx_files:
+            return []
+
+        if self._max_workers > 1 and len(xlsx_files) > 1:
+            parsed = self._load_parallel(xlsx_files)
+        else:
+            parsed = self._load_sequential(xlsx_files)
+
+        for f, (_, elapsed) in zip(xlsx_files, parsed):
+            self.timings[f.name] = elapsed
+            logger.info(f"Arquivo {f.name} processado em {elapsed:.2f}s.")
+
+        return [apply_schema(df) for df, _ in parsed]
+
     def load(self) -> CrimeData:
         # Itera sobre todos os arquivos .xlsx no diretório
-        xlsx_files = list(self._source_dir.glob("*.xlsx"))
+        xlsx_files = self.source_files()
 
         if not xlsx_files:
             logger.error(f"Aviso: Nenhum arquivo .xlsx encontrado em {self._source_dir}")
             return CrimeData(pd.DataFrame())
 
-        self._dataframes = [self._process_file(f) for f in xlsx_files]
+        self._dataframes = self.load_files(xlsx_files)
 
         # Concatena todos os DataFrames em um só
-        full_df = pd.concat(self._dataframes, ignore_index=True)
+        full_df = concat_frames(self._dataframes)
 
         return CrimeData(full_df)
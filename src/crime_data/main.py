@@ -1,77 +1,218 @@
 import argparse
 import logging
+import shutil
 
 from utils import config, log
+from utils.metrics import RunMetrics
 
+from .cache import ResultCache, SourceFileCache
 from .loader import CrimeDataLoader
 from .models import CrimeData
 from .reporter import ReportDispatcher
-from .scorer import AnalysisRunner, SeverityAnalyzer
-from .serializer import CrimeDataSerializer
+from .scorer import AnalysisRunner, ExecutionMode, SeverityAnalyzer
+from .serializer import CrimeDataSerializer, ParquetFilters
 
 log.setup_logging()
 logger = logging.getLogger(__name__)
 
 
-def handle_cli_args() -> None:
+def handle_cli_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Ferramenta para analisar dados de segurança pública.")
     parser.add_argument(
         "--clear",
         action="store_true",  # Transforma o argumento em uma flag booleana
-        help="Apaga o arquivo de dados serializado para forçar uma reconstrução a partir da fonte.",
+        help="Apaga os dados serializados e os caches para forçar uma reconstrução a partir da fonte.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=config.LOADER_MAX_WORKERS,
+        help="Número de processos usados para ler as planilhas de origem (padrão: %(default)s).",
+    )
+    parser.add_argument(
+        "--streaming",
+        action="store_true",
+        help="Lê as planilhas em lotes, mantendo apenas as colunas usadas pelas análises.",
+    )
+    parser.add_argument(
+        "--modo",
+        choices=["sequential", "thread", "process"],
+        default=config.ANALYSIS_MODE,
+        help="Como executar as análises: em sequência, em threads ou em processos (padrão: %(default)s).",
+    )
+    parser.add_argument(
+        "--analise-workers",
+        type=int,
+        default=config.ANALYSIS_MAX_WORKERS,
+        help="Número de threads/processos para as análises; 0 usa o padrão do executor (padrão: %(default)s).",
+    )
+    parser.add_argument(
+        "--anos",
+        type=int,
+        nargs="+",
+        help="Restringe a análise aos anos informados (lê apenas as partições correspondentes).",
+    )
+    parser.add_argument(
+        "--ufs",
+        nargs="+",
+        help="Restringe a análise às UFs informadas.",
+    )
+    parser.add_argument(
+        "--metricas",
+        action="store_true",
+        help=f"Grava as métricas de desempenho de cada etapa em JSON, em '{config.METRICS_DIR}'.",
+    )
+    parser.add_argument(
+        "--tracemalloc",
+        action="store_true",
+        help="Registra também o pico de alocações Python de cada etapa (torna a execução mais lenta).",
     )
     args = parser.parse_args()
 
     if args.clear:
         logger.info(f"Argumento --clear detectado. Tentando apagar '{config.SERIALIZE_FILEPATH}'...")
         try:
-            if config.SERIALIZE_FILEPATH.exists():
+            if config.SERIALIZE_FILEPATH.is_dir():
+                shutil.rmtree(config.SERIALIZE_FILEPATH)  # Apaga o dataset particionado
+                logger.info("Arquivo serializado apagado com sucesso.")
+            elif config.SERIALIZE_FILEPATH.exists():
                 config.SERIALIZE_FILEPATH.unlink()  # Apaga o arquivo
                 logger.info("Arquivo serializado apagado com sucesso.")
             else:
                 logger.info("Nenhum arquivo serializado para apagar.")
+            config.CUBE_FILEPATH.unlink(missing_ok=True)
         except OSError as e:
             logger.error(f"Impossível apagar o arquivo: {e}")
 
+        logger.info(f"Apagando os caches em '{config.CACHE_DIR}'...")
+        try:
+            shutil.rmtree(config.CACHE_DIR)
+            logger.info("Caches apagados com sucesso.")
+        except FileNotFoundError:
+            logger.info("Nenhum cache para apagar.")
+        except OSError as e:
+            logger.error(f"Impossível apagar o cache: {e}")
 
-def load_or_build_data() -> CrimeData:
-    logger.info("--- Iniciando carregamento de dados de Política Criminal ---")
+    return args
+
+
+def build_filters(years: list[int] | None, ufs: list[str] | None) -> ParquetFilters | None:
+    filters: list[tuple[str, str, object]] = []
+    if years:
+        filters.append(("ano", "in", years))
+    if ufs:
+        filters.append(("uf", "in", [uf.upper() for uf in ufs]))
+    return filters or None
 
-    if not config.SERIALIZE_FILEPATH.exists():
-        logger.info("Arquivo processado não encontrado. Construindo dados a partir da fonte...")
-        loader = CrimeDataLoader(config.INPUT_DIR)
-        crime_data = loader.load()
+
+def load_or_build_data(
+    workers: int = 1,
+    streaming: bool = False,
+    filters: ParquetFilters | None = None,
+    columns: list[str] | None = None,
+    metrics: RunMetrics | None = None,
+) -> CrimeData:
+    logger.info("--- Iniciando carregamento de dados de Política Criminal ---")
+    if metrics is None:
+        metrics = RunMetrics()
+
+    # Reprocessa apenas as planilhas novas ou alteradas desde a última execução
+    loader = CrimeDataLoader(config.INPUT_DIR, max_workers=workers, streaming=streaming)
+    cache = SourceFileCache(config.SOURCE_CACHE_DIR, loader)
+    with metrics.stage("sincronização das planilhas"):
+        changed = cache.sync()
+
+    snapshot_exists = config.SERIALIZE_FILEPATH.exists()
+    if snapshot_exists and not cache.entries:
+        # Planilhas ausentes ou movidas não devem apagar um snapshot válido
+        logger.warning(f"Nenhuma planilha de origem em '{config.INPUT_DIR}'. Usando o snapshot existente.")
+        changed = False
+
+    if changed or not snapshot_exists:
+        logger.info("Montando dados a partir do cache de planilhas...")
+        with metrics.stage("carga") as stage:
+            crime_data = cache.load()
+            stage.rows = len(crime_data.data)
+
+        if crime_data.data.empty:
+            if snapshot_exists:
+                logger.warning("Os dados remontados estão vazios. Mantendo o snapshot existente.")
+                return _deserialize(filters, columns, metrics)
+            return _attach_caches(crime_data, metrics)
 
         logger.info(f"Salvando dados processados para uso futuro em '{config.SERIALIZE_FILEPATH}'...")
-        CrimeDataSerializer.serialize(crime_data, config.SERIALIZE_FILEPATH)
+        with metrics.stage("serialização") as stage:
+            stage.rows = len(crime_data.data)
+            CrimeDataSerializer.serialize(crime_data, config.SERIALIZE_FILEPATH)
 
-        return crime_data
+        if not filters:
+            if columns is not None:
+                crime_data = CrimeData(crime_data.data[[col for col in columns if col in crime_data.data.columns]])
+            return _attach_caches(crime_data, metrics)
 
+    return _deserialize(filters, columns, metrics)
+
+
+def _deserialize(filters: ParquetFilters | None, columns: list[str] | None, metrics: RunMetrics) -> CrimeData:
     logger.info(f"Arquivo processado encontrado em '{config.SERIALIZE_FILEPATH}'. Carregando...")
-    return CrimeDataSerializer.deserialize(config.SERIALIZE_FILEPATH)
+    with metrics.stage("desserialização") as stage:
+        crime_data = CrimeDataSerializer.deserialize(config.SERIALIZE_FILEPATH, filters=filters, columns=columns)
+        stage.rows = len(crime_data.data)
+    return _attach_caches(crime_data, metrics)
+
+
+def _attach_caches(crime_data: CrimeData, metrics: RunMetrics) -> CrimeData:
+    crime_data.cache_dir = config.PROCESSED_CACHE_DIR
+    crime_data.cube_path = config.CUBE_FILEPATH
+    crime_data.metrics = metrics
+    return crime_data
 
 
-def perform_analysis(crime_data: CrimeData) -> None:
-    reporter = ReportDispatcher()
-    runner = AnalysisRunner()
+def build_runner(
+    mode: ExecutionMode = "sequential", max_workers: int | None = None, metrics: RunMetrics | None = None
+) -> AnalysisRunner:
+    runner = AnalysisRunner(
+        mode=mode, max_workers=max_workers, metrics=metrics, result_cache=ResultCache(config.RESULT_CACHE_DIR)
+    )
 
     # runner.register(DrugSeizureByStateAnalyzer())
     # runner.register(FirearmSeizureByStateAnalyzer())
     # runner.register(GenderOfVictimsAnalyzer())
     # runner.register(LethalCrimesByStateAnalyzer())
-    # runner.register(SeverityAnalyzer())
-    analyzer = SeverityAnalyzer()  # The analyzer is now self-contained
-    final_results_df = analyzer.analyze(crime_data)  # Pass the processed df
-    logger.info(final_results_df.to_string())
+    runner.register(SeverityAnalyzer())
+    # runner.register(SeveritySweepAnalyzer())
+    # runner.register(GroupedSeverityAnalyzer(by=["uf", "ano"]))
+    # runner.register(SeverityBootstrapAnalyzer())
+
+    return runner
+
 
-    # runner.run(crime_data)
-    # reporter.process_reports(runner.results)
+def perform_analysis(crime_data: CrimeData, runner: AnalysisRunner, metrics: RunMetrics | None = None) -> None:
+    reporter = ReportDispatcher(metrics)
+
+    runner.run(crime_data)
+    reporter.process_reports(runner.results)
 
 
 def run() -> None:
-    handle_cli_args()
-    crime_data = load_or_build_data()
-    perform_analysis(crime_data)
+    args = handle_cli_args()
+    filters = build_filters(args.anos, args.ufs)
+
+    metrics = RunMetrics(trace_memory=args.tracemalloc)
+
+    # Só as colunas usadas pelos analisadores registrados são materializadas
+    runner = build_runner(mode=args.modo, max_workers=args.analise_workers or None, metrics=metrics)
+    columns = runner.required_columns()
+    logger.info(f"Colunas requeridas pelas análises: {columns if columns is not None else 'todas'}")
+
+    crime_data = load_or_build_data(
+        workers=args.workers, streaming=args.streaming, filters=filters, columns=columns, metrics=metrics
+    )
+    perform_analysis(crime_data, runner, metrics)
+
+    logger.info("Métricas da execução:\n" + metrics.summary())
+    if args.metricas:
+        logger.info(f"Métricas gravadas em '{metrics.dump(config.METRICS_DIR)}'.")
 
 
 if __name__ == "__main__":
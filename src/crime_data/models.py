@@ -1,26 +1,181 @@
+import hashlib
+import json
+import logging
 import math
+import os
+import threading
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from collections.abc import Hashable, Iterable, Iterator, Sequence
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import ClassVar
 
+import numpy as np
 import pandas as pd
 
 from utils import config
+from utils.metrics import RunMetrics, StageMetrics
+
+from .cube import AggregateCube
+
+logger = logging.getLogger(__name__)
+
+
+class RowIndex:
+    """
+    Maps each value of a column to the positions of the rows holding it.
+
+    Row positions are kept in one array sorted by value code, so the rows of a value
+    form a contiguous slice of it.
+    """
+
+    def __init__(self, values: pd.Series):
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Categoricals already carry integer codes, so the strings are never scanned
+            codes = values.cat.codes.to_numpy()
+            uniques: Iterable[Hashable] = values.cat.categories
+        else:
+            codes, uniques = pd.factorize(values)
+        self._lookup = {value: code for code, value in enumerate(uniques)}
+        self.codes = codes
+
+        # Shift by one so missing values (code -1) sort first and are never selected.
+        # 16-bit codes let numpy use a radix sort for the stable argsort.
+        shifted = codes.astype(np.int16 if len(self._lookup) < np.iinfo(np.int16).max else np.int64) + 1
+        self._order = np.argsort(shifted, kind="stable")
+        self._offsets = np.concatenate([[0], np.cumsum(np.bincount(shifted, minlength=len(self._lookup) + 1))])
+
+    def codes_for(self, values: Iterable[Hashable]) -> np.ndarray:
+        """Codes of the given values; values absent from the column are ignored."""
+        return np.array(sorted({self._lookup[v] for v in values if v in self._lookup}), dtype=np.int64)
+
+    def count(self, values: Iterable[Hashable]) -> int:
+        codes = self.codes_for(values)
+        return int((self._offsets[codes + 2] - self._offsets[codes + 1]).sum())
+
+    def positions(self, values: Iterable[Hashable]) -> np.ndarray:
+        """Sorted positions of the rows holding any of the given values."""
+        slices = [self._order[self._offsets[c + 1] : self._offsets[c + 2]] for c in self.codes_for(values)]
+        if not slices:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(slices))
 
 
 class CrimeData:
     """
     Represents the raw crime data from all available years and
     provides methods to process it.
+
+    The raw frame is treated as immutable: derived results (fingerprint, processed
+    aggregate, row indexes, aggregate cube) are memoised on the instance, and built
+    under a lock so analyzers running in threads can share it.
     """
 
-    def __init__(self, data: pd.DataFrame):
+    # Bump when the processing logic changes, so aggregates cached on disk are discarded
+    PROCESSING_VERSION = 2
+
+    def __init__(self, data: pd.DataFrame, cache_dir: Path | None = None, cube_path: Path | None = None):
         self._data = data
+        # When set, the processed aggregate is also persisted here across runs
+        self.cache_dir = cache_dir
+        # When set, the aggregate cube is stored here and reused while the data is unchanged
+        self.cube_path = cube_path
+        self._fingerprint: str | None = None
+        # Processed aggregates, by their grouping columns (besides 'evento')
+        self._processed: dict[tuple[str, ...], pd.DataFrame] = {}
+        self._row_indexes: dict[str, RowIndex] = {}
+        self._cube: AggregateCube | None = None
+        self._lock = threading.RLock()
+        # When set, building the processed aggregate is recorded as a stage
+        self.metrics: RunMetrics | None = None
 
     @property
     def data(self) -> pd.DataFrame:
         """Returns the original, raw DataFrame."""
         return self._data
 
+    @property
+    def fingerprint(self) -> str:
+        """A content hash of the raw data (columns, dtypes and values)."""
+        with self._lock:
+            if self._fingerprint is None:
+                digest = hashlib.sha256()
+                layout = [[str(col), str(dtype)] for col, dtype in self._data.dtypes.items()]
+                digest.update(json.dumps(layout).encode())
+                digest.update(pd.util.hash_pandas_object(self._data, index=False).to_numpy().tobytes())
+                self._fingerprint = digest.hexdigest()
+            return self._fingerprint
+
+    @property
+    def cube(self) -> AggregateCube:
+        """The evento × uf × ano × municipio aggregate cube, built (or read from `cube_path`) on first use."""
+        with self._lock:
+            if self._cube is None:
+                if self.cube_path is None:
+                    self._cube = AggregateCube.from_frame(self._data)
+                else:
+                    self._cube = AggregateCube.load_or_build(self._data, self.fingerprint, self.cube_path)
+            return self._cube
+
+    def row_index(self, column: str) -> RowIndex:
+        """The row index of a column, built on first use."""
+        with self._lock:
+            if column not in self._row_indexes:
+                self._row_indexes[column] = RowIndex(self._data[column])
+            return self._row_indexes[column]
+
+    def select(
+        self,
+        events: Iterable[str] | None = None,
+        ufs: Iterable[str] | None = None,
+        years: Iterable[int] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Returns the raw rows matching all the given criteria, in their original order.
+
+        Uses the row indexes instead of boolean masks over the whole frame: the positions
+        of the most selective criterion are looked up, and the other criteria are checked
+        only on those rows.
+        """
+        criteria = [
+            (column, list(values))
+            for column, values in (("evento", events), ("uf", ufs), ("ano", years))
+            if values is not None
+        ]
+        if not criteria:
+            return self._data
+
+        criteria.sort(key=lambda item: self.row_index(item[0]).count(item[1]))
+        first_column, first_values = criteria[0]
+        positions = self.row_index(first_column).positions(first_values)
+
+        for column, values in criteria[1:]:
+            index = self.row_index(column)
+            positions = positions[np.isin(index.codes[positions], index.codes_for(values))]
+
+        return self._data.iloc[positions]
+
+    def _processed_cache_path(self, by: tuple[str, ...] = ()) -> Path | None:
+        if self.cache_dir is None:
+            return None
+        key = json.dumps(
+            {
+                "data": self.fingerprint,
+                "numeric_cols": config.NUMERIC_COLS,
+                "non_crime_events": config.NON_CRIME_EVENTS,
+                "version": self.PROCESSING_VERSION,
+                # Only present for grouped aggregates, so the nationwide one keeps its key
+                **({"by": list(by)} if by else {}),
+            },
+            sort_keys=True,
+        )
+        return self.cache_dir / f"processed-{hashlib.sha256(key.encode()).hexdigest()[:32]}.parquet"
+
+    def _evict_processed_cache(self, keep: Path) -> None:
+        cached = sorted(keep.parent.glob("processed-*.parquet"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for stale in cached[config.PROCESSED_CACHE_MAX_FILES :]:
+            stale.unlink(missing_ok=True)
+
     def _to_numeric(self, df: pd.DataFrame, numeric_cols: list[str]) -> pd.DataFrame:
         for col in numeric_cols:
             if col in df.columns:
@@ -34,37 +189,65 @@ class CrimeData:
     def _filter_cols(self, df: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
         return df[~df["evento"].isin(cols)]
 
-    def get_processed_data(self) -> pd.DataFrame:
+    def get_processed_data(self, by: Sequence[str] = ()) -> pd.DataFrame:
         """
         Cleans and aggregates the raw data to prepare it for analysis.
 
+        The aggregate is computed once per instance and, when `cache_dir` is set,
+        persisted on disk keyed by the data fingerprint, NUMERIC_COLS and
+        NON_CRIME_EVENTS, so any change to those inputs invalidates it.
+
+        Args:
+            by: Columns to group by besides the crime type, e.g. ["uf", "ano"].
+
         Returns:
-            pd.DataFrame: A new DataFrame grouped by crime type ('evento')
-                          with cleaned, summed numeric columns.
+            pd.DataFrame: A new DataFrame grouped by the `by` columns and crime type
+                          ('evento', renamed 'crime_type') with cleaned, summed numeric columns.
         """
+        by = tuple(by)
+        with self._lock:
+            if by not in self._processed:
+                measure = self.metrics.stage if self.metrics is not None else StageMetrics.measure
+                with measure(f"processamento por {', '.join(by)}" if by else "processamento") as stage:
+                    stage.rows = len(self._data)
+                    self._processed[by] = self._load_or_process(by)
+        # Callers may add columns to the result; the memoised frame must stay intact
+        return self._processed[by].copy()
+
+    def _load_or_process(self, by: tuple[str, ...] = ()) -> pd.DataFrame:
         if self._data.empty:
             return pd.DataFrame()
 
-        # Work on a copy to keep the original data intact
-        df = self._data.copy()
+        cache_path = self._processed_cache_path(by)
+        if cache_path is not None and cache_path.exists():
+            logger.info(f"Dados processados encontrados em cache: {cache_path.name}")
+            return pd.read_parquet(cache_path)
+
+        processed_df = self._process(by)
+
+        if cache_path is not None:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Written aside and renamed, so concurrent runs never read a partial file
+            partial_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+            processed_df.to_parquet(partial_path, index=False)
+            partial_path.replace(cache_path)
+            self._evict_processed_cache(keep=cache_path)
+        return processed_df
 
-        # Filter non crime events
-        df = self._filter_cols(df, config.NON_CRIME_EVENTS)
+    def _process(self, by: tuple[str, ...] = ()) -> pd.DataFrame:
+        # Filter non crime events, keeping only the columns the aggregation needs.
+        # Selecting rows and columns already yields a copy, so the raw data stays intact.
+        keys = [*by, "evento"]
+        numeric_cols = [col for col in config.NUMERIC_COLS if col in self._data.columns]
+        df = self._filter_cols(self._data, config.NON_CRIME_EVENTS)[[*keys, *numeric_cols]]
 
         # --- 1. Clean the Data ---
-        df = self._to_numeric(df, config.NUMERIC_COLS)
-
-        # Rename some cols
-        processed_df = df.rename(
-            columns={
-                "total_vitima": "victims",
-                "total_peso": "weight",
-                "total": "aprehensions",
-            }
-        )
+        df = self._to_numeric(df, numeric_cols)
+        # Weights are stored as float32 (see schema.apply_schema); sum them in float64
+        df = df.astype({col: "float64" for col in config.WEIGHT_COLS if col in numeric_cols})
 
         # --- 2. Aggregate the Data ---
-        processed_df = df.groupby("evento")[config.NUMERIC_COLS].sum().reset_index()
+        processed_df = df.groupby(keys, observed=True)[numeric_cols].sum().reset_index()
         processed_df = processed_df.rename(columns={"evento": "crime_type"})
 
         return processed_df
@@ -91,7 +274,7 @@ class CrimeEvent:
     weight: float
     aprehensions: int
 
-    W: dict[str, float] = {"victims": 0.6, "weight": 0.3, "aprehensions": 0.1}
+    W: ClassVar[dict[str, float]] = {"victims": 0.6, "weight": 0.3, "aprehensions": 0.1}
     # Composition: The context is a dictionary mapping metric keys to category objects.
     statistical_context: dict[str, "BaseCategory"] = field(default_factory=dict, repr=False)
 
@@ -102,60 +285,174 @@ class CrimeEvent:
 
         stats = self.statistical_context.get(metric_name)
 
-        if not stats or stats.stdev == 0:
+        if not stats:
             return 0.0
-        return (raw_value - stats.mean) / stats.stdev
+        return stats.z_score(raw_value)
 
     @property
     def severity(self) -> float:
-        return (
-            CrimeEvent.W["victims"] * self.z_transform("victims")
-            + CrimeEvent.W["weight"] * self.z_transform("weights")
-            + CrimeEvent.W["aprehensions"] * self.z_transform("aprehensions")
-        )
+        return sum(weight * self.z_transform(metric_name) for metric_name, weight in CrimeEvent.W.items())
+
+    @staticmethod
+    def severity_scores(events: list["CrimeEvent"], context: dict[str, "BaseCategory"] | None = None) -> np.ndarray:
+        """
+        The severity of every event at once, from the whole-vector Z-scores of each category.
+
+        `context` maps metric names to categories built from `events`, in the same order
+        (as CrimeCategoryBuilder does); without it, the categories are built here.
+        """
+        if context is None:
+            context = {
+                metric: category([getattr(e, metric) for e in events]) for metric, category in CATEGORIES.items()
+            }
+        return CrimeEvent.weighted_z_scores(context, len(events))
+
+    @staticmethod
+    def weighted_z_scores(context: dict[str, "BaseCategory"], count: int) -> np.ndarray:
+        """The severities of `count` events from the categories built over them, weighted by W."""
+        scores = np.zeros(count)
+        for metric_name, weight in CrimeEvent.W.items():
+            stats = context.get(metric_name)
+            if stats is None:
+                continue
+            if stats.N != count:
+                raise ValueError(f"A categoria '{metric_name}' tem {stats.N} valores para {count} eventos.")
+            scores += weight * stats.z_scores()
+        return scores
+
+
+@dataclass
+class RunningStats:
+    """
+    Count, total, mean and sum of squared deviations from the mean (M2) of a stream of values.
+
+    Batches are folded in with the pairwise update of Chan et al., so statistics built from
+    chunks, or merged from shards computed separately, match those of the whole list.
+    """
+
+    count: int = 0
+    total: int | float = 0
+    mean: float = 0.0
+    m2: float = 0.0
+
+    @classmethod
+    def of(cls, values: Sequence[int | float] | np.ndarray) -> "RunningStats":
+        """The statistics of a batch of values, computed in two passes."""
+        array = np.asarray(values)
+        if array.dtype.kind not in "iuf":
+            array = array.astype("float64")
+        if len(array) == 0:
+            return cls()
+        mean = float(array.mean())
+        return cls(len(array), array.sum().item(), mean, float(((array - mean) ** 2).sum()))
+
+    def update(self, batch: Sequence[int | float] | np.ndarray) -> "RunningStats":
+        """Folds a batch of values into these statistics, in place. Returns self."""
+        self._absorb(RunningStats.of(batch))
+        return self
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """The statistics of both streams together; neither operand is modified."""
+        merged = replace(self)
+        merged._absorb(other)
+        return merged
+
+    def _absorb(self, other: "RunningStats") -> None:
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta**2 * self.count * other.count / count
+        self.total += other.total
+        self.count = count
+
+    @property
+    def variance(self) -> float:
+        """The population variance."""
+        if self.count <= 1:
+            return 0.0
+        return max(self.m2, 0.0) / self.count
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
 
 
 class BaseCategory(ABC):
     """
     An abstract base class for a category of metrics.
 
-    It stores the raw values and calculates total, N, mean, and standard
-    deviation on the fly.
+    It stores a read-only snapshot of the values as a numpy array; total, N, mean
+    and standard deviation are computed on first access and cached. A category can
+    also be built from streamed statistics alone (see `from_stats`), in which case
+    only the per-value Z-scores are unavailable.
     """
 
-    def __init__(self, values: list[int | float]):
-        self._values = values
+    def __init__(self, values: Sequence[int | float] | np.ndarray = ()):
+        array = np.array(values)
+        if array.dtype.kind not in "iuf":
+            array = array.astype("float64")
+        array.setflags(write=False)
+        self._values = array
+        self._stats: RunningStats | None = None
+
+    @classmethod
+    def from_stats(cls, stats: RunningStats) -> "BaseCategory":
+        """A category holding the given statistics, without the values themselves."""
+        category = cls()
+        category._stats = replace(stats)
+        return category
 
     @property
     @abstractmethod
     def name(self) -> str:
         raise NotImplementedError
 
+    @property
+    def values(self) -> np.ndarray:
+        return self._values
+
+    @property
+    def stats(self) -> RunningStats:
+        if self._stats is None:
+            self._stats = RunningStats.of(self._values)
+        return self._stats
+
     @property
     def N(self) -> int:
         """The number of records."""
-        return len(self._values)
+        return self.stats.count
 
     @property
     def total(self) -> int | float:
         """The total sum of the metric's values."""
-        return sum(self._values)
+        return self.stats.total
 
     @property
     def mean(self) -> float:
         """The average (mean) of the values."""
-        if self.N == 0:
-            return 0.0
-        return float(self.total / self.N)
+        return self.stats.mean
 
     @property
     def stdev(self) -> float:
         """The population standard deviation of the values."""
-        if self.N <= 1:  # Standard deviation requires at least two points
+        # Standard deviation requires at least two points
+        return self.stats.stdev
+
+    def z_score(self, value: int | float) -> float:
+        """The Z-score of a single value against this category."""
+        if self.stdev == 0:
             return 0.0
-        mean = self.mean
-        variance = sum((x - mean) ** 2 for x in self._values) / self.N
-        return math.sqrt(variance)
+        return (value - self.mean) / self.stdev
+
+    def z_scores(self) -> np.ndarray:
+        """The Z-scores of all the values, in order."""
+        if len(self._values) != self.N:
+            raise ValueError(f"A categoria '{self.name}' foi construída sem os valores individuais.")
+        if self.stdev == 0:
+            return np.zeros(self.N)
+        return (self._values - self.mean) / self.stdev
 
     def __repr__(self) -> str:
         return (
@@ -180,3 +477,191 @@ class AprehensionCategory(BaseCategory):
     @property
     def name(self) -> str:
         return "aprehensions"
+
+
+# The category of each CrimeEvent field; every builder of categories reads it from here
+CATEGORIES: dict[str, type[BaseCategory]] = {
+    "victims": VictimCategory,
+    "weight": WeightCategory,
+    "aprehensions": AprehensionCategory,
+}
+
+
+class CrimeEventTable:
+    """
+    Crime events stored column-wise: one array per field instead of one CrimeEvent per row.
+
+    Built straight from a processed frame, with the rows that cannot form an event
+    rejected in bulk. Indexing returns a lightweight CrimeEventView of one row.
+    """
+
+    FIELDS: ClassVar[tuple[str, ...]] = tuple(CATEGORIES)
+    # Processed-frame column each field falls back to when the frame has no column named after it
+    SOURCE_COLUMNS: ClassVar[dict[str, str]] = {
+        "victims": "total_vitima",
+        "weight": "total_peso",
+        "aprehensions": "total",
+    }
+
+    def __init__(
+        self,
+        names: Sequence[str] | np.ndarray,
+        victims: Sequence[int] | np.ndarray,
+        weight: Sequence[float] | np.ndarray,
+        aprehensions: Sequence[int] | np.ndarray,
+        rejected: pd.Index | None = None,
+    ) -> None:
+        columns = {
+            "names": np.array(names, dtype=object),
+            "victims": np.array(victims, dtype="int64"),
+            "weight": np.array(weight, dtype="float64"),
+            "aprehensions": np.array(aprehensions, dtype="int64"),
+        }
+        if len({len(column) for column in columns.values()}) > 1:
+            raise ValueError(f"Colunas de tamanhos diferentes: { {k: len(v) for k, v in columns.items()} }")
+        for column in columns.values():
+            column.setflags(write=False)
+
+        self.names = columns["names"]
+        self.victims = columns["victims"]
+        self.weight = columns["weight"]
+        self.aprehensions = columns["aprehensions"]
+        # Labels of the source rows left out by from_frame
+        self.rejected = rejected if rejected is not None else pd.Index([])
+        self._severities: np.ndarray | None = None
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, name_column: str = "crime_type") -> "CrimeEventTable":
+        """
+        Builds the table from a processed frame (see CrimeData.get_processed_data).
+
+        Rows without a name, or with a missing, non-finite, negative or (for counts)
+        fractional value, are rejected and logged together.
+        """
+        values, valid = cls.read_fields(df)
+        valid &= df[name_column].notna().to_numpy() & (df[name_column].astype("str").str.strip() != "").to_numpy()
+        rejected = cls.log_rejected(df, valid)
+        names = df[name_column].to_numpy(dtype=object)[valid]
+        return cls(names, **{field_name: values[field_name][valid] for field_name in cls.FIELDS}, rejected=rejected)
+
+    @classmethod
+    def read_fields(cls, df: pd.DataFrame, strict: bool = False) -> tuple[dict[str, np.ndarray], np.ndarray]:
+        """
+        The float64 values of each field, read from the field's column or its source column
+        (see SOURCE_COLUMNS), and a mask of the rows whose values are all valid.
+
+        A field with neither column is zero-filled, or raises a KeyError when `strict`.
+        """
+        valid = np.ones(len(df), dtype=bool)
+        values = {}
+        for field_name in cls.FIELDS:
+            column = field_name if field_name in df.columns else cls.SOURCE_COLUMNS[field_name]
+            if column in df.columns:
+                array = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+            elif strict:
+                raise KeyError(f"Coluna '{field_name}' (ou '{column}') ausente do lote.")
+            else:
+                array = np.zeros(len(df))
+            valid &= np.isfinite(array) & (array >= 0)
+            if field_name != "weight":
+                valid &= np.mod(np.nan_to_num(array), 1) == 0
+            values[field_name] = array
+        return values, valid
+
+    @staticmethod
+    def log_rejected(df: pd.DataFrame, valid: np.ndarray) -> pd.Index:
+        """Logs the rows of `df` left out by the `valid` mask, and returns their labels."""
+        rejected = df.index[~valid]
+        if len(rejected):
+            logger.warning(
+                f"{len(rejected):,} de {len(df):,} linha(s) descartada(s) por valores inválidos: "
+                f"{rejected[:10].tolist()}{' ...' if len(rejected) > 10 else ''}"
+            )
+        return rejected
+
+    @classmethod
+    def from_events(cls, events: list[CrimeEvent]) -> "CrimeEventTable":
+        return cls(
+            [e.name for e in events],
+            [e.victims for e in events],
+            [e.weight for e in events],
+            [e.aprehensions for e in events],
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(self, position: int) -> "CrimeEventView":
+        if not -len(self) <= position < len(self):
+            raise IndexError(f"Evento {position} fora da tabela de {len(self)} eventos.")
+        return CrimeEventView(self, position % len(self))
+
+    def __iter__(self) -> Iterator["CrimeEventView"]:
+        return (CrimeEventView(self, position) for position in range(len(self)))
+
+    def categories(self) -> dict[str, BaseCategory]:
+        """The statistics of each field, as CrimeCategoryBuilder would return them."""
+        return {metric: category(getattr(self, metric)) for metric, category in CATEGORIES.items()}
+
+    def severity_scores(self) -> np.ndarray:
+        """The severity of every event (see CrimeEvent.severity), computed once."""
+        if self._severities is None:
+            self._severities = CrimeEvent.weighted_z_scores(self.categories(), len(self))
+            self._severities.setflags(write=False)
+        return self._severities
+
+    def to_events(self) -> list[CrimeEvent]:
+        return [view.to_event() for view in self]
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "crime_type": self.names,
+                "victims": self.victims,
+                "weight": self.weight,
+                "aprehensions": self.aprehensions,
+            }
+        )
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(eventos={len(self)}, descartados={len(self.rejected)})"
+
+
+class CrimeEventView:
+    """A read-only view of one row of a CrimeEventTable."""
+
+    __slots__ = ("_table", "_position")
+
+    def __init__(self, table: CrimeEventTable, position: int) -> None:
+        self._table = table
+        self._position = position
+
+    @property
+    def name(self) -> str:
+        return str(self._table.names[self._position])
+
+    @property
+    def victims(self) -> int:
+        return int(self._table.victims[self._position])
+
+    @property
+    def weight(self) -> float:
+        return float(self._table.weight[self._position])
+
+    @property
+    def aprehensions(self) -> int:
+        return int(self._table.aprehensions[self._position])
+
+    @property
+    def severity(self) -> float:
+        return float(self._table.severity_scores()[self._position])
+
+    def to_event(self) -> CrimeEvent:
+        """A standalone CrimeEvent with the same values (without statistical context)."""
+        return CrimeEvent(self.name, self.victims, self.weight, self.aprehensions)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__name__}(name={self.name!r}, victims={self.victims}, "
+            f"weight={self.weight}, aprehensions={self.aprehensions})"
+        )
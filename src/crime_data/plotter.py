@@ -34,6 +34,10 @@ class BarPlotter(Plotter):
         y_axis = data.columns[0]
         x_axis = data.columns[1]
 
+        # Categóricas seriam plotadas na ordem (e com todas) as categorias, não na ordem do ranking
+        if isinstance(data[y_axis].dtype, pd.CategoricalDtype):
+            data = data.astype({y_axis: str})
+
         # Create the barplot
         barplot = sns.barplot(
             x=x_axis,
@@ -2,6 +2,7 @@ import logging
 from abc import ABC, abstractmethod
 
 from utils import config
+from utils.metrics import RunMetrics
 
 from .plotter import BarPlotter
 from .scorer import AnalysisResult
@@ -44,11 +45,13 @@ class BarChartReporter(ResultReporter):
 
 
 class ReportDispatcher:
-    def __init__(self) -> None:
+    def __init__(self, metrics: RunMetrics | None = None) -> None:
         self._reporters_map = {
             "table": LogReporter(),
             "bar_chart": BarChartReporter(),
         }
+        # Cada relatório gerado é registrado como uma etapa
+        self.metrics = metrics if metrics is not None else RunMetrics()
 
     def process_reports(self, results: list[AnalysisResult]) -> None:
         for idx, res in enumerate(results):
@@ -64,4 +67,6 @@ class ReportDispatcher:
                     continue
 
                 reporter = self._reporters_map[format_type]
-                reporter.report(res)
+                with self.metrics.stage(f"relatório {format_type}: {res.name}") as stage:
+                    stage.rows = len(res.data)
+                    reporter.report(res)
@@ -0,0 +1,138 @@
+import logging
+from collections.abc import Iterable
+
+import numpy as np
+import pandas as pd
+
+from utils import config
+
+logger = logging.getLogger(__name__)
+
+# Maximum relative error accepted when storing weights as float32
+FLOAT32_RTOL = 1e-6
+
+
+def parse_numeric(values: pd.Series) -> pd.Series:
+    """Converts a column to numbers, accepting Brazilian decimal commas in text cells."""
+    if pd.api.types.is_numeric_dtype(values):
+        return values
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype(object)
+
+    # Numeric and text cells may be mixed in the same column
+    is_text = values.map(lambda v: isinstance(v, str))
+    if is_text.any():
+        values = values.where(~is_text, values[is_text].str.replace(",", ".", regex=False))
+    return pd.to_numeric(values, errors="coerce")
+
+
+def _smallest_int_dtype(values: pd.Series) -> np.dtype:
+    low, high = (values.min(), values.max()) if len(values) else (0, 0)
+    candidates: list[type[np.integer]] = (
+        [np.uint8, np.uint16, np.uint32, np.uint64] if low >= 0 else [np.int8, np.int16, np.int32, np.int64]
+    )
+    for candidate in candidates:
+        info = np.iinfo(candidate)
+        if info.min <= low and high <= info.max:
+            return np.dtype(candidate)
+    return np.dtype(np.int64)
+
+
+def _compact_count(values: pd.Series) -> pd.Series:
+    # Fast path for already compact columns, so deserialized data is not copied again
+    if isinstance(values.dtype, np.dtype) and values.dtype.kind in "iu":
+        target = _smallest_int_dtype(values)
+        return values if values.dtype == target else values.astype(target)
+
+    values = parse_numeric(values).fillna(0)
+    if not pd.api.types.is_integer_dtype(values):
+        as_float = values.to_numpy(dtype="float64")
+        if not np.array_equal(as_float, np.floor(as_float)):
+            return _compact_weight(values)
+    return values.astype(_smallest_int_dtype(values))
+
+
+def _compact_weight(values: pd.Series) -> pd.Series:
+    if values.dtype == np.float32:
+        return values
+    values = parse_numeric(values).fillna(0).astype("float64")
+    as_float32 = values.astype("float32")
+    if np.allclose(as_float32, values, rtol=FLOAT32_RTOL, atol=0):
+        return as_float32
+    return values
+
+
+def _is_text(values: pd.Series) -> bool:
+    return pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)
+
+
+def apply_schema(df: pd.DataFrame, columns: Iterable[str] | None = None) -> pd.DataFrame:
+    """
+    Applies the compact dtype schema to a raw VDE frame (or only to `columns`), in place.
+
+    Known text columns become categorical, counts become the smallest integer type
+    that fits and weights become float32 when no precision is lost. Missing counts and
+    weights are stored as 0, which is how the processing stage already treats them.
+    Other text columns are made categorical when their cardinality is low.
+    """
+    for col in df.columns if columns is None else columns:
+        values = df[col]
+        if col in config.COUNT_COLS:
+            df[col] = _compact_count(values)
+        elif col in config.WEIGHT_COLS:
+            df[col] = _compact_weight(values)
+        elif col == "ano":
+            # Read back from a partitioned dataset, 'ano' arrives as a categorical
+            df[col] = pd.to_numeric(parse_numeric(values), downcast="integer")
+        elif isinstance(values.dtype, pd.CategoricalDtype):
+            continue
+        elif col in config.CATEGORICAL_COLS:
+            df[col] = values.astype("category")
+        elif _is_text(values) and len(values) and values.nunique() / len(values) < config.CATEGORICAL_MAX_RATIO:
+            df[col] = values.astype("category")
+    return df
+
+
+def stale_columns(df: pd.DataFrame) -> list[str]:
+    """
+    The known columns whose dtype does not match the schema yet, judged from the dtypes
+    alone so that frames read back with the schema already applied are not scanned.
+    """
+    stale = []
+    for col, dtype in df.dtypes.items():
+        if col in config.COUNT_COLS or col == "ano":
+            compact = isinstance(dtype, np.dtype) and dtype.kind in "iu"
+        elif col in config.WEIGHT_COLS:
+            compact = isinstance(dtype, np.dtype) and dtype.kind == "f"
+        elif col in config.CATEGORICAL_COLS:
+            compact = isinstance(dtype, pd.CategoricalDtype)
+        else:
+            continue
+        if not compact:
+            stale.append(str(col))
+    return stale
+
+
+def concat_frames(frames: list[pd.DataFrame]) -> pd.DataFrame:
+    """
+    Concatenates compact frames, keeping categorical columns categorical.
+
+    pandas falls back to object dtype when categories differ between frames, so the
+    categories are unified first.
+    """
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame()
+
+    categorical_cols = {
+        col
+        for col in frames[0].columns
+        if all(isinstance(f[col].dtype, pd.CategoricalDtype) for f in frames if col in f)
+    }
+    for col in categorical_cols:
+        union = pd.api.types.union_categoricals([f[col] for f in frames if col in f], sort_categories=True).categories
+        for f in frames:
+            if col in f:
+                f[col] = f[col].cat.set_categories(union)
+
+    return apply_schema(pd.concat(frames, ignore_index=True))
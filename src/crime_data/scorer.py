@@ -1,13 +1,26 @@
+import hashlib
+import itertools
 import logging
+import tempfile
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
-from typing import Literal
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, ClassVar, Literal
 
+import numpy as np
 import pandas as pd
 
+from utils import config
+from utils.metrics import RunMetrics, StageMetrics
+
+from .cache import ResultCache
 from .models import CrimeData
+from .serializer import CrimeDataSerializer
 
 ResultType = Literal["table", "bar_chart", "csv"]
+ExecutionMode = Literal["sequential", "thread", "process"]
 
 logger = logging.getLogger(__name__)
 
@@ -22,9 +35,18 @@ class AnalysisResult:
     requested_formats: list[ResultType] = field(default_factory=lambda: ["table"])
 
 
+# An analyzer's result and the metrics of the stage that produced it
+Outcome = tuple[AnalysisResult, StageMetrics]
+
+
 class Analyzer(ABC):
     """Abstract Base Class to define the Analyzer interface."""
 
+    # Bump when the analysis logic changes, so results cached on disk are discarded
+    VERSION: ClassVar[int] = 1
+    # Formats the result asks to be reported in
+    result_formats: ClassVar[list[ResultType]] = ["table"]
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -36,46 +58,125 @@ class Analyzer(ABC):
     def description(self) -> str:
         pass
 
+    @property
+    def required_columns(self) -> list[str] | None:
+        """Columns of the raw data this analysis reads. None means every column."""
+        return None
+
+    @property
+    def cache_params(self) -> dict[str, Any]:
+        """Parameters the result depends on besides the data, for the result cache."""
+        return {}
+
     @abstractmethod
     def analyze(self, crime_data: CrimeData) -> AnalysisResult:
         """Runs the analysis and returns a DataFrame with the results."""
         pass
 
 
-class LethalCrimesByStateAnalyzer(Analyzer):
-    """Agrega os principais crimes letais para criar um ranking de estados."""
+@dataclass(frozen=True)
+class ScanSpec:
+    """A filter + groupby + sum over the raw rows: the sums of `measures` by `by` for the given events."""
+
+    events: tuple[str, ...]
+    by: tuple[str, ...]
+    measures: tuple[str, ...]
 
     @property
-    def name(self) -> str:
-        return "Ranking de Vítimas de Crimes Letais por Estado"
+    def columns(self) -> list[str]:
+        return ["evento", *self.by, *self.measures]
+
+    def execute(self, rows: pd.DataFrame) -> pd.DataFrame:
+        """
+        Applies the spec to `rows`, which may be raw rows or partial sums of them
+        (e.g. the output of a shared scan), as long as they have the spec's columns.
+        """
+        rows = rows[rows["evento"].isin(self.events)]
+        if not self.by:
+            return rows[list(self.measures)].sum().to_frame().T
+        return rows.groupby(list(self.by), observed=True)[list(self.measures)].sum().reset_index()
+
+
+class ScanAnalyzer(Analyzer):
+    """
+    An analysis that is a sum over the raw rows (`scan`) followed by some reshaping
+    of the totals (`summarize`). The AnalysisRunner can answer the scans of several
+    of them with a single pass over the data.
+    """
 
     @property
-    def description(self) -> str:
-        return "Soma o total de vítimas de Homicídio Doloso, Feminicídio, Latrocínio e Lesão Corporal Seguida de Morte por UF."
+    @abstractmethod
+    def scan(self) -> ScanSpec:
+        pass
+
+    @abstractmethod
+    def summarize(self, totals: pd.DataFrame) -> AnalysisResult:
+        """Builds the result from the output of `scan`."""
+        pass
+
+    @property
+    def required_columns(self) -> list[str] | None:
+        return self.scan.columns
+
+    @property
+    def cache_params(self) -> dict[str, Any]:
+        return {"scan": asdict(self.scan)}
+
+    def totals(self, crime_data: CrimeData) -> pd.DataFrame:
+        """Runs this analysis' scan on its own."""
+        return self.scan.execute(crime_data.select(events=self.scan.events))
+
+    def result_from(self, totals: pd.DataFrame) -> AnalysisResult:
+        """Summarizes totals computed elsewhere, e.g. by a shared scan."""
+        try:
+            return self.summarize(totals)
+        except KeyError:
+            return self._missing_columns()
 
     def analyze(self, crime_data: CrimeData) -> AnalysisResult:
         logger.info(f"Executando análise: {self.name}...")
         try:
-            lethal_events = [
-                "Homicídio doloso",
-                "Feminicídio",
-                "Roubo seguido de morte (latrocínio)",
-                "Lesão corporal seguida de morte",
-            ]
-            filtered_df = crime_data.data[crime_data.data["evento"].isin(lethal_events)]
+            totals = self.totals(crime_data)
+        except KeyError:
+            return self._missing_columns()
+        return self.result_from(totals)
 
-            # Usamos 'total_vitima' pois é a métrica mais relevante para esses crimes
-            result = filtered_df.groupby("uf")["total_vitima"].sum().sort_values(ascending=False).reset_index()
-            result = result.rename(columns={"uf": "UF", "total_vitima": "Total de Vítimas Letais"})
+    def _missing_columns(self) -> AnalysisResult:
+        logger.warning(f"Colunas necessárias não encontradas para '{self.name}'.")
+        return AnalysisResult(self.name, self.description, pd.DataFrame())
 
-            return AnalysisResult(self.name, self.description, result, ["bar_chart"])
 
-        except KeyError:
-            logger.warning(f"Colunas necessárias não encontradas para '{self.name}'.")
-            return AnalysisResult(self.name, self.description, pd.DataFrame())
+class LethalCrimesByStateAnalyzer(ScanAnalyzer):
+    """Agrega os principais crimes letais para criar um ranking de estados."""
+
+    result_formats: ClassVar[list[ResultType]] = ["bar_chart"]
+
+    @property
+    def name(self) -> str:
+        return "Ranking de Vítimas de Crimes Letais por Estado"
+
+    @property
+    def description(self) -> str:
+        return "Soma o total de vítimas de Homicídio Doloso, Feminicídio, Latrocínio e Lesão Corporal Seguida de Morte por UF."
+
+    @property
+    def scan(self) -> ScanSpec:
+        lethal_events = (
+            "Homicídio doloso",
+            "Feminicídio",
+            "Roubo seguido de morte (latrocínio)",
+            "Lesão corporal seguida de morte",
+        )
+        # Usamos 'total_vitima' pois é a métrica mais relevante para esses crimes
+        return ScanSpec(events=lethal_events, by=("uf",), measures=("total_vitima",))
 
+    def summarize(self, totals: pd.DataFrame) -> AnalysisResult:
+        result = totals.sort_values(by="total_vitima", ascending=False, ignore_index=True)
+        result = result.rename(columns={"uf": "UF", "total_vitima": "Total de Vítimas Letais"})
+        return AnalysisResult(self.name, self.description, result, self.result_formats)
 
-class DrugSeizureByStateAnalyzer(Analyzer):
+
+class DrugSeizureByStateAnalyzer(ScanAnalyzer):
     """Analisa o peso total de Cocaína e Maconha apreendidos por estado."""
 
     @property
@@ -88,30 +189,26 @@ class DrugSeizureByStateAnalyzer(Analyzer):
             "Soma o peso (em kg) de Cocaína e Maconha apreendidos, ranqueando os estados com maiores apreensões totais."
         )
 
-    def analyze(self, crime_data: CrimeData) -> AnalysisResult:
-        logger.info(f"Executando análise: {self.name}...")
-
-        try:
-            drug_events = ["Apreensão de Cocaína", "Apreensão de Maconha"]
-            filtered_df = crime_data.data[crime_data.data["evento"].isin(drug_events)]
+    @property
+    def scan(self) -> ScanSpec:
+        drug_events = ("Apreensão de Cocaína", "Apreensão de Maconha")
+        return ScanSpec(events=drug_events, by=("uf", "evento"), measures=("total_peso",))
 
-            # Pivot table para ver os totais de cada droga lado a lado
-            pivot_df = filtered_df.pivot_table(index="uf", columns="evento", values="total_peso", aggfunc="sum").fillna(
-                0
-            )
+    def totals(self, crime_data: CrimeData) -> pd.DataFrame:
+        # Consulta o cubo de agregados em vez de varrer as linhas brutas
+        return crime_data.cube.rollup(self.scan.by, events=self.scan.events, measures=self.scan.measures)
 
-            pivot_df["Total Apreendido (kg)"] = pivot_df.sum(axis=1)
-            result = pivot_df.sort_values(by="Total Apreendido (kg)", ascending=False).reset_index()
-            result = result.rename(columns={"uf": "UF"})
+    def summarize(self, totals: pd.DataFrame) -> AnalysisResult:
+        # Pivot para ver os totais de cada droga lado a lado
+        pivot_df = totals.pivot(index="uf", columns="evento", values="total_peso").fillna(0)
 
-            return AnalysisResult(self.name, self.description, result)
+        pivot_df["Total Apreendido (kg)"] = pivot_df.sum(axis=1)
+        result = pivot_df.sort_values(by="Total Apreendido (kg)", ascending=False).reset_index()
+        result = result.rename(columns={"uf": "UF"})
+        return AnalysisResult(self.name, self.description, result)
 
-        except KeyError:
-            logger.warning(f"Colunas necessárias não encontradas para '{self.name}'.")
-            return AnalysisResult(self.name, self.description, pd.DataFrame())
 
-
-class FirearmSeizureByStateAnalyzer(Analyzer):
+class FirearmSeizureByStateAnalyzer(ScanAnalyzer):
     """Cria um ranking de estados pela quantidade de armas de fogo apreendidas."""
 
     @property
@@ -122,25 +219,18 @@ class FirearmSeizureByStateAnalyzer(Analyzer):
     def description(self) -> str:
         return "Soma o total de armas de fogo apreendidas por UF, um indicador da atividade policial contra o crime armado."
 
-    def analyze(self, crime_data: CrimeData) -> AnalysisResult:
-        logger.info(f"Executando análise: {self.name}...")
-
-        try:
-            event_name = "Arma de Fogo Apreendida"
-            filtered_df = crime_data.data[crime_data.data["evento"] == event_name]
-
-            # TODO: agrupar por tipo de arma?
-            result = filtered_df.groupby("uf")["total"].sum().sort_values(ascending=False).reset_index()
-            result = result.rename(columns={"uf": "UF", "arma": "Tipo de arma"})
-
-            return AnalysisResult(self.name, self.description, result)
+    @property
+    def scan(self) -> ScanSpec:
+        # TODO: agrupar por tipo de arma?
+        return ScanSpec(events=("Arma de Fogo Apreendida",), by=("uf",), measures=("total",))
 
-        except KeyError:
-            logger.info(f"  -> Aviso: Colunas necessárias não encontradas para '{self.name}'.")
-            return AnalysisResult(self.name, self.description, pd.DataFrame())
+    def summarize(self, totals: pd.DataFrame) -> AnalysisResult:
+        result = totals.sort_values(by="total", ascending=False, ignore_index=True)
+        result = result.rename(columns={"uf": "UF", "arma": "Tipo de arma"})
+        return AnalysisResult(self.name, self.description, result)
 
 
-class VehicleCrimeByStateAnalyzer(Analyzer):
+class VehicleCrimeByStateAnalyzer(ScanAnalyzer):
     """Agrega dados de roubo e furto de veículos por estado."""
 
     @property
@@ -151,23 +241,22 @@ class VehicleCrimeByStateAnalyzer(Analyzer):
     def description(self) -> str:
         return "Soma o total de eventos de 'Roubo de veículo' e 'Furto de veículo' por UF."
 
-    def analyze(self, crime_data: CrimeData) -> AnalysisResult:
-        logger.info(f"Executando análise: {self.name}...")
-        try:
-            vehicle_events = ["Roubo de veículo", "Furto de veículo"]
-            filtered_df = crime_data.data[crime_data.data["evento"].isin(vehicle_events)]
+    @property
+    def scan(self) -> ScanSpec:
+        # A coluna 'total' deve conter o número de eventos
+        return ScanSpec(events=("Roubo de veículo", "Furto de veículo"), by=("uf",), measures=("total",))
 
-            # A coluna 'total' deve conter o número de eventos
-            result = filtered_df.groupby("uf")["total"].sum().sort_values(ascending=False).reset_index()
-            result = result.rename(columns={"uf": "UF", "total": "Total de Veículos (Roubo/Furto)"})
+    def totals(self, crime_data: CrimeData) -> pd.DataFrame:
+        # Consulta o cubo de agregados em vez de varrer as linhas brutas
+        return crime_data.cube.rollup(self.scan.by, events=self.scan.events, measures=self.scan.measures)
 
-            return AnalysisResult(self.name, self.description, result)
-        except KeyError:
-            logger.info(f"  -> Aviso: Colunas necessárias não encontradas para '{self.name}'.")
-            return AnalysisResult(self.name, self.description, pd.DataFrame())
+    def summarize(self, totals: pd.DataFrame) -> AnalysisResult:
+        result = totals.sort_values(by="total", ascending=False, ignore_index=True)
+        result = result.rename(columns={"uf": "UF", "total": "Total de Veículos (Roubo/Furto)"})
+        return AnalysisResult(self.name, self.description, result)
 
 
-class GenderOfVictimsAnalyzer(Analyzer):
+class GenderOfVictimsAnalyzer(ScanAnalyzer):
     """Analisa a divisão por gênero de vítimas em crimes violentos selecionados."""
 
     @property
@@ -178,42 +267,130 @@ class GenderOfVictimsAnalyzer(Analyzer):
     def description(self) -> str:
         return "Soma o total de vítimas masculinas e femininas para Homicídio Doloso e Tentativa de Homicídio."
 
-    def analyze(self, crime_data: CrimeData) -> AnalysisResult:
-        logger.info(f"Executando análise: {self.name}...")
+    @property
+    def scan(self) -> ScanSpec:
+        violent_events = ("Homicídio doloso", "Tentativa de homicídio")
+        # Soma as colunas de gênero
+        return ScanSpec(events=violent_events, by=(), measures=("feminino", "masculino"))
+
+    def summarize(self, totals: pd.DataFrame) -> AnalysisResult:
+        result = pd.DataFrame(
+            {
+                "Gênero": ["Feminino", "Masculino"],
+                "Total de Vítimas": [totals["feminino"].iloc[0], totals["masculino"].iloc[0]],
+            }
+        )
+        return AnalysisResult(self.name, self.description, result)
+
+
+def _csi_batch(totals: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """CSI of each crime in each of a batch of (batch × crime × dimension) totals."""
+    mean = totals.mean(axis=1, keepdims=True)
+    std = totals.std(axis=1, ddof=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z_scores = np.where(std > 0, (totals - mean) / std, 0.0)
+    csi: np.ndarray = z_scores @ weights
+    return csi
+
+
+def _bootstrap_batch(
+    tensor: np.ndarray, weights: np.ndarray, resamples: int, seed: np.random.SeedSequence
+) -> tuple[np.ndarray, np.ndarray]:
+    """CSI and ranks (resample × crime) of one batch of resamples of the units of `tensor`."""
+    rng = np.random.default_rng(seed)
+    units = tensor.shape[0]
+    # How many times each unit is drawn in each resample
+    counts = rng.multinomial(units, np.full(units, 1 / units), size=resamples).astype("float64")
+    totals = (counts @ tensor.reshape(units, -1)).reshape(resamples, *tensor.shape[1:])
+    csi = _csi_batch(totals, weights)
+    return csi, SeverityAnalyzer._ranks(csi.T).T
+
+
+def _measured(
+    analyzer: Analyzer, run: Callable[[], AnalysisResult], rows: int, metrics: RunMetrics | None = None
+) -> Outcome:
+    """
+    Runs one analysis step as a metrics stage, turning any failure into an empty result;
+    the error is kept in the stage. Without `metrics`, the stage is only returned.
+    """
+    measure = metrics.stage if metrics is not None else StageMetrics.measure
+    with measure(f"análise: {analyzer.name}") as stage:
+        stage.rows = rows
         try:
-            violent_events = ["Homicídio doloso", "Tentativa de homicídio"]
-            filtered_df = crime_data.data[crime_data.data["evento"].isin(violent_events)]
+            result = run()
+        except Exception as e:
+            logger.exception(f"Falha na análise '{analyzer.name}'.")
+            stage.error = f"{type(e).__name__}: {e}"
+            result = AnalysisResult(analyzer.name, analyzer.description, pd.DataFrame())
+    return result, stage
 
-            # Soma as colunas de gênero
-            total_feminino = filtered_df["feminino"].sum()
-            total_masculino = filtered_df["masculino"].sum()
 
-            result = pd.DataFrame(
-                {
-                    "Gênero": ["Feminino", "Masculino"],
-                    "Total de Vítimas": [total_feminino, total_masculino],
-                }
-            )
+def _safe_analyze(analyzer: Analyzer, crime_data: CrimeData, metrics: RunMetrics | None = None) -> Outcome:
+    return _measured(analyzer, lambda: analyzer.analyze(crime_data), len(crime_data.data), metrics)
 
-            return AnalysisResult(self.name, self.description, result)
 
-        except KeyError:
-            logger.warning(f"Colunas necessárias não encontradas para '{self.name}'.")
-            return AnalysisResult(self.name, self.description, pd.DataFrame())
+# Dados compartilhados com os processos de análise, abertos uma vez por processo
+_worker_crime_data: CrimeData | None = None
+
+
+def _init_worker(path: Path, cache_dir: Path | None, cube_path: Path | None) -> None:
+    global _worker_crime_data
+    # O arquivo Arrow é mapeado em memória: as páginas são compartilhadas entre os processos
+    crime_data = CrimeDataSerializer.deserialize(path)
+    crime_data.cache_dir = cache_dir
+    crime_data.cube_path = cube_path
+    _worker_crime_data = crime_data
+
+
+def _analyze_in_worker(analyzer: Analyzer) -> Outcome:
+    assert _worker_crime_data is not None, "worker not initialised"
+    # Measured in the worker; the runner records the stage when it comes back
+    return _safe_analyze(analyzer, _worker_crime_data)
 
 
 class AnalysisRunner:
     """Manages and runs a series of analyzer objects."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        shared_scan: bool = True,
+        mode: ExecutionMode = "sequential",
+        max_workers: int | None = None,
+        metrics: RunMetrics | None = None,
+        result_cache: ResultCache | None = None,
+    ):
         self._analyzers: list[Analyzer] = []
         self.results: list[AnalysisResult] = []
+        # Each analyzer (and the shared scan) is recorded as a stage
+        self.metrics = metrics if metrics is not None else RunMetrics()
+        # Names and errors of the analyzers that failed in the last run; their results are empty
+        self.failures: dict[str, str] = {}
+        # Answer the scans of all ScanAnalyzers with a single pass over the data
+        self.shared_scan = shared_scan
+        # How the remaining analyzers run: one after another, in a thread pool or in a process pool
+        self.mode = mode
+        self.max_workers = max_workers
+        # When set, results of analyzers whose data, version and parameters did not change are reused
+        self.result_cache = result_cache
 
     def register(self, analyzer: Analyzer) -> None:
         """Adds an analyzer to the run list."""
         self._analyzers.append(analyzer)
         logger.info(f"Analisador '{analyzer.name}' registrado.")
 
+    def required_columns(self) -> list[str] | None:
+        """
+        Union of the columns required by the registered analyzers, in first-seen order.
+        Returns None (load everything) if any analyzer does not declare its columns.
+        """
+        columns: list[str] = []
+        for analyzer in self._analyzers:
+            required = analyzer.required_columns
+            if required is None:
+                return None
+            columns.extend(col for col in required if col not in columns)
+        return columns
+
     def run(self, crime_data: CrimeData) -> None:
         """Runs all registered analyzers on the given CrimeData."""
         logger.info("--- Iniciando Análises de Política Criminal ---")
@@ -222,12 +399,155 @@ class AnalysisRunner:
             logger.info("Nenhum analisador registrado.")
             return
 
+        keys = {}
+        cached: dict[int, Outcome] = {}
+        if self.result_cache is not None:
+            keys = {id(analyzer): self._cache_key(crime_data, analyzer) for analyzer in self._analyzers}
+            cached = self._cached_outcomes(keys)
+        stale = [analyzer for analyzer in self._analyzers if id(analyzer) not in cached]
+
+        shared: dict[int, Outcome] = {}
+        if self.shared_scan:
+            scan_analyzers = [analyzer for analyzer in stale if isinstance(analyzer, ScanAnalyzer)]
+            if len(scan_analyzers) > 1:
+                shared = self._run_shared_scan(crime_data, scan_analyzers)
+
+        pending = [analyzer for analyzer in stale if id(analyzer) not in shared]
+        outcomes = {**cached, **shared, **dict(zip(map(id, pending), self._execute(crime_data, pending)))}
+
+        if self.result_cache is not None:
+            for analyzer in stale:
+                result, stage = outcomes[id(analyzer)]
+                # Failures are not cached: they may be transient
+                if stage.error is None:
+                    self._store(keys[id(analyzer)], result)
+
+        self.failures = {}
         for analyzer in self._analyzers:
-            self.results.append(analyzer.analyze(crime_data))
+            result, stage = outcomes[id(analyzer)]
+            if stage.error is not None:
+                self.failures[analyzer.name] = stage.error
+            self.results.append(result)
+
+        if self.failures:
+            logger.warning(f"{len(self.failures)} análise(s) falharam: {list(self.failures)}")
         logger.info("--- Análises Concluídas ---")
 
+    def _execute(self, crime_data: CrimeData, analyzers: list[Analyzer]) -> list[Outcome]:
+        """Runs the analyzers in the configured mode; outcomes are returned in the given order."""
+        if self.mode == "sequential" or len(analyzers) < 2:
+            return [_safe_analyze(analyzer, crime_data, self.metrics) for analyzer in analyzers]
+
+        logger.info(f"Executando {len(analyzers)} análises em paralelo (modo '{self.mode}')...")
+        if self.mode == "thread":
+            # Threads compartilham o próprio CrimeData, cujos caches internos são protegidos por lock
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = [pool.submit(_safe_analyze, analyzer, crime_data, self.metrics) for analyzer in analyzers]
+                return self._collect(analyzers, futures)
+
+        # Processos recebem os dados por um arquivo Arrow mapeado em memória, sem serializar o DataFrame
+        with tempfile.TemporaryDirectory(prefix="crime_data-") as workdir:
+            path = Path(workdir) / "crimedata.arrow"
+            CrimeDataSerializer.write_arrow(crime_data.data, path)
+            initargs = (path, crime_data.cache_dir, crime_data.cube_path)
+            with ProcessPoolExecutor(self.max_workers, initializer=_init_worker, initargs=initargs) as pool:
+                futures = [pool.submit(_analyze_in_worker, analyzer) for analyzer in analyzers]
+                outcomes = self._collect(analyzers, futures)
+        self.metrics.add(*(stage for _, stage in outcomes))
+        return outcomes
+
+    @staticmethod
+    def _collect(analyzers: list[Analyzer], futures: list[Future[Outcome]]) -> list[Outcome]:
+        outcomes = []
+        for analyzer, future in zip(analyzers, futures):
+            try:
+                outcomes.append(future.result())
+            except Exception as e:
+                # e.g. a worker process that died: only its analyzers are lost
+                logger.error(f"Falha ao executar '{analyzer.name}': {e}")
+                empty = AnalysisResult(analyzer.name, analyzer.description, pd.DataFrame())
+                outcomes.append((empty, StageMetrics(f"análise: {analyzer.name}", error=f"{type(e).__name__}: {e}")))
+        return outcomes
+
+    @staticmethod
+    def _cache_key(crime_data: CrimeData, analyzer: Analyzer) -> str:
+        analyzer_type = type(analyzer)
+        return ResultCache.key(
+            data=crime_data.fingerprint,
+            analyzer=f"{analyzer_type.__module__}.{analyzer_type.__qualname__}",
+            name=analyzer.name,
+            version=analyzer.VERSION,
+            params=analyzer.cache_params,
+            formats=analyzer.result_formats,
+        )
 
-class SeverityAnalyzer:
+    def _cached_outcomes(self, keys: dict[int, str]) -> dict[int, Outcome]:
+        assert self.result_cache is not None
+        outcomes = {}
+        for analyzer in self._analyzers:
+            with StageMetrics.measure(f"análise: {analyzer.name}") as stage:
+                entry = self.result_cache.get(keys[id(analyzer)])
+            if entry is None:
+                continue
+
+            data, metadata = entry
+            logger.info(f"Resultado de '{analyzer.name}' recuperado do cache.")
+            stage.rows, stage.cached = len(data), True
+            self.metrics.add(stage)
+            result = AnalysisResult(metadata["name"], metadata["description"], data, metadata["requested_formats"])
+            outcomes[id(analyzer)] = result, stage
+        return outcomes
+
+    def _store(self, key: str, result: AnalysisResult) -> None:
+        assert self.result_cache is not None
+        metadata = {"name": result.name, "description": result.description}
+        try:
+            self.result_cache.put(key, result.data, {**metadata, "requested_formats": result.requested_formats})
+        except (OSError, ValueError, TypeError) as e:
+            # e.g. a frame pyarrow cannot write: the result is still reported, just not cached
+            logger.warning(f"Não foi possível armazenar o resultado de '{result.name}' no cache: {e}")
+
+    @staticmethod
+    def shared_totals(crime_data: CrimeData, specs: list[ScanSpec]) -> pd.DataFrame:
+        """
+        One pass over the raw rows that every spec can be answered from: the sums of the
+        union of their measures by 'evento' plus the union of their keys, restricted to the
+        union of their events. Sums are associative, so rolling this up gives each spec's
+        totals exactly (up to float rounding).
+        """
+        events = list(dict.fromkeys(event for spec in specs for event in spec.events))
+        keys = list(dict.fromkeys(["evento", *(key for spec in specs for key in spec.by)]))
+        measures = list(dict.fromkeys(measure for spec in specs for measure in spec.measures))
+
+        rows = crime_data.select(events=events)
+        # dropna=False: a spec that does not group by a key must still count the rows where it is missing
+        totals = rows.groupby(keys, observed=True, dropna=False, sort=False)[measures].sum().reset_index()
+        return totals.astype({col: "float64" for col in measures if totals[col].dtype == "float32"})
+
+    def _run_shared_scan(self, crime_data: CrimeData, analyzers: list[ScanAnalyzer]) -> dict[int, Outcome]:
+        """Runs the given analyzers from one shared scan; returns their outcomes by analyzer id."""
+        logger.info(f"Varredura compartilhada para {len(analyzers)} análises...")
+        try:
+            with self.metrics.stage("varredura compartilhada") as stage:
+                stage.rows = len(crime_data.data)
+                totals = self.shared_totals(crime_data, [analyzer.scan for analyzer in analyzers])
+        except KeyError:
+            # Some analyzer needs a missing column: let each one run (and fail) on its own
+            logger.warning("Colunas ausentes para a varredura compartilhada; executando as análises separadamente.")
+            return {}
+
+        outcomes = {}
+        for analyzer in analyzers:
+            logger.info(f"Executando análise: {analyzer.name}...")
+
+            def summarize(analyzer: ScanAnalyzer = analyzer) -> AnalysisResult:
+                return analyzer.result_from(analyzer.scan.execute(totals))
+
+            outcomes[id(analyzer)] = _measured(analyzer, summarize, len(totals), self.metrics)
+        return outcomes
+
+
+class SeverityAnalyzer(Analyzer):
     """Analyzes crime data to calculate a Crime Severity Index (CSI).
     Follows the pattern required by the AnalysisRunner.
     """
@@ -244,6 +564,22 @@ class SeverityAnalyzer:
     def description(self) -> str:
         return "Retorna o índice de severidade de cada evento criminal ou atípico."
 
+    @property
+    def required_columns(self) -> list[str] | None:
+        # get_processed_data aggregates every numeric column by event
+        return ["evento", *config.NUMERIC_COLS]
+
+    @property
+    def cache_params(self) -> dict[str, Any]:
+        return {
+            "csi_weights": self.CSI_WEIGHTS,
+            "dimension_mapping": self.DIMENSION_MAPPING,
+            # Inputs of get_processed_data
+            "numeric_cols": config.NUMERIC_COLS,
+            "non_crime_events": config.NON_CRIME_EVENTS,
+            "processing_version": CrimeData.PROCESSING_VERSION,
+        }
+
     def _standardize_column(self, column: pd.Series) -> pd.Series:
         """Standardizes a column using Z-score."""
         mean = column.mean()
@@ -252,7 +588,186 @@ class SeverityAnalyzer:
             return column * 0  # All values are the same
         return (column - mean) / std
 
-    def analyze(self, crime_data: CrimeData) -> pd.DataFrame:
+    def standardized_matrix(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        The crime × dimension matrix of Z-scores, with dimensions in CSI_WEIGHTS order.
+        A dimension whose column is missing contributes zeros, as in `analyze`.
+        """
+        columns = []
+        for dimension in self.CSI_WEIGHTS:
+            column_name = self.DIMENSION_MAPPING[dimension]
+            if column_name in df.columns:
+                columns.append(self._standardize_column(df[column_name].astype("float64")).to_numpy())
+            else:
+                columns.append(np.zeros(len(df)))
+        return np.column_stack(columns)
+
+    def sweep(self, crime_data: CrimeData, weights: np.ndarray, top_k: int = 5) -> pd.DataFrame:
+        """
+        How the severity ranking of each crime type shifts over many weightings.
+
+        Args:
+            crime_data: The main CrimeData object containing the raw data.
+            weights: An (m × 3) array with one weight vector per row, columns in
+                CSI_WEIGHTS order (harm, disruption, volume).
+            top_k: Size of the top of the ranking counted in `top_k_share`.
+
+        Returns:
+            One row per crime type, sorted by mean rank: its rank under CSI_WEIGHTS and the
+            mean, standard deviation, minimum, maximum and range of its rank (1 = most
+            severe) over the weightings, and the share of weightings that put it in the top k.
+        """
+        weights = np.atleast_2d(np.asarray(weights, dtype="float64"))
+        if weights.shape[1] != len(self.CSI_WEIGHTS):
+            raise ValueError(f"Esperados vetores de {len(self.CSI_WEIGHTS)} pesos, recebido shape {weights.shape}.")
+
+        df = crime_data.get_processed_data()
+        if df.empty:
+            logger.info("No data to analyze for severity.")
+            return pd.DataFrame()
+
+        z_scores = self.standardized_matrix(df)
+        # Every CSI at once: crimes × weightings
+        ranks = self._ranks(z_scores @ weights.T)
+        baseline = self._ranks(z_scores @ np.array(list(self.CSI_WEIGHTS.values()))[:, np.newaxis])[:, 0]
+
+        result = pd.DataFrame(
+            {
+                "crime_type": df["crime_type"].to_numpy(),
+                "baseline_rank": baseline,
+                "mean_rank": ranks.mean(axis=1),
+                "std_rank": ranks.std(axis=1),
+                "min_rank": ranks.min(axis=1),
+                "max_rank": ranks.max(axis=1),
+                "rank_range": ranks.max(axis=1) - ranks.min(axis=1),
+                "top_k_share": (ranks <= top_k).mean(axis=1),
+            }
+        )
+        return result.sort_values(["mean_rank", "baseline_rank"], ignore_index=True)
+
+    def grouped_scores(self, crime_data: CrimeData, by: Sequence[str]) -> pd.DataFrame:
+        """
+        The CSI of each crime type within each group of `by` (e.g. ["uf", "ano"]), with the
+        Z-scores standardized within the group rather than nationwide.
+
+        Every group is handled in the same pass with grouped transforms. A group where a
+        dimension does not vary (including groups with a single crime type) gets zeros for
+        it, as `_standardize_column` does nationwide.
+
+        Returns:
+            A long-format frame with the `by` columns, 'crime_type', 'csi' and the rank of
+            the crime type within its group (1 = most severe), sorted by group and rank.
+        """
+        by = list(by)
+        df = crime_data.get_processed_data(by=by)
+        if df.empty:
+            logger.info("No data to analyze for severity.")
+            return pd.DataFrame()
+
+        groups = df.groupby(by, observed=True, sort=False)
+        csi = np.zeros(len(df))
+        for dimension, weight in self.CSI_WEIGHTS.items():
+            column_name = self.DIMENSION_MAPPING[dimension]
+            if column_name not in df.columns:
+                continue
+            values = df[column_name].astype("float64")
+            mean = groups[column_name].transform("mean").to_numpy(dtype="float64")
+            std = groups[column_name].transform("std").to_numpy(dtype="float64")
+            with np.errstate(divide="ignore", invalid="ignore"):
+                z_scores = np.where(std > 0, (values.to_numpy() - mean) / std, 0.0)
+            csi += weight * z_scores
+
+        result = df[[*by, "crime_type"]].assign(csi=csi)
+        result["rank"] = result.groupby(by, observed=True)["csi"].rank(method="first", ascending=False).astype("int32")
+        return result.sort_values([*by, "rank"], ignore_index=True)
+
+    def unit_tensor(self, crime_data: CrimeData) -> tuple[np.ndarray, pd.Index]:
+        """
+        The UF-year × crime × dimension tensor of totals (dimensions in CSI_WEIGHTS order),
+        and the crime types along its second axis. Missing combinations are zeros.
+        """
+        df = crime_data.get_processed_data(by=["uf", "ano"])
+        if df.empty:
+            return np.zeros((0, 0, len(self.CSI_WEIGHTS))), pd.Index([], name="crime_type")
+
+        units = df.groupby(["uf", "ano"], observed=True, sort=False).ngroup().to_numpy()
+        crimes, crime_types = pd.factorize(df["crime_type"], sort=True)
+        tensor = np.zeros((units.max() + 1, len(crime_types), len(self.CSI_WEIGHTS)))
+        for position, dimension in enumerate(self.CSI_WEIGHTS):
+            column_name = self.DIMENSION_MAPPING[dimension]
+            if column_name in df.columns:
+                tensor[units, crimes, position] = df[column_name].to_numpy(dtype="float64")
+        return tensor, pd.Index(crime_types, name="crime_type")
+
+    def bootstrap(
+        self,
+        crime_data: CrimeData,
+        resamples: int = 10_000,
+        confidence: float = 0.95,
+        seed: int | None = None,
+        workers: int = 1,
+        batch_size: int = 1000,
+    ) -> pd.DataFrame:
+        """
+        Bootstrap confidence intervals for the CSI and rank of each crime type.
+
+        Each resample draws the UF-year units with replacement and recomputes the national
+        totals, their Z-scores (mean and standard deviation across crime types) and the CSI.
+        Resamples are drawn in batches of multinomial unit counts, so a batch of totals is
+        one matrix product with the unit tensor. Batches are seeded from `seed` through
+        SeedSequence, so the result does not depend on `workers`.
+
+        Returns:
+            One row per crime type, sorted by CSI: the point estimate from all units, the
+            bootstrap interval of the CSI ('csi_low', 'csi_high'), the point rank and the
+            interval of the rank ('rank_low', 'rank_high').
+        """
+        tensor, crime_types = self.unit_tensor(crime_data)
+        if tensor.size == 0:
+            logger.info("No data to analyze for severity.")
+            return pd.DataFrame()
+
+        weights = np.array(list(self.CSI_WEIGHTS.values()))
+        batches = [min(batch_size, resamples - start) for start in range(0, resamples, batch_size)]
+        seeds = np.random.SeedSequence(seed).spawn(len(batches))
+        tasks = [(tensor, weights, size, batch_seed) for size, batch_seed in zip(batches, seeds)]
+
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                chunks = list(pool.map(_bootstrap_batch, *zip(*tasks)))
+        else:
+            chunks = [_bootstrap_batch(*task) for task in tasks]
+        csi = np.concatenate([chunk for chunk, _ in chunks])
+        ranks = np.concatenate([chunk_ranks for _, chunk_ranks in chunks])
+
+        point = _csi_batch(tensor.sum(axis=0)[np.newaxis], weights)
+        tails = [(1 - confidence) / 2 * 100, (1 + confidence) / 2 * 100]
+        csi_low, csi_high = np.percentile(csi, tails, axis=0)
+        rank_low, rank_high = np.percentile(ranks, tails, axis=0)
+
+        result = pd.DataFrame(
+            {
+                "crime_type": crime_types,
+                "csi": point[0],
+                "csi_low": csi_low,
+                "csi_high": csi_high,
+                "rank": self._ranks(point.T)[:, 0],
+                "rank_low": rank_low,
+                "rank_high": rank_high,
+            }
+        )
+        return result.sort_values("rank", ignore_index=True)
+
+    @staticmethod
+    def _ranks(scores: np.ndarray) -> np.ndarray:
+        """Rank of each row within each column of `scores`, 1 for the highest; ties keep row order."""
+        order = np.argsort(-scores, axis=0, kind="stable")
+        ranks = np.empty(scores.shape, dtype=np.int32)
+        positions = np.broadcast_to(np.arange(1, scores.shape[0] + 1, dtype=np.int32)[:, np.newaxis], scores.shape)
+        np.put_along_axis(ranks, order, positions, axis=0)
+        return ranks
+
+    def analyze(self, crime_data: CrimeData) -> AnalysisResult:
         """
         The main analysis method called by the AnalysisRunner.
 
@@ -260,7 +775,7 @@ class SeverityAnalyzer:
             crime_data: The main CrimeData object containing the raw data.
 
         Returns:
-            A DataFrame with the calculated CSI scores, sorted by severity.
+            An AnalysisResult with the calculated CSI scores, sorted by severity.
         """
         logger.info("Running Crime Severity Index analysis...")
 
@@ -269,7 +784,7 @@ class SeverityAnalyzer:
 
         if df.empty:
             logger.info("No data to analyze for severity.")
-            return pd.DataFrame()
+            return AnalysisResult(self.name, self.description, pd.DataFrame())
 
         # 2. Normalize the relevant columns
         for dimension, column_name in self.DIMENSION_MAPPING.items():
@@ -283,4 +798,139 @@ class SeverityAnalyzer:
             + df.get("volume_norm", 0) * self.CSI_WEIGHTS["volume"]
         )
 
-        return df[["crime_type", "csi"]].sort_values(by="csi", ascending=False)
+        result = df[["crime_type", "csi"]].sort_values(by="csi", ascending=False)
+        return AnalysisResult(self.name, self.description, result)
+
+
+class GroupedSeverityAnalyzer(SeverityAnalyzer):
+    """Computes the Crime Severity Index within each UF, year or municipality."""
+
+    def __init__(self, by: Sequence[str] = ("uf",)) -> None:
+        super().__init__()
+        self.by = list(by)
+
+    @property
+    def name(self) -> str:
+        return f"Crime Severity Index Analysis by {', '.join(self.by)}"
+
+    @property
+    def description(self) -> str:
+        return (
+            f"Retorna o índice de severidade de cada evento, padronizado dentro de cada grupo de {', '.join(self.by)}."
+        )
+
+    @property
+    def required_columns(self) -> list[str] | None:
+        return [*self.by, "evento", *config.NUMERIC_COLS]
+
+    @property
+    def cache_params(self) -> dict[str, Any]:
+        return {**super().cache_params, "by": self.by}
+
+    def analyze(self, crime_data: CrimeData) -> AnalysisResult:
+        logger.info(f"Executando análise: {self.name}...")
+        try:
+            result = self.grouped_scores(crime_data, self.by)
+        except KeyError:
+            logger.warning(f"Colunas necessárias não encontradas para '{self.name}'.")
+            result = pd.DataFrame()
+        return AnalysisResult(self.name, self.description, result)
+
+
+class SeverityBootstrapAnalyzer(SeverityAnalyzer):
+    """Estimates how uncertain the CSI scores and ranking are, by resampling UF-year units."""
+
+    def __init__(
+        self,
+        resamples: int = config.SEVERITY_BOOTSTRAP_RESAMPLES,
+        confidence: float = 0.95,
+        seed: int | None = config.SEVERITY_BOOTSTRAP_SEED,
+        workers: int = 1,
+    ) -> None:
+        super().__init__()
+        self.resamples = resamples
+        self.confidence = confidence
+        self.seed = seed
+        self.workers = workers
+
+    @property
+    def name(self) -> str:
+        return "Crime Severity Index Confidence Intervals"
+
+    @property
+    def description(self) -> str:
+        return (
+            f"Intervalos de {self.confidence:.0%} para o índice de severidade e a posição de cada evento, "
+            f"por {self.resamples:,} reamostragens bootstrap das unidades UF-ano."
+        )
+
+    @property
+    def required_columns(self) -> list[str] | None:
+        return ["uf", "ano", "evento", *config.NUMERIC_COLS]
+
+    @property
+    def cache_params(self) -> dict[str, Any]:
+        # The number of workers does not change the result
+        bootstrap = {"resamples": self.resamples, "confidence": self.confidence, "seed": self.seed}
+        return {**super().cache_params, **bootstrap}
+
+    def analyze(self, crime_data: CrimeData) -> AnalysisResult:
+        logger.info(f"Executando análise: {self.name}...")
+        try:
+            result = self.bootstrap(crime_data, self.resamples, self.confidence, self.seed, self.workers)
+        except KeyError:
+            logger.warning(f"Colunas necessárias não encontradas para '{self.name}'.")
+            result = pd.DataFrame()
+        return AnalysisResult(self.name, self.description, result)
+
+
+def weight_grid(step: float = 0.05, dimensions: int = 3) -> np.ndarray:
+    """Every weight vector (entries summing to 1) whose entries are multiples of `step`."""
+    divisions = round(1 / step)
+    if not np.isclose(divisions * step, 1):
+        raise ValueError(f"O passo deve dividir 1 em partes iguais, recebido {step}.")
+
+    # The first dimensions - 1 entries range freely; the last one takes what is left
+    heads = np.array(list(itertools.product(range(divisions + 1), repeat=dimensions - 1)), dtype=np.int64)
+    heads = heads[heads.sum(axis=1) <= divisions]
+    return np.column_stack([heads, divisions - heads.sum(axis=1)]) / divisions
+
+
+def dirichlet_weights(samples: int, alpha: float = 1.0, dimensions: int = 3, seed: int | None = None) -> np.ndarray:
+    """
+    Random weight vectors from a symmetric Dirichlet distribution; alpha = 1 samples the
+    simplex uniformly, larger values concentrate around equal weights.
+    """
+    return np.random.default_rng(seed).dirichlet(np.full(dimensions, alpha), size=samples)
+
+
+class SeveritySweepAnalyzer(SeverityAnalyzer):
+    """Measures how stable the CSI ranking is when the dimension weights change."""
+
+    def __init__(self, weights: np.ndarray | None = None, top_k: int = 5) -> None:
+        super().__init__()
+        if weights is None:
+            weights = dirichlet_weights(config.SEVERITY_SWEEP_SAMPLES, seed=config.SEVERITY_SWEEP_SEED)
+        self.weights = np.asarray(weights, dtype="float64")
+        self.top_k = top_k
+
+    @property
+    def name(self) -> str:
+        return "Crime Severity Index Sensitivity"
+
+    @property
+    def description(self) -> str:
+        return (
+            f"Estatísticas do ranking de severidade de cada evento sob {len(self.weights):,} vetores de pesos "
+            f"(posição média, amplitude e frequência no top {self.top_k})."
+        )
+
+    @property
+    def cache_params(self) -> dict[str, Any]:
+        weights_hash = hashlib.sha256(np.ascontiguousarray(self.weights).tobytes()).hexdigest()
+        return {**super().cache_params, "weights": weights_hash, "top_k": self.top_k}
+
+    def analyze(self, crime_data: CrimeData) -> AnalysisResult:
+        logger.info(f"Executando análise: {self.name}...")
+        result = self.sweep(crime_data, self.weights, self.top_k)
+        return AnalysisResult(self.name, self.description, result)
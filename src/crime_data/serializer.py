@@ -1,25 +1,144 @@
 import logging
+import os
+import shutil
 from pathlib import Path
+from typing import Any, Literal, TypeAlias, cast
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+from utils import config
 
 from .models import CrimeData
+from .schema import apply_schema, stale_columns
+
+# Filtros no formato do pyarrow: lista de (coluna, operador, valor), ou lista de listas (OU de Es)
+ParquetFilters: TypeAlias = list[tuple[str, str, Any]] | list[list[tuple[str, str, Any]]]
+SerializeFormat: TypeAlias = Literal["parquet", "arrow"]
+
+ARROW_SUFFIXES = {".arrow", ".feather", ".ipc"}
 
 logger = logging.getLogger(__name__)
 
 
 class CrimeDataSerializer:
     @staticmethod
-    def serialize(crime_data_obj: CrimeData, path: Path) -> None:
+    def format_for(path: Path) -> SerializeFormat:
+        """Infere o formato pela extensão: .arrow/.feather/.ipc usam Arrow IPC, o resto parquet."""
+        return "arrow" if Path(path).suffix in ARROW_SUFFIXES else "parquet"
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        # Gravar sobre um dataset existente acrescentaria arquivos às partições antigas
+        if path.is_dir():
+            shutil.rmtree(path)
+        elif path.exists():
+            path.unlink()
+
+    @staticmethod
+    def write_arrow(df: pd.DataFrame, path: Path) -> None:
+        """Grava o DataFrame como um arquivo Arrow IPC sem compressão, na ordem em que está."""
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        # Sem compressão: é o que permite ler os buffers direto do mapa de memória
+        feather.write_feather(table, path, compression="uncompressed")
+
+    @staticmethod
+    def serialize(crime_data_obj: CrimeData, path: Path, partition_cols: list[str] | None = None) -> None:
+        """
+        Grava os dados no formato indicado pela extensão de `path`.
+
+        Parquet: dataset particionado (por padrão, por 'ano'). Dentro de cada partição as
+        linhas são ordenadas por UF e evento, para que as estatísticas dos row groups
+        permitam descartar blocos inteiros na leitura.
+
+        Arrow IPC: um único arquivo sem compressão, que pode ser mapeado em memória na
+        leitura. `partition_cols` é ignorado.
+        """
         logger.info(f"Serializando objeto para {path}...")
-        crime_data_obj.data.to_parquet(path, index=False)
+        df = crime_data_obj.data
+
+        if partition_cols is None:
+            partition_cols = config.SERIALIZE_PARTITION_COLS
+        partition_cols = [col for col in partition_cols if col in df.columns]
+
+        sort_cols = [col for col in [*partition_cols, "uf", "evento"] if col in df.columns]
+        if sort_cols:
+            df = df.sort_values(sort_cols, kind="stable", ignore_index=True)
+
+        # Grava ao lado do destino e só então o substitui, para que uma falha não deixe o snapshot pela metade
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        CrimeDataSerializer._remove(tmp_path)
+        try:
+            if CrimeDataSerializer.format_for(path) == "arrow":
+                CrimeDataSerializer.write_arrow(df, tmp_path)
+            else:
+                df.to_parquet(
+                    tmp_path,
+                    engine="pyarrow",
+                    index=False,
+                    partition_cols=partition_cols or None,
+                    row_group_size=config.PARQUET_ROW_GROUP_SIZE,
+                )
+        except BaseException:
+            CrimeDataSerializer._remove(tmp_path)
+            raise
+        CrimeDataSerializer._replace(tmp_path, path)
         logger.info("Serializado com sucesso.")
 
     @staticmethod
-    def deserialize(path: Path) -> CrimeData:
+    def _replace(tmp_path: Path, path: Path) -> None:
+        # os.replace não substitui diretórios (datasets particionados): o antigo é afastado antes
+        if path.is_dir() or (tmp_path.is_dir() and path.exists()):
+            old_path = path.with_suffix(f".{os.getpid()}.old")
+            CrimeDataSerializer._remove(old_path)
+            os.replace(path, old_path)
+            os.replace(tmp_path, path)
+            CrimeDataSerializer._remove(old_path)
+        else:
+            os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read_arrow(path: Path, filters: ParquetFilters | None, columns: list[str] | None) -> pd.DataFrame:
+        # Os buffers da tabela apontam para o arquivo mapeado; nada é lido até ser acessado
+        source = pa.memory_map(str(path), "r")
+        table = pa.ipc.open_file(source).read_all()
+        if filters:
+            table = table.filter(pq.filters_to_expression(filters))
+        if columns is not None:
+            table = table.select([col for col in columns if col in table.column_names])
+        # split_blocks evita consolidar colunas numéricas, permitindo conversão sem cópia
+        return cast(pd.DataFrame, table.to_pandas(split_blocks=True))
+
+    @staticmethod
+    def deserialize(path: Path, filters: ParquetFilters | None = None, columns: list[str] | None = None) -> CrimeData:
+        """
+        Lê os dados serializados, opcionalmente restritos por `filters` e `columns`.
+        Colunas pedidas que não existem no arquivo são ignoradas.
+
+        Em parquet, os filtros sobre colunas de partição descartam diretórios inteiros;
+        os demais usam as estatísticas dos row groups antes de filtrar linha a linha.
+        Em Arrow IPC, o arquivo é mapeado em memória e filtrado sobre o mapa.
+        Ex.: filters=[("ano", ">=", 2024), ("uf", "in", ["SP", "RJ"])]
+        """
         logger.info(f"Desserializando dados de {path}...")
         if not Path(path).exists():
             raise FileNotFoundError(f"Arquivo não encontrado: {path}")
-        data = pd.read_parquet(path)
-        logger.info("Desserializado com sucesso.")
+
+        if CrimeDataSerializer.format_for(path) == "arrow":
+            data = CrimeDataSerializer._read_arrow(path, filters, columns)
+        else:
+            if columns is not None:
+                # Colunas ausentes no arquivo são ignoradas, como no Arrow IPC
+                available = set(pq.ParquetDataset(path).schema.names)
+                columns = [col for col in columns if col in available]
+            data = pd.read_parquet(path, engine="pyarrow", filters=filters, columns=columns)
+
+        # Ambos os formatos preservam categóricas e inteiros compactos. O esquema só é reaplicado às
+        # colunas que chegam fora dele ('ano' das partições, arquivos antigos), sem varrer as demais
+        stale = stale_columns(data)
+        if stale:
+            data = apply_schema(data, stale)
+        logger.info(f"Desserializado com sucesso ({len(data):,} linhas).")
         return CrimeData(data)
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 ROOT_DIR = Path(__file__).resolve().parent.parent.parent
@@ -5,9 +6,55 @@ ROOT_DIR = Path(__file__).resolve().parent.parent.parent
 INPUT_DIR = ROOT_DIR / Path("data/input/")
 OUTPUT_DIR = ROOT_DIR / Path("data/output/")
 
-SERIALIZE_FILEPATH = OUTPUT_DIR / Path("crimedata.parquet")
+# Formato dos dados serializados: "parquet" (dataset particionado, ver SERIALIZE_PARTITION_COLS)
+# ou "arrow" (arquivo Arrow IPC sem compressão, mapeado em memória na leitura)
+SERIALIZE_FORMAT = os.getenv("SERIALIZE_FORMAT", "parquet")
+SERIALIZE_FILEPATH = OUTPUT_DIR / Path(f"crimedata.{SERIALIZE_FORMAT}")
+# Use ["ano", "uf"] para também particionar por estado
+SERIALIZE_PARTITION_COLS = ["ano"]
+PARQUET_ROW_GROUP_SIZE = 100_000
+# Cubo de agregados (somas de NUMERIC_COLS por célula das dimensões), gravado ao lado dos dados
+CUBE_FILEPATH = OUTPUT_DIR / Path("crimecube.parquet")
+CUBE_DIMENSIONS = ["evento", "uf", "ano", "municipio"]
+# Cache incremental: um parquet por planilha de origem, indexado por um manifesto
+CACHE_DIR = OUTPUT_DIR / Path("cache")
+SOURCE_CACHE_DIR = CACHE_DIR / Path("sources")
+# Agregados de CrimeData.get_processed_data, indexados pela impressão digital dos dados
+PROCESSED_CACHE_DIR = CACHE_DIR / Path("processed")
+PROCESSED_CACHE_MAX_FILES = 8
+# Resultados das análises, indexados pelos dados, pelo analisador (versão e parâmetros) e pelos formatos
+RESULT_CACHE_DIR = CACHE_DIR / Path("results")
+RESULT_CACHE_MAX_FILES = 64
+RESULT_CACHE_MAX_MB = 256
+# Grafo de ações orçamentárias e crimes (DOT), com o snapshot compilado indexado pelo hash do arquivo
+POLICY_GRAPH_FILEPATH = INPUT_DIR / Path("policies_crimes.gv")
+POLICY_GRAPH_CACHE_DIR = CACHE_DIR / Path("policy_graph")
+
+# Número de processos usados para ler as planilhas VDE (1 = leitura sequencial)
+LOADER_MAX_WORKERS = int(os.getenv("LOADER_MAX_WORKERS", "1"))
+# Quantidade de linhas por lote na leitura em streaming das planilhas
+LOADER_BATCH_SIZE = int(os.getenv("LOADER_BATCH_SIZE", "50000"))
+# Execução das análises: "sequential", "thread" ou "process"; 0 trabalhadores = padrão do executor
+ANALYSIS_MODE = os.getenv("ANALYSIS_MODE", "sequential")
+ANALYSIS_MAX_WORKERS = int(os.getenv("ANALYSIS_MAX_WORKERS", "0"))
+# Análise de sensibilidade do índice de severidade: vetores de pesos sorteados de uma Dirichlet uniforme
+SEVERITY_SWEEP_SAMPLES = 5000
+SEVERITY_SWEEP_SEED = 0
+# Intervalos de confiança do índice de severidade: reamostragens bootstrap das unidades UF-ano
+SEVERITY_BOOTSTRAP_RESAMPLES = 10_000
+SEVERITY_BOOTSTRAP_SEED = 0
+# Métricas de desempenho por etapa (tempo, CPU, memória, linhas), gravadas em JSON com --metricas
+METRICS_DIR = OUTPUT_DIR / Path("metrics")
 
 NUMERIC_COLS = ["feminino", "masculino", "nao_informado", "total_vitima", "total", "total_peso"]
+# Esquema compacto aplicado na carga: contagens viram o menor inteiro possível e pesos float32
+COUNT_COLS = ["feminino", "masculino", "nao_informado", "total_vitima", "total"]
+WEIGHT_COLS = ["total_peso"]
+CATEGORICAL_COLS = ["evento", "uf", "municipio", "arma", "agente", "faixa_etaria", "abrangencia", "formulario"]
+# Demais colunas de texto viram categóricas se a razão valores distintos / linhas for menor que isto
+CATEGORICAL_MAX_RATIO = 0.5
+# Colunas das planilhas VDE efetivamente usadas pelo pipeline ('ano' vem do nome do arquivo)
+SOURCE_COLS = ["evento", "uf", "municipio", "arma", *NUMERIC_COLS]
 NON_CRIME_EVENTS = [
     "Pessoa Localizada",
     "Emissão de Alvarás de licença",
@@ -0,0 +1,158 @@
+import json
+import platform
+import threading
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+MB = 1024**2
+
+
+def memory_mb() -> dict[str, float]:
+    """Current and peak RSS of this process, in MB; NaN where the platform reports neither."""
+    status = Path("/proc/self/status")
+    if status.exists():
+        # /proc is preferred: ru_maxrss survives exec, so a child would report its parent's peak
+        fields = dict(line.split(":", 1) for line in status.read_text().splitlines() if ":" in line)
+        return {
+            "rss": int(fields["VmRSS"].split()[0]) / 1024,
+            "peak": int(fields["VmHWM"].split()[0]) / 1024,
+        }
+    try:
+        import resource
+    except ImportError:  # Windows
+        return {"rss": float("nan"), "peak": float("nan")}
+    # ru_maxrss is in bytes on macOS and in KB elsewhere
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (MB if platform.system() == "Darwin" else 1024)
+    return {"rss": peak, "peak": peak}
+
+
+@dataclass
+class StageMetrics:
+    """
+    Measurements of one stage of a run.
+
+    `cpu_seconds` is the CPU time of the thread that ran the stage. `rss_mb` and
+    `peak_rss_mb` are the process RSS and its high-water mark when the stage ended;
+    `traced_peak_mb` is the peak of Python allocations during the stage, only
+    recorded when memory tracing is enabled.
+    """
+
+    name: str
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    rss_mb: float = 0.0
+    peak_rss_mb: float = 0.0
+    traced_peak_mb: float | None = None
+    rows: int | None = None
+    error: str | None = None
+    # The stage's output was reused from a cache instead of computed
+    cached: bool = False
+
+    @classmethod
+    @contextmanager
+    def measure(cls, name: str) -> Iterator["StageMetrics"]:
+        """Measures the enclosed block; set `rows` on the yielded object to record a row count."""
+        stage = cls(name)
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            yield stage
+        except Exception as e:
+            stage.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            stage.wall_seconds = time.perf_counter() - wall_start
+            stage.cpu_seconds = time.thread_time() - cpu_start
+            memory = memory_mb()
+            stage.rss_mb, stage.peak_rss_mb = memory["rss"], memory["peak"]
+
+
+class RunMetrics:
+    """
+    The stages of one run, in the order they started. Stages may be nested (e.g.
+    the processing triggered by an analyzer) and recorded from several threads.
+
+    With `trace_memory`, tracemalloc is started and each stage records its peak of
+    traced allocations. Tracing slows allocation-heavy code down noticeably, and
+    peaks of stages running concurrently in threads are not separated.
+    """
+
+    def __init__(self, trace_memory: bool = False) -> None:
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.stages: list[StageMetrics] = []
+        self.trace_memory = trace_memory
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def add(self, *stages: StageMetrics) -> None:
+        """Records stages measured elsewhere, e.g. in a worker process."""
+        with self._lock:
+            self.stages.extend(stages)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageMetrics]:
+        """Measures and records the enclosed block as a stage."""
+        parents: list[StageMetrics] = self._local.__dict__.setdefault("stack", [])
+        if self.trace_memory:
+            # The peak is reset for this stage, so the enclosing one keeps what it reached so far
+            if parents:
+                self._raise_traced_peak(parents[-1], self._traced_peak_mb())
+            tracemalloc.reset_peak()
+
+        with StageMetrics.measure(name) as stage:
+            self.add(stage)
+            parents.append(stage)
+            try:
+                yield stage
+            finally:
+                parents.pop()
+                if self.trace_memory:
+                    self._raise_traced_peak(stage, self._traced_peak_mb())
+                    if parents:
+                        self._raise_traced_peak(parents[-1], stage.traced_peak_mb or 0.0)
+
+    @staticmethod
+    def _traced_peak_mb() -> float:
+        return tracemalloc.get_traced_memory()[1] / MB
+
+    @staticmethod
+    def _raise_traced_peak(stage: StageMetrics, peak_mb: float) -> None:
+        stage.traced_peak_mb = max(stage.traced_peak_mb or 0.0, peak_mb)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "started_at": self.started_at,
+            "python": platform.python_version(),
+            "trace_memory": self.trace_memory,
+            "stages": [asdict(stage) for stage in self.stages],
+        }
+
+    def dump(self, directory: Path) -> Path:
+        """Writes the metrics as JSON to a timestamped file in `directory` and returns its path."""
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"metrics-{self.started_at.replace(':', '')}.json"
+        path.write_text(json.dumps(self.to_dict(), indent=2, ensure_ascii=False), encoding="utf-8")
+        return path
+
+    def summary(self) -> str:
+        """A fixed-width table of the stages, for the log."""
+        header = f"{'etapa':<60} {'wall (s)':>9} {'cpu (s)':>9} {'rss (MB)':>9} {'linhas':>11}"
+        lines = [header + (f" {'pico py (MB)':>12}" if self.trace_memory else "")]
+        for stage in self.stages:
+            rows = f"{stage.rows:,}" if stage.rows is not None else "-"
+            name = stage.name if stage.error is None else f"{stage.name} [falhou]"
+            name = f"{name} [cache]" if stage.cached else name
+            line = (
+                f"{name[:60]:<60} {stage.wall_seconds:>9.3f} {stage.cpu_seconds:>9.3f} {stage.rss_mb:>9.1f} {rows:>11}"
+            )
+            if self.trace_memory:
+                line += f" {stage.traced_peak_mb or 0.0:>12.1f}"
+            lines.append(line)
+        return "\n".join(lines)
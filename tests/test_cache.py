@@ -0,0 +1,82 @@
+import os
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from crime_data.cache import ResultCache, SourceFileCache
+from crime_data.loader import CrimeDataLoader
+from crime_data.main import load_or_build_data
+from utils import config
+
+
+def _write_workbook(path: Path, uf: str) -> None:
+    pd.DataFrame({"uf": [uf], "evento": ["Homicídio doloso"], "total_vitima": [1]}).to_excel(path, index=False)
+
+
+@pytest.fixture
+def source_dir(tmp_path: Path) -> Path:
+    source = tmp_path / "input"
+    source.mkdir()
+    _write_workbook(source / "BancoVDE 2022.xlsx", "SP")
+    _write_workbook(source / "BancoVDE 2023.xlsx", "RJ")
+    return source
+
+
+def test_sync_only_reingests_changed_sources(source_dir: Path, tmp_path: Path) -> None:
+    cache_dir = tmp_path / "cache"
+    assert SourceFileCache(cache_dir, CrimeDataLoader(source_dir)).sync()
+
+    # A fresh cache instance reads the manifest and finds nothing to do
+    loader = CrimeDataLoader(source_dir)
+    cache = SourceFileCache(cache_dir, loader)
+    assert not cache.sync()
+    assert loader.timings == {}
+
+    # Touching a file without changing its content does not trigger a re-ingest
+    os.utime(source_dir / "BancoVDE 2022.xlsx", ns=(0, 0))
+    assert not cache.sync()
+
+    _write_workbook(source_dir / "BancoVDE 2023.xlsx", "MG")
+    _write_workbook(source_dir / "BancoVDE 2024.xlsx", "BA")
+    (source_dir / "BancoVDE 2022.xlsx").unlink()
+    assert cache.sync()
+    assert set(loader.timings) == {"BancoVDE 2023.xlsx", "BancoVDE 2024.xlsx"}
+    assert len(list(cache_dir.glob("*.parquet"))) == 2
+
+    data = cache.load().data
+    assert data["uf"].tolist() == ["MG", "BA"]
+    assert data["ano"].tolist() == [2023, 2024]
+
+
+def test_result_cache_round_trip_and_lru_eviction(tmp_path: Path) -> None:
+    cache = ResultCache(tmp_path, max_files=2)
+    frame = pd.DataFrame({"UF": pd.Categorical(["SP", "RJ"]), "Total": [3, 1]}, index=[4, 2])
+
+    keys = [ResultCache.key(data="abc", version=version) for version in (1, 2, 3)]
+    assert keys[0] == ResultCache.key(version=1, data="abc")
+    cache.put(keys[0], frame, {"name": "Ranking"})
+    stored, metadata = cache.get(keys[0])
+    pd.testing.assert_frame_equal(stored, frame)
+    assert metadata == {"name": "Ranking"}
+
+    cache.put(keys[1], frame, {})
+    # Reading the first entry makes it the most recently used, so the second one is evicted
+    os.utime(tmp_path / f"{keys[1]}.parquet", ns=(0, 0))
+    cache.get(keys[0])
+    cache.put(keys[2], frame, {})
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) is not None and cache.get(keys[2]) is not None
+
+
+def test_snapshot_is_kept_when_sources_are_gone(source_dir: Path, tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(config, "INPUT_DIR", source_dir)
+    monkeypatch.setattr(config, "SOURCE_CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(config, "SERIALIZE_FILEPATH", tmp_path / "crimedata.parquet")
+    built = load_or_build_data().data
+
+    for workbook in source_dir.glob("*.xlsx"):
+        workbook.unlink()
+    restored = load_or_build_data().data
+    assert config.SERIALIZE_FILEPATH.exists()
+    assert sorted(restored["uf"].astype(str)) == sorted(built["uf"].astype(str)) == ["RJ", "SP"]
@@ -0,0 +1,52 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from crime_data.loader import CrimeDataLoader
+
+
+@pytest.fixture
+def source_dir(tmp_path: Path) -> Path:
+    """
+    Creates a few small VDE-like workbooks, one per year.
+    """
+    for year, uf in [(2023, "SP"), (2021, "RJ"), (2022, "MG")]:
+        df = pd.DataFrame(
+            {
+                "uf": [uf, uf],
+                "municipio": ["A", "B"],
+                "evento": ["Homicídio doloso", "Apreensão de Maconha"],
+                "total_vitima": [1, None],
+                "total_peso": [None, "1,5"],
+            }
+        )
+        df.to_excel(tmp_path / f"BancoVDE {year}.xlsx", index=False)
+    return tmp_path
+
+
+def test_parallel_load_matches_sequential(source_dir: Path) -> None:
+    sequential = CrimeDataLoader(source_dir).load().data
+    loader = CrimeDataLoader(source_dir, max_workers=2)
+    parallel = loader.load().data
+
+    pd.testing.assert_frame_equal(sequential, parallel)
+    # Files are concatenated in a stable (sorted) order
+    assert parallel["ano"].tolist() == [2021, 2021, 2022, 2022, 2023, 2023]
+    assert set(loader.timings) == {"BancoVDE 2021.xlsx", "BancoVDE 2022.xlsx", "BancoVDE 2023.xlsx"}
+
+
+def test_streaming_batches_are_projected_and_parsed(source_dir: Path) -> None:
+    loader = CrimeDataLoader(source_dir, batch_size=1)
+    batches = list(loader.iter_batches())
+
+    assert len(batches) == 6
+    assert all(len(batch) == 1 for batch in batches)
+    assert "arma" not in batches[0].columns  # absent from the source, so not invented
+    combined = pd.concat(batches, ignore_index=True)
+    assert combined["total_peso"].tolist()[1] == 1.5
+    assert combined["ano"].tolist() == [2021, 2021, 2022, 2022, 2023, 2023]
+
+    streamed = CrimeDataLoader(source_dir, streaming=True).load().data
+    assert list(streamed.columns) == ["evento", "uf", "municipio", "total_vitima", "total_peso", "ano"]
+    assert len(streamed) == 6
@@ -0,0 +1,38 @@
+import json
+import tracemalloc
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from utils.metrics import RunMetrics
+
+
+@pytest.fixture
+def traced_metrics() -> Iterator[RunMetrics]:
+    yield RunMetrics(trace_memory=True)
+    tracemalloc.stop()
+
+
+def test_stages_nest_and_record_traced_peaks(traced_metrics: RunMetrics, tmp_path: Path) -> None:
+    metrics = traced_metrics
+    with metrics.stage("carga") as outer:
+        outer.rows = 10
+        with metrics.stage("processamento"):
+            buffer = bytearray(8 * 1024**2)
+            del buffer
+
+    with pytest.raises(ValueError):
+        with metrics.stage("análise: falha"):
+            raise ValueError("boom")
+
+    assert [stage.name for stage in metrics.stages] == ["carga", "processamento", "análise: falha"]
+    load, process, failed = metrics.stages
+    assert process.traced_peak_mb >= 8
+    # The enclosing stage keeps the peak reached inside the nested one
+    assert load.traced_peak_mb >= process.traced_peak_mb
+    assert load.wall_seconds >= process.wall_seconds
+    assert failed.error == "ValueError: boom"
+
+    dumped = json.loads(metrics.dump(tmp_path).read_text(encoding="utf-8"))
+    assert [stage["rows"] for stage in dumped["stages"]] == [10, None, None]
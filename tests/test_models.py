@@ -0,0 +1,209 @@
+import statistics
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from crime_data.builder import CrimeCategoryBuilder, CrimeEventsBuilder, StreamingCategoryBuilder
+from crime_data.cube import AggregateCube
+from crime_data.models import CrimeData, CrimeEvent, CrimeEventTable, VictimCategory
+from crime_data.schema import apply_schema
+from utils import config
+
+
+@pytest.fixture
+def raw_frame() -> pd.DataFrame:
+    return apply_schema(
+        pd.DataFrame(
+            {
+                "evento": ["Homicídio doloso", "Pessoa Localizada", "Homicídio doloso", "Estupro"],
+                "uf": ["SP", "SP", "RJ", "MG"],
+                "feminino": [0, 1, 1, 1],
+                "masculino": [2, 0, 3, 0],
+                "nao_informado": [0, 0, 0, 0],
+                "total_vitima": [2, 1, 4, 1],
+                "total": [0, 0, 0, 0],
+                "total_peso": [0.0, 0.0, 0.0, 0.0],
+                "ano": [2024, 2024, 2025, 2025],
+            }
+        )
+    )
+
+
+def test_processed_data_is_memoised_and_persisted(raw_frame: pd.DataFrame, tmp_path: Path, monkeypatch) -> None:
+    crime_data = CrimeData(raw_frame, cache_dir=tmp_path)
+    processed = crime_data.get_processed_data()
+    assert processed["crime_type"].tolist() == ["Estupro", "Homicídio doloso"]
+    assert processed["total_vitima"].tolist() == [1, 6]
+
+    # Callers may mutate the returned frame without affecting the memoised one
+    processed["csi"] = 0.0
+    assert "csi" not in crime_data.get_processed_data().columns
+    assert len(list(tmp_path.glob("processed-*.parquet"))) == 1
+
+    # A new instance over the same data reads the aggregate from disk
+    fresh = CrimeData(raw_frame.copy(), cache_dir=tmp_path)
+    monkeypatch.setattr(CrimeData, "_process", lambda self, by: pytest.fail("should have used the disk cache"))
+    pd.testing.assert_frame_equal(fresh.get_processed_data(), crime_data.get_processed_data(), check_dtype=False)
+
+
+def test_processed_weights_match_float64_baseline() -> None:
+    rng = np.random.default_rng(7)
+    raw = pd.DataFrame(
+        {
+            "evento": rng.choice(["Homicídio doloso", "Estupro", "Furto"], size=20_000),
+            "total_vitima": rng.integers(0, 5, size=20_000),
+            "total": rng.integers(0, 3, size=20_000),
+            "total_peso": rng.integers(0, 40_000, size=20_000) / 10,
+        }
+    )
+    raw = apply_schema(raw)
+    assert raw["total_peso"].dtype == "float32"
+    expected = (
+        raw.astype({"total_peso": "float64"})
+        .groupby("evento", observed=True)[["total_vitima", "total", "total_peso"]]
+        .sum()
+        .reset_index()
+        .rename(columns={"evento": "crime_type"})
+    )
+
+    processed = CrimeData(raw).get_processed_data()
+    assert processed["total_peso"].dtype == "float64"
+    pd.testing.assert_frame_equal(processed[expected.columns], expected, check_dtype=False, rtol=0, atol=0)
+
+
+def test_processed_cache_invalidated_by_config(raw_frame: pd.DataFrame, tmp_path: Path, monkeypatch) -> None:
+    CrimeData(raw_frame, cache_dir=tmp_path).get_processed_data()
+
+    monkeypatch.setattr(config, "NON_CRIME_EVENTS", [*config.NON_CRIME_EVENTS, "Estupro"])
+    processed = CrimeData(raw_frame, cache_dir=tmp_path).get_processed_data()
+    assert processed["crime_type"].tolist() == ["Homicídio doloso"]
+    assert len(list(tmp_path.glob("processed-*.parquet"))) == 2
+
+
+def test_select_matches_boolean_masks(raw_frame: pd.DataFrame) -> None:
+    crime_data = CrimeData(raw_frame)
+    data = crime_data.data
+
+    selected = crime_data.select(events=["Homicídio doloso", "Inexistente"], years=[2025])
+    expected = data[data["evento"].isin(["Homicídio doloso"]) & (data["ano"] == 2025)]
+    pd.testing.assert_frame_equal(selected, expected)
+
+    pd.testing.assert_frame_equal(crime_data.select(ufs=["SP", "MG"]), data[data["uf"].isin(["SP", "MG"])])
+    assert crime_data.select(events=["Estupro"], ufs=["SP"]).empty
+    assert crime_data.select() is data
+
+
+def test_cube_rollups_match_raw_groupby(raw_frame: pd.DataFrame, tmp_path: Path) -> None:
+    cube_path = tmp_path / "cube.parquet"
+    crime_data = CrimeData(raw_frame, cube_path=cube_path)
+
+    rollup = crime_data.cube.rollup(["uf"], events=["Homicídio doloso"], measures=["total_vitima"])
+    expected = raw_frame[raw_frame["evento"] == "Homicídio doloso"].groupby("uf", observed=True)["total_vitima"].sum()
+    assert rollup.set_index("uf")["total_vitima"].to_dict() == expected.to_dict()
+    assert crime_data.cube.rollup(years=[2025])["total_vitima"].tolist() == [5]
+
+    # A second instance over the same data reads the stored cube
+    stored = CrimeData(raw_frame.copy(), cube_path=cube_path).cube
+    assert stored.fingerprint == crime_data.fingerprint
+    assert len(stored.data) == len(crime_data.cube.data)
+
+
+def test_corrupt_cube_file_is_rebuilt(raw_frame: pd.DataFrame, tmp_path: Path) -> None:
+    cube_path = tmp_path / "cube.parquet"
+    expected = CrimeData(raw_frame, cube_path=cube_path).cube.data
+    cube_path.write_bytes(cube_path.read_bytes()[:100])
+
+    rebuilt = CrimeData(raw_frame.copy(), cube_path=cube_path).cube
+    pd.testing.assert_frame_equal(rebuilt.data, expected)
+    assert AggregateCube.load(cube_path) is not None
+
+
+def test_category_statistics_and_event_severities() -> None:
+    values = [3, 0, 7, 2, 2, 9]
+    category = VictimCategory(values)
+    assert (category.N, category.total) == (6, 23)
+    assert category.mean == pytest.approx(statistics.fmean(values))
+    assert category.stdev == pytest.approx(statistics.pstdev(values))
+    np.testing.assert_allclose(category.z_scores(), [category.z_score(v) for v in values])
+    assert not VictimCategory([4, 4]).z_scores().any()
+
+    events = [
+        CrimeEvent(f"e{i}", v, w, a)
+        for i, (v, w, a) in enumerate(zip(values, [0.5, 8, 1, 0, 3, 2], [1, 0, 0, 4, 2, 1]))
+    ]
+    context = CrimeCategoryBuilder(events).build()
+    for event in events:
+        event.statistical_context = context
+    scores = CrimeEvent.severity_scores(events, context)
+    np.testing.assert_allclose(scores, [event.severity for event in events])
+    np.testing.assert_allclose(scores, CrimeEvent.severity_scores(events))
+    # The weight dimension counts towards the severity
+    assert events[1].z_transform("weight") > 0
+
+
+def test_streamed_and_merged_statistics_match_in_memory() -> None:
+    rng = np.random.default_rng(5)
+    events = [
+        CrimeEvent(f"e{i}", int(v), float(w), int(a))
+        for i, (v, w, a) in enumerate(zip(rng.integers(0, 50, 1000), rng.random(1000) * 1e4, rng.integers(0, 9, 1000)))
+    ]
+    expected = CrimeCategoryBuilder(events).build()
+
+    shards = [StreamingCategoryBuilder(), StreamingCategoryBuilder()]
+    for start in range(0, len(events), 137):
+        shards[start % 2].update(events[start : start + 137])
+    shards[0].update([])
+    merged = shards[0].merge(shards[1]).build()
+
+    frame = pd.DataFrame({metric: [getattr(e, metric) for e in events] for metric in expected})
+    streamed = StreamingCategoryBuilder().update(frame.iloc[:400]).update(frame.iloc[400:]).build()
+
+    for metric, category in expected.items():
+        for built in (merged[metric], streamed[metric]):
+            assert (built.N, built.total) == (category.N, pytest.approx(category.total))
+            assert built.mean == pytest.approx(category.mean)
+            assert built.stdev == pytest.approx(category.stdev)
+        assert merged[metric].z_score(7) == pytest.approx(category.z_score(7))
+    with pytest.raises(ValueError):
+        merged["victims"].z_scores()
+
+
+def test_streamed_frames_use_source_columns_and_skip_invalid_rows(raw_frame: pd.DataFrame) -> None:
+    processed = CrimeData(raw_frame).get_processed_data()
+    table = CrimeEventsBuilder(processed).build_table()
+    expected = table.categories()
+
+    invalid = pd.DataFrame({"total_vitima": [float("nan"), -1.0], "total_peso": [0.0, 0.0], "total": [0, 0]})
+    streamed = StreamingCategoryBuilder().update(processed).update(invalid).build()
+    for metric, category in expected.items():
+        assert (streamed[metric].N, streamed[metric].total) == (category.N, pytest.approx(category.total))
+
+    with pytest.raises(KeyError):
+        StreamingCategoryBuilder().update(processed.drop(columns="total_peso"))
+
+
+def test_event_table_rejects_invalid_rows_and_scores_like_events(raw_frame: pd.DataFrame) -> None:
+    processed = CrimeData(raw_frame).get_processed_data()
+    table = CrimeEventsBuilder(processed).build_table()
+    assert len(table) == len(processed) and table.rejected.empty
+    assert table.victims.tolist() == processed["total_vitima"].tolist()
+
+    events = table.to_events()
+    context = CrimeCategoryBuilder(events).build()
+    for event in events:
+        event.statistical_context = context
+    np.testing.assert_allclose(table.severity_scores(), [event.severity for event in events])
+    assert table[-1].name == events[-1].name and table[-1].severity == pytest.approx(events[-1].severity)
+
+    bad = pd.DataFrame(
+        {
+            "crime_type": ["A", None, "C", "D", "E"],
+            "victims": [1, 2, "x", 4, 1.5],
+            "weight": [0.5, 1.0, 1.0, -1.0, 2.0],
+        }
+    )
+    table = CrimeEventTable.from_frame(bad)
+    assert table.rejected.tolist() == [1, 2, 3, 4]
+    assert (table.names.tolist(), table.aprehensions.tolist()) == (["A"], [0])
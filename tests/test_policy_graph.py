@@ -0,0 +1,233 @@
+import math
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analyzer.correlation import PolicyGraphBuilder, PolicyHierarchy, StressScorer
+from analyzer.dot import DotParseError, parse_dot
+from analyzer.policy_loader import PolicyGraphLoader
+from utils import config
+
+DOT = """
+digraph G {
+    node [shape=box];
+    subgraph cluster_programa {
+        label="Programa";
+        node [fillcolor=lightblue];
+        "Ação A" [type=action, code="0001"];
+        subgraph cluster_sub { "Ação B" [type=action, code="0002"] }
+        "Ação A" [type=action, code="0003"]; // redeclared
+    }
+    subgraph cluster_crimes { "Roubo" [type=crime]; Furto [type=crime]; }
+    edge [color=black];
+    "Ação A" -> "Roubo" -> Furto [style=bold];
+    "Ação B":p -> "Roubo";
+}
+"""
+
+
+def test_parse_dot_clusters_defaults_and_edges() -> None:
+    dot = parse_dot(DOT)
+    assert dot.directed and dot.name == "G"
+    assert dot.nodes["Ação A"] == {"shape": "box", "fillcolor": "lightblue", "type": "action", "code": "0003"}
+    assert dot.node_clusters == {
+        "Ação A": "cluster_programa",
+        "Ação B": "cluster_sub",
+        "Roubo": "cluster_crimes",
+        "Furto": "cluster_crimes",
+    }
+    assert dot.clusters["cluster_sub"].parent == "cluster_programa"
+    assert dot.clusters["cluster_programa"].attrs == {"label": "Programa"}
+    assert dot.edges == [
+        ("Ação A", "Roubo", {"color": "black", "style": "bold"}),
+        ("Roubo", "Furto", {"color": "black", "style": "bold"}),
+        ("Ação B", "Roubo", {"color": "black"}),
+    ]
+    assert list(dot.redeclared) == ["Ação A"]
+
+    with pytest.raises(DotParseError, match="linha 2"):
+        parse_dot('digraph {\n "a" -> }')
+    with pytest.raises(DotParseError):
+        parse_dot('digraph { "a" -- "b" }')
+
+
+def test_loader_maps_actions_to_policies_and_reuses_snapshot(tmp_path: Path, monkeypatch) -> None:
+    path = tmp_path / "policies.gv"
+    path.write_text(DOT, encoding="utf-8")
+    graph = PolicyGraphLoader(path, tmp_path / "cache").load()
+
+    assert graph.nodes["Ação A"]["type"] == "policy" and graph.nodes["Ação A"]["codes"] == ["0001", "0003"]
+    assert graph.graph["clusters"]["cluster_sub"] == {"label": "cluster_sub", "parent": "cluster_programa"}
+    policies = dict(PolicyGraphBuilder.from_dot(path, tmp_path / "cache").build().get_all_policies())
+    assert sorted(policies) == ["Ação A", "Ação B"]
+
+    monkeypatch.setattr("analyzer.policy_loader.parse_dot", lambda text: pytest.fail("should use the snapshot"))
+    assert sorted(PolicyGraphLoader(path, tmp_path / "cache").load().edges) == sorted(graph.edges)
+
+    # A changed file gets a new snapshot and the stale one is removed
+    monkeypatch.undo()
+    path.write_text(DOT.replace("Furto [type=crime];", "Furto [type=crime]; Dano [type=crime];"), encoding="utf-8")
+    assert "Dano" in PolicyGraphLoader(path, tmp_path / "cache").load()
+    assert len(list((tmp_path / "cache").glob("*.pickle"))) == 1
+
+
+def test_repository_policy_graph_parses() -> None:
+    graph = PolicyGraphLoader(config.POLICY_GRAPH_FILEPATH, cache_dir=None).load()
+    types = {data.get("type") for _, data in graph.nodes(data=True)}
+    assert types == {"policy", "crime"}
+    assert all(graph.nodes[source]["type"] == "policy" for source, _ in graph.edges)
+
+
+def test_stress_matches_neighbor_walk_and_scenarios() -> None:
+    rng = np.random.default_rng(0)
+    builder = PolicyGraphBuilder()
+    for crime in range(30):
+        builder.add_crime(f"c{crime}", severity=float(rng.normal()))
+    for policy in range(50):
+        builder.add_policy(f"p{policy}", budget=float(rng.integers(1, 100)))
+        for crime in rng.choice(30, 4, replace=False):
+            builder.link_policy_to_crime(f"p{policy}", f"c{crime}")
+    builder.add_policy("sem orçamento", budget=0.0).link_policy_to_crime("sem orçamento", "c0")
+    graph = builder.build()
+
+    stresses = StressScorer().calculate_policy_stresses(graph)
+    for policy, data in graph.get_all_policies():
+        if data["budget"] == 0:
+            assert math.isnan(stresses[policy])
+            continue
+        expected = sum(crime["severity"] for _, crime in graph.get_crimes_for_policy(policy)) / data["budget"]
+        assert stresses[policy] == pytest.approx(expected)
+
+    # The analyzer's scores and the given budgets override the node attributes
+    overrides = {"c1": 10.0, "c2": -2.0}
+    severity = pd.DataFrame({"crime_type": list(overrides), "csi": list(overrides.values())})
+    scored = StressScorer(severity, {"p0": 2.0}).calculate_policy_stresses(graph)
+    crimes = dict(graph.get_crimes_for_policy("p0"))
+    assert scored["p0"] == pytest.approx(sum(overrides.get(c, data["severity"]) for c, data in crimes.items()) / 2)
+
+    scenarios = pd.DataFrame(rng.normal(size=(30, 3)), index=[f"c{c}" for c in range(30)], columns=["a", "b", "c"])
+    budgets = pd.DataFrame(rng.integers(1, 50, size=(51, 3)), index=graph.incidence.policies, columns=["a", "b", "c"])
+    result = StressScorer().evaluate_scenarios(graph, scenarios, budgets)
+    for scenario in scenarios.columns:
+        single = StressScorer(
+            scenarios[scenario].rename_axis("crime_type").reset_index(name="csi"), budgets[scenario].to_dict()
+        ).calculate_policy_stresses(graph)
+        np.testing.assert_allclose(result[scenario], pd.Series(single)[result.index])
+
+
+def test_tracker_recomputes_only_dependent_policies_and_notifies(tmp_path: Path) -> None:
+    path = tmp_path / "policies.gv"
+    path.write_text(
+        """
+        digraph {
+            c0 [type=crime, severity=1]; c1 [type=crime, severity=2]; c2 [type=crime, severity=3];
+            p0 [type=action, budget=1]; p1 [type=action, budget=1];
+            p2 [type=action, code=A1]; p2 [code=A2];
+            p0 -> c0; p0 -> c1; p1 -> c1; p2 -> c2;
+        }
+        """,
+        encoding="utf-8",
+    )
+    graph = PolicyGraphBuilder.from_dot(path, cache_dir=None).build()
+
+    tracker = StressScorer(policy_budgets={"A1": 2.0, "A2": 2.0}).track(graph)
+    assert tracker.stresses == {"p0": 3.0, "p1": 2.0, "p2": 0.75}
+    received = []
+    unsubscribe = tracker.subscribe(received.append)
+
+    changes = tracker.update_severity("c0", 5.0)
+    assert [(c.policy, c.previous, c.current) for c in changes] == [("p0", 3.0, 7.0)]
+    assert tracker.update_budget("A1", 6.0)[0].current == pytest.approx(3 / 8)
+    assert tracker.update(severities={"c1": 2.0}) == []
+    assert len(received) == 2
+
+    unsubscribe()
+    tracker.update(severities={"c1": 0.0, "c2": 8.0}, budgets={"p1": 0.0})
+    assert len(received) == 2
+    expected = {"p0": 5.0, "p1": math.nan, "p2": 1.0}
+    assert tracker.stresses == pytest.approx(expected, nan_ok=True)
+    with pytest.raises(KeyError):
+        tracker.update_severity("desconhecido", 1.0)
+
+
+def test_rollup_aggregates_clusters_with_each_dedup_rule(tmp_path: Path) -> None:
+    path = tmp_path / "policies.gv"
+    path.write_text(DOT.replace('"Ação B":p -> "Roubo";', '"Ação B" -> "Roubo"; "Ação C" [type=action];'))
+    graph = PolicyGraphBuilder.from_dot(path, cache_dir=None).build()
+    severity = pd.DataFrame({"crime_type": ["Roubo", "Furto"], "csi": [2.0, 5.0]})
+    scorer = StressScorer(severity, {"0001": 1.0, "0003": 1.0, "0002": 4.0})
+
+    union = scorer.rollup(graph).set_index("node")
+    assert union.loc["Ação C", "parent"] == PolicyHierarchy.ROOT
+    assert union.loc["cluster_sub", "parent"] == "cluster_programa"
+    # "Roubo" is covered by both actions of the program but counts once
+    assert union.loc["cluster_programa", ["policies", "covered_severity", "budget"]].tolist() == [2, 2.0, 6.0]
+    assert union.loc[PolicyHierarchy.ROOT, "policies"] == 3
+    assert union.loc["cluster_sub", "stress"] == pytest.approx(0.5)
+    assert union.loc["Ação A", "stress"] == pytest.approx(1.0)
+
+    summed = scorer.rollup(graph, dedup="sum").set_index("node")
+    assert summed.loc["cluster_programa", "covered_severity"] == 4.0
+    shared = scorer.rollup(graph, dedup="share").set_index("node")
+    assert shared.loc["Ação A", "covered_severity"] == shared.loc["cluster_sub", "covered_severity"] == 1.0
+    assert shared.loc[PolicyHierarchy.ROOT, "covered_severity"] == union.loc[PolicyHierarchy.ROOT, "covered_severity"]
+    with pytest.raises(ValueError):
+        scorer.rollup(graph, dedup="max")
+
+
+def test_panel_matches_yearly_snapshots_and_flags_trends(tmp_path: Path) -> None:
+    path = tmp_path / "policies.gv"
+    path.write_text(DOT, encoding="utf-8")
+    graph = PolicyGraphBuilder.from_dot(path, cache_dir=None).build()
+
+    severities = pd.DataFrame(
+        {
+            "ano": [2022, 2022, 2023, 2023, 2024, 2024, 2025],
+            "crime_type": ["Roubo", "Furto", "Roubo", "Furto", "Roubo", "Furto", "Roubo"],
+            "csi": [1.0, 9.0, 2.0, 9.0, 3.0, 9.0, 9.0],
+        }
+    )
+    budgets = {year: {"0001": 1.0, "0003": 1.0, "Ação B": 4.0 - (year - 2021)} for year in (2021, 2022, 2023, 2024)}
+    panel = StressScorer().panel(graph, severities, budgets)
+
+    assert panel.stress.columns.tolist() == [2022, 2023, 2024]
+    for year in panel.stress.columns:
+        yearly = severities[severities["ano"] == year]
+        expected = StressScorer(yearly, budgets[year]).calculate_policy_stresses(graph)
+        np.testing.assert_allclose(panel.stress[year], pd.Series(expected)[panel.stress.index])
+
+    np.testing.assert_allclose(panel.deltas.loc["Ação A"], [0.5, 0.5])
+    assert panel.deltas.columns.tolist() == [2023, 2024]
+    assert panel.trend.loc["Ação A", "slope"] == pytest.approx(0.5)
+    assert panel.trend["trend"].to_dict() == {"Ação A": "alta", "Ação B": "alta"}
+
+    flat = StressScorer().panel(graph, severities.assign(csi=1.0), {2022: {"0001": 1.0}, 2023: {"0001": 1.0}})
+    assert flat.trend["trend"].to_dict() == {"Ação A": "estável", "Ação B": "indefinida"}
+
+
+def test_tracker_matches_full_rescore_after_mixed_budget_updates(tmp_path: Path) -> None:
+    path = tmp_path / "policies.gv"
+    path.write_text(
+        """
+        digraph {
+            c0 [type=crime, severity=5];
+            P1 [type=action, code=X1]; P2 [type=action, code=X2]; P2 [code=X3];
+            P1 -> c0; P2 -> c0;
+        }
+        """,
+        encoding="utf-8",
+    )
+    graph = PolicyGraphBuilder.from_dot(path, cache_dir=None).build()
+    budgets = {"P1": 100.0, "X1": 50.0, "X2": 10.0, "X3": 10.0}
+    tracker = StressScorer(policy_budgets=budgets).track(graph)
+
+    # A code update leaves a policy-keyed budget in place
+    assert tracker.update_budget("X1", 25.0) == []
+    updates: list[dict[str, float]] = [{"X2": 30.0}, {"P2": 8.0}, {"X3": 1.0}, {"P1": 20.0, "X1": 2.0}]
+    for update in updates:
+        tracker.update(budgets=update)
+        budgets.update(update)
+        assert tracker.stresses == pytest.approx(StressScorer(policy_budgets=budgets).calculate_policy_stresses(graph))
+    assert tracker.stresses == pytest.approx({"P1": 0.25, "P2": 0.625})
@@ -0,0 +1,36 @@
+import pandas as pd
+
+from crime_data.schema import apply_schema, concat_frames, stale_columns
+
+
+def test_apply_schema_compacts_dtypes() -> None:
+    df = pd.DataFrame(
+        {
+            "evento": ["Homicídio doloso", "Estupro", "Homicídio doloso"],
+            "uf": ["SP", "SP", "RJ"],
+            "total_vitima": [1.0, None, 300.0],
+            "total": ["2", None, "7"],
+            "total_peso": [None, "1,5", "0,25"],
+            "ano": [2024, 2024, 2024],
+        }
+    )
+    assert stale_columns(df) == ["evento", "uf", "total_vitima", "total", "total_peso"]
+    df = apply_schema(df)
+    assert stale_columns(df) == []
+
+    assert isinstance(df["evento"].dtype, pd.CategoricalDtype)
+    assert str(df["total_vitima"].dtype) == "uint16"
+    assert str(df["total"].dtype) == "uint8"
+    assert str(df["total_peso"].dtype) == "float32"
+    assert str(df["ano"].dtype) == "int16"
+    assert df["total_peso"].tolist() == [0.0, 1.5, 0.25]
+
+
+def test_concat_frames_keeps_categories() -> None:
+    first = apply_schema(pd.DataFrame({"uf": ["SP"], "total": [1]}))
+    second = apply_schema(pd.DataFrame({"uf": ["RJ"], "total": [1000]}))
+    combined = concat_frames([first, second])
+
+    assert isinstance(combined["uf"].dtype, pd.CategoricalDtype)
+    assert combined["uf"].tolist() == ["SP", "RJ"]
+    assert str(combined["total"].dtype) == "uint16"
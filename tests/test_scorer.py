@@ -0,0 +1,214 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from crime_data.benchmark import synthetic_crime_data
+from crime_data.cache import ResultCache
+from crime_data.models import CrimeData
+from crime_data.schema import apply_schema
+from crime_data.scorer import (
+    AnalysisResult,
+    AnalysisRunner,
+    Analyzer,
+    DrugSeizureByStateAnalyzer,
+    FirearmSeizureByStateAnalyzer,
+    GenderOfVictimsAnalyzer,
+    GroupedSeverityAnalyzer,
+    LethalCrimesByStateAnalyzer,
+    SeverityAnalyzer,
+    SeverityBootstrapAnalyzer,
+    SeveritySweepAnalyzer,
+    VehicleCrimeByStateAnalyzer,
+    dirichlet_weights,
+    weight_grid,
+)
+
+
+class FailingAnalyzer(Analyzer):
+    @property
+    def name(self) -> str:
+        return "Falha"
+
+    @property
+    def description(self) -> str:
+        return "Sempre falha."
+
+    def analyze(self, crime_data: CrimeData) -> AnalysisResult:
+        raise RuntimeError("boom")
+
+
+@pytest.fixture
+def crime_data() -> CrimeData:
+    df = pd.DataFrame(
+        {
+            "evento": ["Homicídio doloso", "Feminicídio", "Apreensão de Maconha", "Homicídio doloso", "Estupro"],
+            "uf": ["SP", "RJ", "SP", "RJ", "MG"],
+            "municipio": ["São Paulo", "Niterói", "Santos", "Rio de Janeiro", "Belo Horizonte"],
+            "feminino": [0, 1, 0, 1, 1],
+            "masculino": [2, 0, 0, 3, 0],
+            "nao_informado": [0, 0, 0, 0, 0],
+            "total_vitima": [2, 1, 0, 4, 1],
+            "total": [0, 0, 0, 0, 0],
+            "total_peso": [0.0, 0.0, 12.5, 0.0, 0.0],
+            "ano": [2024, 2024, 2025, 2025, 2025],
+        }
+    )
+    return CrimeData(apply_schema(df))
+
+
+def test_runner_requires_union_of_analyzer_columns(crime_data: CrimeData) -> None:
+    runner = AnalysisRunner()
+    runner.register(LethalCrimesByStateAnalyzer())
+    runner.register(GenderOfVictimsAnalyzer())
+
+    columns = runner.required_columns()
+    assert columns == ["evento", "uf", "total_vitima", "feminino", "masculino"]
+
+    # Analyzers produce the same result on the projected frame
+    projected = CrimeData(crime_data.data[columns])
+    runner.run(projected)
+    assert runner.results[0].data.to_dict("list") == {"UF": ["RJ", "SP"], "Total de Vítimas Letais": [5, 2]}
+    assert runner.results[1].data["Total de Vítimas"].tolist() == [1, 5]
+
+    runner.register(SeverityAnalyzer())
+    assert "total_peso" in runner.required_columns()
+
+
+def test_severity_analyzer_returns_analysis_result(crime_data: CrimeData) -> None:
+    result = SeverityAnalyzer().analyze(crime_data)
+    assert list(result.data.columns) == ["crime_type", "csi"]
+    assert result.data["crime_type"].iloc[0] == "Homicídio doloso"
+    assert DrugSeizureByStateAnalyzer().analyze(crime_data).data["UF"].tolist() == ["SP"]
+
+
+def test_shared_scan_matches_sequential_run(crime_data: CrimeData, monkeypatch) -> None:
+    analyzers = [
+        LethalCrimesByStateAnalyzer,
+        DrugSeizureByStateAnalyzer,
+        FirearmSeizureByStateAnalyzer,
+        VehicleCrimeByStateAnalyzer,
+        GenderOfVictimsAnalyzer,
+        SeverityAnalyzer,
+    ]
+    runs = {}
+    for shared_scan in (False, True):
+        runner = AnalysisRunner(shared_scan=shared_scan)
+        for analyzer in analyzers:
+            runner.register(analyzer())
+        data = CrimeData(crime_data.data)
+        scans = []
+        monkeypatch.setattr(
+            data, "select", lambda *args, _select=data.select, **kwargs: scans.append(1) or _select(*args, **kwargs)
+        )
+        runner.run(data)
+        runs[shared_scan] = (runner.results, len(scans))
+
+    (sequential, sequential_scans), (shared, shared_scans) = runs[False], runs[True]
+    assert (sequential_scans, shared_scans) == (3, 1)
+    for expected, result in zip(sequential, shared):
+        assert result.name == expected.name
+        pd.testing.assert_frame_equal(result.data, expected.data)
+
+
+@pytest.mark.parametrize("mode", ["thread", "process"])
+def test_parallel_modes_keep_order_and_isolate_failures(crime_data: CrimeData, mode: str) -> None:
+    analyzers = [LethalCrimesByStateAnalyzer, FailingAnalyzer, SeverityAnalyzer, DrugSeizureByStateAnalyzer]
+    runs = {}
+    for run_mode in ("sequential", mode):
+        runner = AnalysisRunner(shared_scan=False, mode=run_mode, max_workers=2)
+        for analyzer in analyzers:
+            runner.register(analyzer())
+        runner.run(crime_data)
+        runs[run_mode] = runner
+
+    assert [result.name for result in runs[mode].results] == [analyzer().name for analyzer in analyzers]
+    assert list(runs[mode].failures) == ["Falha"]
+    stages = {stage.name: stage for stage in runs[mode].metrics.stages}
+    assert stages["análise: Falha"].error == "RuntimeError: boom"
+    assert stages[f"análise: {SeverityAnalyzer().name}"].rows == len(crime_data.data)
+    assert runs[mode].results[1].data.empty
+    for expected, result in zip(runs["sequential"].results, runs[mode].results):
+        pd.testing.assert_frame_equal(result.data, expected.data)
+
+
+def test_runner_reuses_cached_results_until_inputs_change(crime_data: CrimeData, tmp_path: Path, monkeypatch) -> None:
+    def run(severity: SeverityAnalyzer) -> AnalysisRunner:
+        runner = AnalysisRunner(result_cache=ResultCache(tmp_path))
+        runner.register(LethalCrimesByStateAnalyzer())
+        runner.register(DrugSeizureByStateAnalyzer())
+        runner.register(severity)
+        runner.run(CrimeData(crime_data.data))
+        return runner
+
+    first = run(SeverityAnalyzer())
+    monkeypatch.setattr(SeverityAnalyzer, "analyze", lambda self, data: pytest.fail("should have been cached"))
+    monkeypatch.setattr(AnalysisRunner, "shared_totals", lambda *args: pytest.fail("should have been cached"))
+    second = run(SeverityAnalyzer())
+
+    assert all(stage.cached for stage in second.metrics.stages)
+    for expected, result in zip(first.results, second.results):
+        assert (result.name, result.requested_formats) == (expected.name, expected.requested_formats)
+        pd.testing.assert_frame_equal(result.data, expected.data)
+
+    # New weights change the key: only the severity index is recomputed
+    monkeypatch.undo()
+    severity = SeverityAnalyzer()
+    severity.CSI_WEIGHTS = {"harm": 1.0, "disruption": 0.0, "volume": 0.0}
+    third = run(severity)
+    assert [stage.cached for stage in third.metrics.stages] == [True, True, False]
+
+
+def test_severity_sweep_matches_one_ranking_per_weighting(crime_data: CrimeData) -> None:
+    grid = weight_grid(step=0.25)
+    assert len(grid) == 15 and np.allclose(grid.sum(axis=1), 1)
+    assert np.allclose(dirichlet_weights(100, seed=1).sum(axis=1), 1)
+
+    sweep = SeveritySweepAnalyzer(grid, top_k=1).analyze(crime_data).data.set_index("crime_type")
+
+    # The same statistics, computed one weighting at a time
+    ranks = {}
+    for weights in grid:
+        analyzer = SeverityAnalyzer()
+        analyzer.CSI_WEIGHTS = dict(zip(analyzer.CSI_WEIGHTS, weights))
+        ranking = analyzer.analyze(crime_data).data["crime_type"].tolist()
+        for crime_type in ranking:
+            ranks.setdefault(crime_type, []).append(ranking.index(crime_type) + 1)
+
+    for crime_type, crime_ranks in ranks.items():
+        stats = sweep.loc[crime_type]
+        assert stats["mean_rank"] == pytest.approx(np.mean(crime_ranks))
+        assert (stats["min_rank"], stats["max_rank"]) == (min(crime_ranks), max(crime_ranks))
+        assert stats["top_k_share"] == pytest.approx(np.mean(np.array(crime_ranks) == 1))
+    assert sweep.loc["Homicídio doloso", "baseline_rank"] == 1
+
+
+def test_grouped_severity_matches_per_group_index() -> None:
+    data = synthetic_crime_data(3000, seed=2).data
+    result = GroupedSeverityAnalyzer(by=["uf", "ano"]).analyze(CrimeData(data)).data
+    assert list(result.columns) == ["uf", "ano", "crime_type", "csi", "rank"]
+
+    for uf, ano in [("SP", 2021), ("AC", 2025)]:
+        group = data[(data["uf"] == uf) & (data["ano"] == ano)]
+        expected = SeverityAnalyzer().analyze(CrimeData(group)).data
+        grouped = result[(result["uf"] == uf) & (result["ano"] == ano)]
+        assert grouped["crime_type"].tolist() == expected["crime_type"].tolist()
+        np.testing.assert_allclose(grouped["csi"], expected["csi"])
+        assert grouped["rank"].tolist() == list(range(1, len(expected) + 1))
+
+
+def test_bootstrap_intervals_are_reproducible_across_workers() -> None:
+    crime_data = synthetic_crime_data(3000, seed=3)
+    analyzer = SeverityBootstrapAnalyzer(resamples=500, seed=7)
+    result = analyzer.analyze(crime_data).data
+
+    # The point estimate is the nationwide index
+    expected = SeverityAnalyzer().analyze(crime_data).data
+    assert result["crime_type"].tolist() == expected["crime_type"].tolist()
+    np.testing.assert_allclose(result["csi"], expected["csi"], rtol=1e-5)
+    assert (result["csi_low"] <= result["csi_high"]).all()
+    assert ((result["rank_low"] <= result["rank"]) & (result["rank"] <= result["rank_high"])).all()
+
+    parallel = analyzer.bootstrap(crime_data, resamples=500, seed=7, workers=2, batch_size=100)
+    pd.testing.assert_frame_equal(parallel, analyzer.bootstrap(crime_data, resamples=500, seed=7, batch_size=100))
@@ -0,0 +1,86 @@
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from crime_data import serializer
+from crime_data.models import CrimeData
+from crime_data.schema import apply_schema
+from crime_data.serializer import CrimeDataSerializer
+
+
+@pytest.fixture
+def crime_data() -> CrimeData:
+    df = pd.DataFrame(
+        {
+            "evento": ["Homicídio doloso", "Estupro", "Homicídio doloso", "Roubo de carga"],
+            "uf": ["SP", "RJ", "MG", "SP"],
+            "total_vitima": [1, 2, 3, 0],
+            "total": [0, 0, 0, 4],
+            "ano": [2023, 2024, 2025, 2025],
+        }
+    )
+    return CrimeData(apply_schema(df))
+
+
+def test_serialize_writes_year_partitions(crime_data: CrimeData, tmp_path: Path) -> None:
+    path = tmp_path / "crimedata.parquet"
+    CrimeDataSerializer.serialize(crime_data, path, partition_cols=["ano", "uf"])
+
+    assert sorted(p.name for p in path.iterdir()) == ["ano=2023", "ano=2024", "ano=2025"]
+    assert (path / "ano=2025" / "uf=SP").is_dir()
+
+    restored = CrimeDataSerializer.deserialize(path).data
+    assert len(restored) == 4
+    assert str(restored["ano"].dtype) == "int16"
+    assert str(restored["total"].dtype) == "uint8"
+
+
+def test_deserialize_with_filters_and_columns(crime_data: CrimeData, tmp_path: Path) -> None:
+    path = tmp_path / "crimedata.parquet"
+    CrimeDataSerializer.serialize(crime_data, path)
+    # Serializing again replaces the dataset instead of appending to it
+    CrimeDataSerializer.serialize(crime_data, path)
+
+    scoped = CrimeDataSerializer.deserialize(
+        path, filters=[("ano", "in", [2024, 2025]), ("uf", "in", ["SP", "RJ"])], columns=["evento", "total"]
+    ).data
+
+    assert list(scoped.columns) == ["evento", "total"]
+    assert sorted(scoped["evento"].astype(str)) == ["Estupro", "Roubo de carga"]
+
+
+def test_arrow_backend_round_trip(crime_data: CrimeData, tmp_path: Path, monkeypatch) -> None:
+    path = tmp_path / "crimedata.arrow"
+    CrimeDataSerializer.serialize(crime_data, path)
+    assert path.is_file()
+
+    # The file already holds compact dtypes, so reading it back does not re-apply the schema
+    monkeypatch.setattr(serializer, "apply_schema", lambda df, columns=None: pytest.fail("schema re-applied"))
+
+    restored = CrimeDataSerializer.deserialize(path).data
+    assert isinstance(restored["uf"].dtype, pd.CategoricalDtype)
+    assert str(restored["total_vitima"].dtype) == "uint8"
+
+    scoped = CrimeDataSerializer.deserialize(path, filters=[("ano", ">=", 2025)], columns=["uf", "total"]).data
+    assert scoped["uf"].astype(str).tolist() == ["MG", "SP"]
+    assert scoped["total"].tolist() == [0, 4]
+
+
+@pytest.mark.parametrize("name", ["crimedata.parquet", "crimedata.arrow"])
+def test_failed_serialize_keeps_previous_snapshot(
+    crime_data: CrimeData, tmp_path: Path, monkeypatch, name: str
+) -> None:
+    path = tmp_path / name
+    CrimeDataSerializer.serialize(crime_data, path)
+
+    def fail(*args: object, **kwargs: object) -> None:
+        raise OSError("disco cheio")
+
+    monkeypatch.setattr(pd.DataFrame, "to_parquet", fail)
+    monkeypatch.setattr(CrimeDataSerializer, "write_arrow", staticmethod(fail))
+    with pytest.raises(OSError):
+        CrimeDataSerializer.serialize(crime_data, path)
+
+    assert len(CrimeDataSerializer.deserialize(path).data) == 4
+    assert sorted(p.name for p in tmp_path.iterdir()) == [name]